@@ -0,0 +1,168 @@
+"""
+Cron job to scrape lineups of today's and tomorrow's matches ahead of time.
+Results go to Redis (app.services.lineup_cache), where /api/lineups/lineup
+reads them before scraping on demand. Player stats go through the players
+tables (app.services.player_store), so teams that have not played since
+their last scrape cost no player page requests.
+
+Each run works through not-yet-started matches, soonest first, skipping
+recently computed ones, until its time budget is spent; repeated runs
+continue where the previous one stopped. A match is only started when the
+remaining budget covers the slowest match of the run so far, so no match is
+abandoned half-scraped. ?league=KHL limits a run to one league.
+
+Lineups computed within LINEUP_KICKOFF_WINDOW of their match stay fresh
+until kickoff (lineup_cache.is_fresh), so the daily Vercel run covers the
+day's matches; later ones are only warmed (players table, stale fallback)
+since a team may play before then. Vercel Hobby crons can't run more often;
+to keep up with a busy match day, call this endpoint from an external
+scheduler as well (e.g. every 30 minutes), once per league if the
+budget doesn't cover them all.
+"""
+from http.server import BaseHTTPRequestHandler
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlparse, parse_qs
+
+# Add api (shared helpers) and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# No worker processes in a serverless function; parse inline
+os.environ.setdefault("CPU_POOL_WORKERS", "0")
+
+from http_client import pooled_client, run
+
+from app.models.database import SessionLocal, init_db
+from app.services import lineup_cache, player_store
+from app.services.flashscore_feed import DayFeedCache, league_matches
+
+
+# Seconds of the 30s function budget spent scraping
+PRECOMPUTE_BUDGET = int(os.getenv("LINEUP_PRECOMPUTE_BUDGET", "24"))
+# Lineups computed more recently than this are not scraped again
+REFRESH_AGE = int(os.getenv("LINEUP_PRECOMPUTE_REFRESH", "1800"))
+# Assumed duration of one match until the run has timed one
+MATCH_ESTIMATE = float(os.getenv("LINEUP_PRECOMPUTE_MATCH_ESTIMATE", "8"))
+DAYS = (0, 1)
+
+# Same league name patterns as /api/lineups/matches
+LEAGUE_NAME_PATTERNS = {
+    "KHL": ["KHL"],
+    "NHL": ["NHL"],
+    "AHL": ["AHL"],
+    "LIIGA": ["Liiga"],
+    "DEL": ["DEL"],
+    "CZECH": ["Extraliga"],
+    "DENMARK": ["Metal Ligaen"],
+    "AUSTRIA": ["ICE Hockey League"],
+    "SWISS": ["National League"],
+}
+
+
+def get_cache_redis():
+    """Redis client for feeds and lineups, or None when not configured"""
+    if not (os.environ.get('KV_REST_API_URL') or os.environ.get('UPSTASH_REDIS_REST_URL')):
+        return None
+    from auth_helpers import get_redis
+    return get_redis()
+
+
+_day_feeds = DayFeedCache(redis_factory=get_cache_redis)
+
+
+async def upcoming_matches(leagues) -> list:
+    """Not-yet-started matches of `leagues` for today and tomorrow, soonest first"""
+    async with pooled_client(timeout=30.0) as client:
+        indexes = await _day_feeds.get_indexes(client, DAYS)
+
+    matches = {}
+    for index in indexes:
+        for league in leagues:
+            for pattern in LEAGUE_NAME_PATTERNS[league]:
+                for match in league_matches(index, pattern):
+                    if match.status == '1':  # Scheduled
+                        matches[match.id] = match
+    return sorted(matches.values(), key=lambda m: int(m.timestamp or 0))
+
+
+async def precompute(db, leagues, redis) -> dict:
+    started = time.monotonic()
+    result = {"computed": [], "fresh": 0, "remaining": 0, "errors": []}
+    slowest = None
+
+    matches = await upcoming_matches(leagues)
+    for position, match in enumerate(matches):
+        match_url = f'https://www.flashscore.com/match/{match.id}/#/match-summary/match-summary'
+        cached = lineup_cache.load(redis, match_url)
+        if cached and cached["age"] < REFRESH_AGE:
+            result["fresh"] += 1
+            continue
+
+        # Leave matches that may not finish within the budget to the next run
+        match_started = time.monotonic()
+        estimate = MATCH_ESTIMATE if slowest is None else slowest
+        if PRECOMPUTE_BUDGET - (match_started - started) < estimate:
+            result["remaining"] = len(matches) - position
+            break
+        try:
+            lineups = await player_store.get_match_lineups(db, match_url, _day_feeds)
+        except Exception as e:
+            result["errors"].append(f"{match.id}: {e}")
+            continue
+        finally:
+            slowest = max(slowest or 0, time.monotonic() - match_started)
+
+        lineup_cache.store(redis, match_url, lineups, kickoff=int(match.timestamp or 0) or None)
+        result["computed"].append(match.id)
+
+    return result
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        """Precompute lineups for upcoming matches"""
+        params = parse_qs(urlparse(self.path).query)
+        league = params.get("league", [""])[0].upper()
+        leagues = [league] if league in LEAGUE_NAME_PATTERNS else list(LEAGUE_NAME_PATTERNS)
+
+        redis = get_cache_redis()
+        if redis is None:
+            self.send_response(500)
+            self.send_header("Content-type", "application/json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": "Redis not configured"}).encode())
+            return
+
+        try:
+            try:
+                init_db()
+            except Exception as e:
+                print(f"DB init warning: {e}")
+            db = SessionLocal()
+            try:
+                result = run(precompute(db, leagues, redis))
+            finally:
+                db.close()
+
+            self.send_response(200)
+            self.send_header("Content-type", "application/json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(json.dumps({
+                "success": True,
+                "leagues": leagues,
+                **result,
+                "timestamp": datetime.now().isoformat()
+            }).encode())
+
+        except Exception as e:
+            self.send_response(500)
+            self.send_header("Content-type", "application/json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": str(e)}).encode())
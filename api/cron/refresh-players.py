@@ -0,0 +1,74 @@
+"""
+Cron job to refresh stored player season stats (app.services.player_store).
+
+Only teams that finished a game since their players were last scraped (per
+the Flashscore day feeds) are scraped again, least recently scraped first,
+until the time budget is spent; the next run continues with the rest.
+"""
+from http.server import BaseHTTPRequestHandler
+import json
+import os
+import sys
+from datetime import datetime
+
+# Add api (shared helpers) and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# No worker processes in a serverless function; parse inline
+os.environ.setdefault("CPU_POOL_WORKERS", "0")
+
+from http_client import run
+
+from app.models.database import SessionLocal, init_db
+from app.services import player_store
+from app.services.flashscore_feed import DayFeedCache
+
+
+# Seconds of the 30s function budget spent scraping
+REFRESH_BUDGET = int(os.getenv("PLAYER_REFRESH_BUDGET", "24"))
+
+
+def get_feed_redis():
+    """Redis client for shared day feeds, or None when not configured"""
+    if not (os.environ.get('KV_REST_API_URL') or os.environ.get('UPSTASH_REDIS_REST_URL')):
+        return None
+    from auth_helpers import get_redis
+    return get_redis()
+
+
+_day_feeds = DayFeedCache(redis_factory=get_feed_redis)
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        """Refresh players of teams that have played since their last scrape"""
+        try:
+            try:
+                init_db()
+            except Exception as e:
+                print(f"DB init warning: {e}")
+            db = SessionLocal()
+
+            try:
+                result = run(player_store.refresh_players(db, REFRESH_BUDGET, feeds=_day_feeds))
+
+                self.send_response(200)
+                self.send_header("Content-type", "application/json")
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                self.wfile.write(json.dumps({
+                    "success": True,
+                    **result,
+                    "timestamp": datetime.now().isoformat()
+                }).encode())
+
+            finally:
+                db.close()
+
+        except Exception as e:
+            self.send_response(500)
+            self.send_header("Content-type", "application/json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": str(e)}).encode())
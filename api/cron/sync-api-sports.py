@@ -7,11 +7,13 @@ import json
 import os
 import sys
 from datetime import datetime
-import httpx
 
-# Add backend to path
+# Add api (shared helpers) and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
 
+from http_client import pooled_client, run
+
 from app.models.database import SessionLocal, Team, Game, DataUpdate
 
 
@@ -94,7 +96,7 @@ async def sync_league(db, league_code: str, league_config: dict) -> dict:
     headers = {"x-apisports-key": API_SPORTS_KEY}
     result = {"league": league_code, "teams": 0, "games": 0, "errors": []}
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    async with pooled_client(timeout=60.0) as client:
         # Get teams
         try:
             response = await client.get(
@@ -249,13 +251,12 @@ class handler(BaseHTTPRequestHandler):
             return
 
         try:
-            import asyncio
             db = SessionLocal()
 
             try:
                 results = {}
                 for league_code, league_config in LEAGUES.items():
-                    results[league_code] = asyncio.run(sync_league(db, league_code, league_config))
+                    results[league_code] = run(sync_league(db, league_code, league_config))
 
                 self.send_response(200)
                 self.send_header("Content-type", "application/json")
@@ -0,0 +1,215 @@
+"""
+Cron job to sync Austria ICE Hockey League and Swiss National League results
+from the Flashscore day feeds into the games table.
+Run once daily via Vercel cron; ?days=N backfills up to MAX_SYNC_DAYS.
+
+A league that has never been synced (no *_flashscore_sync update) is
+backfilled over MAX_SYNC_DAYS, the window the stats endpoint reads from the
+feed, until its stored games reach back that far; a run after a gap covers
+every day since the last sync.
+"""
+from http.server import BaseHTTPRequestHandler
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse, parse_qs
+
+# Add api (shared helpers) and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from http_client import pooled_client, run
+
+from sqlalchemy import func
+
+from app.models.database import SessionLocal, Team, Game, DataUpdate
+from app.services.flashscore_feed import DayFeedCache, league_matches
+from app.services.team_names_ru import AUSTRIA_TEAM_NAMES_RU, SWISS_TEAM_NAMES_RU
+
+
+# Days back (including today) checked by the daily run; finished days come from the feed cache
+SYNC_DAYS = int(os.getenv("FLASHSCORE_SYNC_DAYS", "3"))
+MAX_SYNC_DAYS = 60
+
+# League configuration
+LEAGUES = {
+    "AUSTRIA": {"feed_league": "AUSTRIA: ICE Hockey League", "names_ru": AUSTRIA_TEAM_NAMES_RU},
+    "SWISS": {"feed_league": "SWITZERLAND: National League", "names_ru": SWISS_TEAM_NAMES_RU},
+}
+
+
+def get_feed_redis():
+    """Redis client for shared day feeds, or None when not configured"""
+    if not (os.environ.get('KV_REST_API_URL') or os.environ.get('UPSTASH_REDIS_REST_URL')):
+        return None
+    from auth_helpers import get_redis
+    return get_redis()
+
+
+_day_feeds = DayFeedCache(redis_factory=get_feed_redis)
+
+
+def feed_team_id(team_name: str) -> str:
+    """Stable team_id for a Flashscore team name (the feed carries no team ids)"""
+    return "fs_" + hashlib.sha1(team_name.encode("utf-8")).hexdigest()[:12]
+
+
+def season_for(game_date: datetime) -> str:
+    """Season string like the API-Sports sync ("20242025"); seasons start in July"""
+    start = game_date.year if game_date.month >= 7 else game_date.year - 1
+    return f"{start}{start + 1}"
+
+
+def get_or_create_team(db, teams: dict, league_code: str, team_name: str, names_ru: dict, result: dict) -> Team:
+    """Team by Flashscore name; existing teams of the league are matched by name first"""
+    team = teams.get(team_name.lower())
+    if team:
+        return team
+    team = Team(
+        league=league_code,
+        team_id=feed_team_id(team_name),
+        abbrev=team_name[:3].upper(),
+        name=team_name,
+        name_ru=names_ru.get(team_name),
+        logo_url=None
+    )
+    db.add(team)
+    db.flush()
+    teams[team_name.lower()] = team
+    result["teams"] += 1
+    return team
+
+
+def days_to_sync(db, league_code: str, days: int) -> int:
+    """`days`, widened to reach back to the league's last sync; MAX_SYNC_DAYS
+    until the stored Flashscore games cover that window"""
+    last_sync = db.query(DataUpdate).filter(
+        DataUpdate.update_type == f"{league_code.lower()}_flashscore_sync"
+    ).order_by(DataUpdate.updated_at.desc()).first()
+    first_game = db.query(func.min(Game.date)).filter(
+        Game.league == league_code,
+        Game.game_id.startswith(f"{league_code.lower()}_fs_", autoescape=True)
+    ).scalar()
+    window_start = datetime.utcnow() - timedelta(days=MAX_SYNC_DAYS - 1)
+    if last_sync is None or first_game is None or first_game > window_start:
+        # Past days come from the feed cache, so re-reading the window is cheap
+        return MAX_SYNC_DAYS
+    since_last = (datetime.utcnow() - last_sync.updated_at).days + 2  # Partial days on both ends
+    return min(max(days, since_last), MAX_SYNC_DAYS)
+
+
+async def sync_league(db, league_code: str, league_config: dict, days: int) -> dict:
+    """Upsert finished matches of the last `days` days (or since the last sync) for one league"""
+    names_ru = league_config["names_ru"]
+    days = days_to_sync(db, league_code, days)
+    result = {"league": league_code, "days": days, "teams": 0, "games": 0, "updated": 0, "errors": []}
+
+    async with pooled_client(timeout=30.0) as client:
+        indexes = await _day_feeds.get_indexes(client, range(-(days - 1), 1))
+
+    matches = [
+        match
+        for index in indexes
+        for match in league_matches(index, league_config["feed_league"])
+        if match.status == '3'  # Finished
+    ]
+
+    try:
+        teams = {}
+        for team in db.query(Team).filter(Team.league == league_code).all():
+            teams.setdefault((team.name or "").lower(), team)
+
+        game_ids = [f"{league_code.lower()}_fs_{match.id}" for match in matches]
+        existing_games = {
+            game.game_id: game
+            for game in db.query(Game).filter(Game.game_id.in_(game_ids)).all()
+        } if game_ids else {}
+
+        for game_id, match in zip(game_ids, matches):
+            try:
+                home_score = int(match.home_score)
+                away_score = int(match.away_score)
+                game_date = datetime.fromtimestamp(int(match.timestamp), tz=timezone.utc).replace(tzinfo=None)
+            except ValueError:
+                continue
+
+            existing = existing_games.get(game_id)
+            if existing:
+                if (existing.home_score, existing.away_score, existing.is_finished) != (home_score, away_score, True):
+                    existing.home_score = home_score
+                    existing.away_score = away_score
+                    existing.is_finished = True
+                    result["updated"] += 1
+                continue
+
+            home_team = get_or_create_team(db, teams, league_code, match.home, names_ru, result)
+            away_team = get_or_create_team(db, teams, league_code, match.away, names_ru, result)
+            game = Game(
+                league=league_code,
+                game_id=game_id,
+                date=game_date,
+                home_team_id=home_team.id,
+                away_team_id=away_team.id,
+                home_score=home_score,
+                away_score=away_score,
+                is_finished=True,
+                season=season_for(game_date)
+            )
+            db.add(game)
+            existing_games[game_id] = game
+            result["games"] += 1
+
+        db.commit()
+
+    except Exception as e:
+        db.rollback()
+        result["errors"].append(f"Games sync error: {str(e)}")
+        return result
+
+    # Log update
+    update = DataUpdate(update_type=f"{league_code.lower()}_flashscore_sync")
+    db.add(update)
+    db.commit()
+
+    return result
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        """Sync Flashscore leagues"""
+        params = parse_qs(urlparse(self.path).query)
+        try:
+            days = min(max(int(params.get("days", [SYNC_DAYS])[0]), 1), MAX_SYNC_DAYS)
+        except ValueError:
+            days = SYNC_DAYS
+
+        try:
+            db = SessionLocal()
+
+            try:
+                results = {}
+                for league_code, league_config in LEAGUES.items():
+                    results[league_code] = run(sync_league(db, league_code, league_config, days))
+
+                self.send_response(200)
+                self.send_header("Content-type", "application/json")
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                self.wfile.write(json.dumps({
+                    "success": True,
+                    "days": days,
+                    "results": results,
+                    "timestamp": datetime.now().isoformat()
+                }).encode())
+
+            finally:
+                db.close()
+
+        except Exception as e:
+            self.send_response(500)
+            self.send_header("Content-type", "application/json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": str(e)}).encode())
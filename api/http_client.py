@@ -0,0 +1,178 @@
+"""Shared pooled HTTP client for serverless functions.
+
+One httpx client per process, reused across warm invocations so repeat
+requests to the same hosts skip TCP/TLS handshakes. httpx clients are bound
+to the event loop they first run on, so all async work goes through run(),
+which executes coroutines on a persistent background loop instead of a
+fresh asyncio.run() per request. GETs to the league APIs go through the
+conditional-request disk cache (backend/app/services/http_cache.py), and all
+requests through the per-host circuit breakers / retry budgets / hedging in
+backend/app/services/resilience.py.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from collections import defaultdict
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# HTTP cache and resilience layer shared with the backend services
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from app.services.http_cache import CachingTransport  # noqa: E402
+from app.services.http_replay import wrap_transport  # noqa: E402
+from app.services.resilience import CircuitOpenError, ResilientTransport  # noqa: E402,F401
+
+
+MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "50"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+# Idle connections are kept this long (seconds) between warm invocations
+KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "90"))
+# Concurrent requests per host (HTTP/2 requests share one connection)
+MAX_PER_HOST = int(os.environ.get("HTTP_MAX_PER_HOST", "10"))
+DEFAULT_TIMEOUT = 30.0
+
+_lock = threading.Lock()
+_loop = None
+_client = None
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Releases the per-host slot once the response body is closed"""
+
+    def __init__(self, stream, semaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._semaphore.release()
+
+
+class HostLimitedTransport(httpx.AsyncHTTPTransport):
+    """Transport that caps in-flight requests per host"""
+
+    def __init__(self, max_per_host=MAX_PER_HOST, **kwargs):
+        super().__init__(**kwargs)
+        self._semaphores = defaultdict(lambda: asyncio.Semaphore(max_per_host))
+
+    async def handle_async_request(self, request):
+        semaphore = self._semaphores[request.url.host]
+        await semaphore.acquire()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, semaphore)
+        return response
+
+
+def _run_loop(loop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def get_loop():
+    """Get the persistent background event loop, starting it on first use"""
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_run_loop, args=(_loop,), daemon=True, name="http-client-loop")
+            thread.start()
+        return _loop
+
+
+def create_client(**kwargs):
+    """Create a pooled client (HTTP/2 when available, keep-alive, per-host limits,
+    circuit breakers and the HTTP cache)"""
+    transport = HostLimitedTransport(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        retries=1,  # Reconnect once if a kept-alive connection was dropped
+    )
+    transport = CachingTransport(ResilientTransport(wrap_transport(transport)))
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return httpx.AsyncClient(transport=transport, **kwargs)
+
+
+def get_client():
+    """Get the process-wide pooled client"""
+    global _client
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = create_client()
+        return _client
+
+
+class ClientSession:
+    """View over the shared client with per-use defaults.
+
+    Drop-in for `async with httpx.AsyncClient(timeout=..., follow_redirects=...) as client:`
+    except that leaving the block does not close the pooled connections.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, follow_redirects=False, headers=None):
+        self.timeout = timeout
+        self.follow_redirects = follow_redirects
+        self.headers = headers or {}
+
+    def _defaults(self, kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs.setdefault("follow_redirects", self.follow_redirects)
+        if self.headers:
+            kwargs["headers"] = {**self.headers, **(kwargs.get("headers") or {})}
+        return kwargs
+
+    async def get(self, url, **kwargs):
+        return await get_client().get(url, **self._defaults(kwargs))
+
+    async def post(self, url, **kwargs):
+        return await get_client().post(url, **self._defaults(kwargs))
+
+    async def request(self, method, url, **kwargs):
+        return await get_client().request(method, url, **self._defaults(kwargs))
+
+    def stream(self, method, url, **kwargs):
+        return get_client().stream(method, url, **self._defaults(kwargs))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def pooled_client(timeout=DEFAULT_TIMEOUT, follow_redirects=False, headers=None):
+    """Session over the shared client; use with `async with` inside run()"""
+    return ClientSession(timeout=timeout, follow_redirects=follow_redirects, headers=headers)
+
+
+def run(coro, timeout=None):
+    """Run a coroutine on the shared loop and wait for its result.
+
+    Replaces asyncio.run() in request handlers so the pooled client stays valid.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    return future.result(timeout)
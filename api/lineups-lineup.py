@@ -2,212 +2,275 @@
 API endpoint for getting lineups from Flashscore.
 GET /api/lineups/lineup?type=match&url=<match_url>  - Get both teams
 GET /api/lineups/lineup?type=team&url=<team_url>    - Get single team
+
+Add stream=ndjson (or stream=sse) to receive the lineup progressively, one
+JSON record per line (or per server-sent event):
+  {"type": "team", "side": "home", "team": ..., "players_listed": N, "source": ...}
+  {"type": "player", "side": "home", "category": "leaders_active", "player": {...}}
+  ... players in the order their pages are parsed, sides interleaved ...
+  {"type": "summary", "success": true, "home": {...}, "away": {...}}
+The summary carries the same body as the non-streamed response (sorted
+categories) and is authoritative; on failure the last record is
+{"type": "error", "success": false, "error": ...}.
 """
 
 from http.server import BaseHTTPRequestHandler
 import sys, os
 sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 import json
-import re
 import asyncio
-from datetime import datetime
-import httpx
-from bs4 import BeautifulSoup
+import queue
 
+# No worker processes in a serverless function; parse inline
+os.environ.setdefault("CPU_POOL_WORKERS", "0")
 
-HEADERS = {"x-fsign": "SW9D1eZo"}
-EFFICIENCY_THRESHOLD = 0.3
+from http_client import get_loop, run
+from app.services import lineup_cache
+from app.services.flashscore_feed import DayFeedCache
+from app.services.flashscore_service import (
+    PLAYER_FETCH_CONCURRENCY, get_team_urls, lineup_client, player_category, scrape_team_players, team_lineup
+)
 
 
-def is_in_season(season):
-    try:
-        start_year, end_year = map(int, season.split('/'))
-        season_start = datetime(start_year, 7, 1)
-        season_end = datetime(end_year, 6, 30)
-        return season_start <= datetime.now() <= season_end
-    except (ValueError, AttributeError):
-        return False
+# ?stream= formats
+STREAM_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'sse': 'text/event-stream; charset=utf-8',
+}
+
 
+async def get_team_lineup(team_url, client=None, semaphore=None, last_games=None, on_team=None, on_player=None):
+    """Stored lineup (players table) unless the team has played since; otherwise scrape and store"""
+    if client is None:
+        async with lineup_client() as client:
+            last_games = await load_last_games(client)
+            return await get_team_lineup(team_url, client, semaphore, last_games, on_team, on_player)
+    semaphore = semaphore or asyncio.Semaphore(PLAYER_FETCH_CONCURRENCY)
 
-async def get_team_urls(match_url):
-    async with httpx.AsyncClient(follow_redirects=True, timeout=15.0) as client:
-        response = await client.get(match_url, headers=HEADERS)
-        html_content = response.text
+    async def scrape(url):
+        return await scrape_team_players(url, client, semaphore, on_team, on_player)
 
-    soup = BeautifulSoup(html_content, 'html.parser')
-    result_string = soup.find('script', string=re.compile(r"window\.environment"))
+    store = get_player_store()
+    if store is None:
+        scraped = await scrape(team_url)
+        return team_lineup(scraped.team, scraped.players)
 
-    if not result_string:
-        return {}
+    player_store, session_factory = store
+    db = session_factory()
+    try:
+        return await player_store.stored_team_lineup(db, team_url, scrape, last_games)
+    finally:
+        db.close()
 
-    match = re.search(r"window\.environment\s*=\s*(\{.*\});", result_string.string)
 
-    result_dict = {}
-    if match:
-        json_data = json.loads(match.group(1))
-        home_link = json_data['participantsData']['home'][0]['detail_link']
-        away_link = json_data['participantsData']['away'][0]['detail_link']
-        result_dict = {
-            'home': f'https://www.flashscore.com{home_link}',
-            'away': f'https://www.flashscore.com{away_link}'
-        }
+async def load_last_games(client):
+    """Latest finished games for the store's freshness check (None without a store)"""
+    store = get_player_store()
+    if store is None:
+        return None
+    return await store[0].load_last_games(client, _day_feeds)
 
-    return result_dict
 
+def get_cache_redis():
+    """Redis client for precomputed lineups and day feeds, or None when not configured"""
+    if not (os.environ.get('KV_REST_API_URL') or os.environ.get('UPSTASH_REDIS_REST_URL')):
+        return None
+    from auth_helpers import get_redis
+    return get_redis()
 
-async def get_player_stats(player_url, player_name, team_name):
-    async with httpx.AsyncClient(follow_redirects=True, timeout=15.0) as client:
-        response = await client.get(player_url, headers=HEADERS)
-        player_html = response.text
 
-    soup = BeautifulSoup(player_html, 'html.parser')
-    result_string = soup.find('script', string=re.compile(r"window\.playerProfilePageEnvironment"))
+_day_feeds = DayFeedCache(redis_factory=get_cache_redis)
 
-    json_data = {}
-    if result_string:
-        script_content = result_string.string
-        match = re.search(r"window\.playerProfilePageEnvironment\s*=\s*(\{.*\});", script_content)
-        if match:
-            json_data = json.loads(match.group(1))
+# (player_store module, session factory) once loaded; False when the DB layer is unavailable
+_player_store = None
 
-    last_match_status = ''
-    try:
-        steps = json_data.get('lastMatchesData', {}).get('lastMatches', [])
-        for step in steps:
-            home_participant = step.get('homeParticipantName', '')
-            away_participant = step.get('awayParticipantName', '')
-            if team_name in (home_participant, away_participant):
-                if step.get('absenceCategory', '') == '':
-                    last_match_status = 'заявлен'
-                else:
-                    last_match_status = step.get('absenceCategory', '')
-                break
-    except Exception:
-        pass
-
-    matches_played = 0
-    goals = 0
-    assists = 0
-    points = 0
-    season_name = ''
-
-    career_tables = json_data.get('careerTables', [])
-
-    for table in career_tables:
-        for season in table.get('seasons', []):
-            try:
-                if is_in_season(season.get('season_name', '')) and season.get('team_name') == team_name:
-                    matches_played = int(season.get('matches_played', 0) or 0)
-                    goals = int(season.get('goals', 0) or 0)
-                    assists = int(season.get('assists', 0) or 0)
-                    points = int(season.get('points', 0) or 0)
-                    season_name = season.get('season_name', '')
-                    break
-            except (ValueError, TypeError):
-                continue
-        if matches_played > 0:
-            break
-
-    efficiency = round(points / matches_played, 2) if matches_played > 0 else 0.0
-
-    return {
-        'name': player_name,
-        'status': last_match_status,
-        'matches': matches_played,
-        'goals': goals,
-        'assists': assists,
-        'points': points,
-        'efficiency': efficiency,
-        'season': season_name
-    }
-
-
-def categorize_players(players):
-    leaders_active = []
-    leaders_questionable = []
-    absent = []
-    others = []
-
-    for player in players:
-        efficiency = player.get('efficiency', 0)
-        status = player.get('status', '').lower()
-        is_available = status == 'заявлен'
-        is_top_player = efficiency > EFFICIENCY_THRESHOLD
-        is_absent = status in ['травма', 'не заявлен', 'injury', 'missing'] or (status != 'заявлен' and status != '')
-
-        if is_absent:
-            absent.append(player)
-        elif is_top_player and is_available:
-            leaders_active.append(player)
-        elif is_top_player and not is_available:
-            leaders_questionable.append(player)
-        else:
-            others.append(player)
-
-    leaders_active.sort(key=lambda x: x.get('efficiency', 0), reverse=True)
-    leaders_questionable.sort(key=lambda x: x.get('efficiency', 0), reverse=True)
-    absent.sort(key=lambda x: x.get('points', 0), reverse=True)
-    others.sort(key=lambda x: x.get('efficiency', 0), reverse=True)
-
-    return {
-        'leaders_active': leaders_active,
-        'leaders_questionable': leaders_questionable,
-        'absent': absent,
-        'others': others
-    }
-
-
-async def get_team_lineup(team_url):
-    async with httpx.AsyncClient(follow_redirects=True, timeout=60.0) as client:
-        response = await client.get(team_url, headers=HEADERS)
-        html_content = response.text
-
-    soup = BeautifulSoup(html_content, 'html.parser')
-    team_name_elem = soup.find("div", class_="heading__name")
-    team_name = team_name_elem.text.strip() if team_name_elem else "Unknown"
-
-    players_elements = soup.find_all("a", class_="lineupTable__cell--name")
-    player_data = []
-    seen_links = set()
-
-    for player_elem in players_elements:
-        pname = player_elem.get_text(strip=True)
-        player_link = f'https://www.flashscore.com{player_elem.get("href", "")}'
-        if player_link in seen_links:
-            continue
-        seen_links.add(player_link)
-        player_data.append((player_link, pname))
-
-    async def safe_get_player(link, name):
+
+def get_player_store():
+    """
+    The players tables (app.services.player_store) and a session factory,
+    imported on first use; None when the DB layer can't be loaded, in which
+    case lineups are scraped without the store.
+    """
+    global _player_store
+    if _player_store is None:
         try:
-            return await get_player_stats(link, name, team_name)
-        except Exception as e:
-            print(f"Error parsing player {name}: {e}")
+            from app.models.database import SessionLocal, init_db
+            from app.services import player_store
+        except ImportError as e:
+            print(f"Player store unavailable, scraping lineups directly: {e}")
+            _player_store = False
             return None
+        try:
+            init_db()
+        except Exception as e:
+            print(f"DB init warning: {e}")
+        _player_store = (player_store, SessionLocal)
+    return _player_store or None
+
 
-    tasks = [safe_get_player(link, name) for link, name in player_data]
-    results = await asyncio.gather(*tasks)
-    players = [p for p in results if p is not None]
-    categorized = categorize_players(players)
+def get_cached_match_lineups(match_url):
+    """Precomputed lineups when fresh; otherwise scrape now, store, and fall back to a stale copy on failure"""
+    redis = get_cache_redis()
+    cached = lineup_cache.load(redis, match_url)
+    if cached and lineup_cache.is_fresh(cached):
+        return cached
 
-    return {
-        'team': team_name,
-        'players': categorized,
-        'total_players': len(players)
-    }
+    try:
+        lineups = run(get_match_lineups(match_url))
+    except Exception as e:
+        if cached:
+            print(f"Lineup scrape failed, serving stored copy: {e}")
+            return cached
+        raise
+    lineup_cache.store(redis, match_url, lineups)
+    return lineups
 
 
 async def get_match_lineups(match_url):
-    team_urls = await get_team_urls(match_url)
     result = {'home': None, 'away': None}
-    if team_urls.get('home'):
-        result['home'] = await get_team_lineup(team_urls['home'])
-    if team_urls.get('away'):
-        result['away'] = await get_team_lineup(team_urls['away'])
+    # Both teams share one client and one player-page limit
+    semaphore = asyncio.Semaphore(PLAYER_FETCH_CONCURRENCY)
+    async with lineup_client() as client:
+        team_urls = await get_team_urls(match_url, client)
+        last_games = await load_last_games(client)
+        sides = [side for side in ('home', 'away') if team_urls.get(side)]
+        lineups = await asyncio.gather(*(get_team_lineup(team_urls[side], client, semaphore, last_games) for side in sides))
+    result.update(zip(sides, lineups))
     return result
 
 
+def emit_lineup(emit, side, lineup, team_url, source):
+    """Team and player records of an already built lineup"""
+    emit({
+        'type': 'team', 'side': side, 'team': lineup['team'], 'url': team_url,
+        'players_listed': lineup['total_players'], 'source': source
+    })
+    for category, players in lineup['players'].items():
+        for player in players:
+            emit({'type': 'player', 'side': side, 'category': category, 'player': player})
+
+
+async def stream_team_lineup(emit, side, team_url, client, semaphore, last_games):
+    """Lineup of one team, emitting records as player pages are parsed"""
+    scraping = []
+
+    def on_team(team_name, listed):
+        scraping.append(team_name)
+        emit({
+            'type': 'team', 'side': side, 'team': team_name, 'url': team_url,
+            'players_listed': listed, 'source': 'scrape'
+        })
+
+    def on_player(player):
+        emit({'type': 'player', 'side': side, 'category': player_category(player), 'player': player})
+
+    lineup = await get_team_lineup(team_url, client, semaphore, last_games, on_team, on_player)
+    if not scraping:
+        # Served from the players table without a scrape
+        emit_lineup(emit, side, lineup, team_url, 'store')
+    return lineup
+
+
+async def stream_lineups(emit, lineup_type, url, redis=None, cached=None):
+    """
+    Emit team/player records, then the summary record. `cached` is the
+    precomputed entry, read by the caller since Redis calls block the loop.
+    """
+    if lineup_type == 'team':
+        async with lineup_client() as client:
+            last_games = await load_last_games(client)
+            semaphore = asyncio.Semaphore(PLAYER_FETCH_CONCURRENCY)
+            lineup = await stream_team_lineup(emit, 'team', url, client, semaphore, last_games)
+        emit({'type': 'summary', 'success': True, **lineup})
+        return
+
+    if cached and lineup_cache.is_fresh(cached):
+        for side in ('home', 'away'):
+            if cached.get(side):
+                emit_lineup(emit, side, cached[side], None, 'precomputed')
+        emit({
+            'type': 'summary', 'success': True,
+            'home': cached.get('home'), 'away': cached.get('away'), 'computed_at': cached.get('computed_at')
+        })
+        return
+
+    try:
+        result = {'home': None, 'away': None}
+        semaphore = asyncio.Semaphore(PLAYER_FETCH_CONCURRENCY)
+        async with lineup_client() as client:
+            team_urls = await get_team_urls(url, client)
+            last_games = await load_last_games(client)
+            sides = [side for side in ('home', 'away') if team_urls.get(side)]
+            lineups = await asyncio.gather(*(
+                stream_team_lineup(emit, side, team_urls[side], client, semaphore, last_games) for side in sides
+            ))
+        result.update(zip(sides, lineups))
+    except Exception as e:
+        if not cached:
+            raise
+        print(f"Lineup scrape failed, serving stored copy: {e}")
+        result = cached
+    else:
+        await asyncio.get_running_loop().run_in_executor(None, lineup_cache.store, redis, url, result)
+
+    summary = {'type': 'summary', 'success': True, 'home': result.get('home'), 'away': result.get('away')}
+    if 'computed_at' in result:
+        summary['computed_at'] = result['computed_at']
+    emit(summary)
+
+
+def format_record(record, stream_format):
+    data = json.dumps(record, ensure_ascii=False)
+    if stream_format == 'sse':
+        return f"event: {record['type']}\ndata: {data}\n\n".encode('utf-8')
+    return (data + '\n').encode('utf-8')
+
+
 class handler(BaseHTTPRequestHandler):
+    def send_stream(self, lineup_type, url, stream_format):
+        """Write records as the shared loop produces them"""
+        self.send_response(200)
+        self.send_header('Content-Type', STREAM_CONTENT_TYPES[stream_format])
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+
+        # Blocking setup (Redis read, DB init) here rather than on the shared loop
+        get_player_store()
+        redis = cached = None
+        if lineup_type != 'team':
+            redis = get_cache_redis()
+            cached = lineup_cache.load(redis, url)
+
+        records = queue.Queue()
+        done = object()
+        future = asyncio.run_coroutine_threadsafe(
+            stream_lineups(records.put, lineup_type, url, redis, cached), get_loop()
+        )
+        future.add_done_callback(lambda _: records.put(done))
+
+        try:
+            while True:
+                record = records.get()
+                if record is done:
+                    break
+                self.wfile.write(format_record(record, stream_format))
+                self.wfile.flush()
+
+            error = future.exception()
+            if error is not None:
+                print(f"Lineup stream error: {error}")
+                self.wfile.write(format_record({
+                    'type': 'error', 'success': False, 'error': str(error), 'error_type': type(error).__name__
+                }, stream_format))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away; stop scraping for it
+            future.cancel()
+
+
     def do_GET(self):
         try:
             from urllib.parse import urlparse, parse_qs, unquote
@@ -234,21 +297,26 @@ class handler(BaseHTTPRequestHandler):
 
             url = unquote(url)
 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            stream_format = params.get('stream', [''])[0].lower()
+            if stream_format in ('1', 'true'):
+                stream_format = 'ndjson'
+            if stream_format in STREAM_CONTENT_TYPES:
+                self.send_stream(lineup_type, url, stream_format)
+                return
 
+            get_player_store()
             if lineup_type == 'team':
-                lineup = loop.run_until_complete(get_team_lineup(url))
+                lineup = run(get_team_lineup(url))
                 response = {'success': True, **lineup}
             else:
-                lineups = loop.run_until_complete(get_match_lineups(url))
+                lineups = get_cached_match_lineups(url)
                 response = {
                     'success': True,
                     'home': lineups.get('home'),
                     'away': lineups.get('away')
                 }
-
-            loop.close()
+                if 'computed_at' in lineups:
+                    response['computed_at'] = lineups['computed_at']
 
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
@@ -7,8 +7,7 @@ from http.server import BaseHTTPRequestHandler
 import sys, os
 sys.path.insert(0, os.path.dirname(__file__))
 import json
-import asyncio
-import httpx
+from http_client import pooled_client, run
 
 
 # Flashscore config
@@ -33,7 +32,7 @@ async def get_matches_list(league, day_offset=0):
     target_patterns = LEAGUE_NAME_PATTERNS.get(league.upper(), [])
 
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
+        async with pooled_client(follow_redirects=True, timeout=30.0) as client:
             response = await client.get(url, headers=HEADERS)
             data = response.text
             if not data or data.strip() in ('0', ''):
@@ -101,10 +100,7 @@ class handler(BaseHTTPRequestHandler):
             league = params.get('league', ['KHL'])[0].upper()
             day = int(params.get('day', ['0'])[0])
 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            matches = loop.run_until_complete(get_matches_list(league, day))
-            loop.close()
+            matches = run(get_matches_list(league, day))
 
             leagues = {}
             for match in matches:
@@ -1,14 +1,51 @@
-"""GET /api/odds - Get bookmaker odds from JetTon"""
+"""GET /api/odds - Get bookmaker odds from JetTon
+
+The event list is served from a snapshot of formatted hockey events kept in
+memory and in Redis. At most one request per ODDS_SNAPSHOT_TTL (across all
+instances, via a Redis lock) refreshes it from JetTon; everyone else reads it.
+
+GET /api/odds?event_ids=1,2,3 returns detailed odds for many events at once
+(fetched concurrently, cached per event for ODDS_EVENT_TTL seconds).
+"""
 from http.server import BaseHTTPRequestHandler
 import sys, os
 sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 import json
+import asyncio
+import threading
+import time
 import httpx
+from http_client import CircuitOpenError, pooled_client, run
+from app.services.json_stream import StreamCollector, project
+from app.services.team_aliases import TeamAliasIndex
 from urllib.parse import urlparse, parse_qs
 
 BRAND_ID = '2467728453932290048'
 BASE_URL = 'https://sp.btspcloud.xyz'
 
+# Parallel chunk downloads per poll
+CHUNK_CONCURRENCY = int(os.environ.get('JETTON_CHUNK_CONCURRENCY', '6'))
+
+# version -> task resolving to (hockey_events, tournaments) of that chunk.
+# A version id identifies chunk content, so entries never go stale; versions
+# no longer listed are dropped on the next poll. Lives for the warm instance.
+_chunk_cache = {}
+
+# Seconds a snapshot of the event list is served before it is refreshed
+SNAPSHOT_TTL = int(os.environ.get('ODDS_SNAPSHOT_TTL', '60'))
+SNAPSHOT_KEY = 'odds:snapshot'
+SNAPSHOT_LOCK_KEY = 'odds:snapshot:lock'
+SNAPSHOT_LOCK_SECONDS = 30
+
+# Detailed per-event odds
+EVENT_ODDS_TTL = int(os.environ.get('ODDS_EVENT_TTL', '30'))
+EVENT_BATCH_CONCURRENCY = int(os.environ.get('ODDS_EVENT_CONCURRENCY', '8'))
+MAX_BATCH_EVENTS = 50
+
+# event_id -> (fetched_at, formatted event or None if not found)
+_event_cache = {}
+
 # JetTon team name to our abbreviation mapping
 JETTON_TO_ABBREV = {
     # NHL
@@ -95,6 +132,11 @@ JETTON_TO_ABBREV = {
     'Eisbaren Berlin': 'EBB',
 }
 
+# Tolerates JetTon spelling variants ('Kölner Haie', 'Utah HC', ...)
+JETTON_TEAM_INDEX = TeamAliasIndex()
+for _name, _abbrev in JETTON_TO_ABBREV.items():
+    JETTON_TEAM_INDEX.add(_abbrev, _name)
+
 # JetTon tournament IDs
 TOURNAMENTS = {
     'NHL': '1669818960062844928',
@@ -113,52 +155,122 @@ MARKETS = {
     'handicap': '16',        # Handicap
 }
 
+# Only the fields format_event() reads are kept from the prematch catalog
+EVENT_FIELDS = {
+    'desc': {
+        'competitors': None,
+        'tournament': None,
+        'scheduled': None,
+    },
+    'markets': {
+        MARKETS['total']: None,
+        MARKETS['team1_total']: None,
+        MARKETS['team2_total']: None,
+    },
+}
 
-async def fetch_all_hockey_events():
-    """Fetch all hockey events from JetTon"""
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # Get version info
-        resp = await client.get(f'{BASE_URL}/api/v4/prematch/brand/{BRAND_ID}/en/0')
-        data = resp.json()
-
-        all_events = {}
-        tournaments_data = {}
-
-        # Fetch all chunks
-        versions = data.get('top_events_versions', []) + data.get('rest_events_versions', [])
-        for version in versions:
-            try:
-                resp = await client.get(f'{BASE_URL}/api/v4/prematch/brand/{BRAND_ID}/en/{version}')
-                chunk = resp.json()
-                if 'events' in chunk:
-                    all_events.update(chunk['events'])
-                if 'tournaments' in chunk:
-                    tournaments_data.update(chunk['tournaments'])
-            except:
-                pass
 
-        # Filter hockey events (sport_id = 4)
+def is_hockey_event(event: dict) -> bool:
+    """Hockey match (sport_id = 4), excluding outrights"""
+    competitors = event.get('desc', {}).get('competitors', [])
+    if len(competitors) < 2 or competitors[0].get('sport_id') != '4':
+        return False
+    return not any('winner' in c.get('name', '').lower() for c in competitors)
+
+
+async def fetch_events_chunk(client, version):
+    """Stream one prematch chunk, keeping only hockey events and tournament names"""
+    hockey_events = {}
+    tournaments = {}
+
+    def on_event(event_id, event):
+        if isinstance(event, dict) and is_hockey_event(event):
+            hockey_events[event_id] = project(event, EVENT_FIELDS)
+
+    def on_tournament(tournament_id, tournament):
+        if isinstance(tournament, dict):
+            tournaments[tournament_id] = {'name': tournament.get('name', '')}
+
+    collector = StreamCollector().on_entry('events', on_event).on_entry('tournaments', on_tournament)
+    async with client.stream('GET', f'{BASE_URL}/api/v4/prematch/brand/{BRAND_ID}/en/{version}') as resp:
+        resp.raise_for_status()
+        await collector.feed_response(resp)
+    return hockey_events, tournaments
+
+
+async def get_events_chunk(client, version, semaphore):
+    """Chunk contents by version: cached, shared with concurrent polls, or fetched"""
+    task = _chunk_cache.get(version)
+    if task is None or (task.done() and (task.cancelled() or task.exception())):
+        async def fetch():
+            async with semaphore:
+                return await fetch_events_chunk(client, version)
+        task = asyncio.ensure_future(fetch())
+        _chunk_cache[version] = task
+    return await asyncio.shield(task)
+
+
+async def fetch_versions(client):
+    """Current chunk versions of the prematch catalog"""
+    resp = await client.get(f'{BASE_URL}/api/v4/prematch/brand/{BRAND_ID}/en/0')
+    resp.raise_for_status()
+    data = resp.json()
+    return data.get('top_events_versions', []) + data.get('rest_events_versions', [])
+
+
+async def fetch_all_hockey_events(versions=None):
+    """
+    Fetch all hockey events from JetTon.
+
+    Returns:
+        (events, tournaments, merged versions); chunks that failed are left
+        out of the versions so the next refresh fetches them again
+    """
+    async with pooled_client(timeout=30.0) as client:
+        if versions is None:
+            versions = await fetch_versions(client)
+
+        for version in list(_chunk_cache):
+            if version not in versions:
+                del _chunk_cache[version]
+
+        # Only versions not seen before are downloaded, CHUNK_CONCURRENCY at a time.
+        # Chunks are filtered while streaming, so memory scales with hockey
+        # events rather than the whole prematch catalog
+        semaphore = asyncio.Semaphore(CHUNK_CONCURRENCY)
+        results = await asyncio.gather(
+            *(get_events_chunk(client, version, semaphore) for version in versions),
+            return_exceptions=True
+        )
+
+        # Merge in listing order so later chunks override earlier ones as before
         hockey_events = {}
-        for event_id, event in all_events.items():
-            desc = event.get('desc', {})
-            competitors = desc.get('competitors', [])
-            if len(competitors) >= 2 and competitors[0].get('sport_id') == '4':
-                # Skip outrights
-                if any('winner' in c.get('name', '').lower() for c in competitors):
-                    continue
-                hockey_events[event_id] = event
+        tournaments_data = {}
+        merged = []
+        for version, result in zip(versions, results):
+            if isinstance(result, (httpx.HTTPError, ValueError)):
+                print(f"Error fetching JetTon chunk {version}: {result}")
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            chunk_events, chunk_tournaments = result
+            hockey_events.update(chunk_events)
+            tournaments_data.update(chunk_tournaments)
+            merged.append(version)
 
-        return hockey_events, tournaments_data
+        return hockey_events, tournaments_data, merged
 
 
 async def fetch_event_odds(event_id: str):
     """Fetch detailed odds for specific event"""
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with pooled_client(timeout=30.0) as client:
         url = f'{BASE_URL}/api/v4/prematch/brand/{BRAND_ID}/event/en/{event_id}'
         resp = await client.get(url)
 
-        if resp.status_code != 200:
+        # Only a 404 means the event doesn't exist; other failures raise
+        if resp.status_code == 404:
             return None
+        resp.raise_for_status()
 
         data = resp.json()
         events = data.get('events', {})
@@ -223,12 +335,12 @@ def format_event(event_id: str, event_data: dict, tournaments: dict):
         'home_team': {
             'id': competitors[0].get('id'),
             'name': home_name,
-            'abbrev': JETTON_TO_ABBREV.get(home_name),
+            'abbrev': JETTON_TEAM_INDEX.resolve(home_name),
         },
         'away_team': {
             'id': competitors[1].get('id'),
             'name': away_name,
-            'abbrev': JETTON_TO_ABBREV.get(away_name),
+            'abbrev': JETTON_TEAM_INDEX.resolve(away_name),
         },
         'odds': {
             'match_total': parse_total_market(markets.get('18')),
@@ -239,9 +351,139 @@ def format_event(event_id: str, event_data: dict, tournaments: dict):
     }
 
 
+async def get_events_odds(event_ids):
+    """Formatted detailed odds for each id (None if not found) and the errors of
+    ids whose fetch failed; only ids not cached within EVENT_ODDS_TTL are
+    fetched, EVENT_BATCH_CONCURRENCY at a time"""
+    now = time.time()
+    missing = [
+        eid for eid in event_ids
+        if eid not in _event_cache or now - _event_cache[eid][0] >= EVENT_ODDS_TTL
+    ]
+    semaphore = asyncio.Semaphore(EVENT_BATCH_CONCURRENCY)
+    errors = {}
+
+    async def fetch(eid):
+        async with semaphore:
+            try:
+                event = await fetch_event_odds(eid)
+            except (httpx.HTTPError, ValueError) as e:
+                # Not cached: an outage is not "not found"
+                print(f"Error fetching JetTon event {eid}: {e}")
+                errors[eid] = e
+                return
+        _event_cache[eid] = (time.time(), format_event(eid, event, {}) if event else None)
+
+    await asyncio.gather(*(fetch(eid) for eid in missing))
+
+    found = {eid: _event_cache[eid][1] for eid in event_ids if eid not in errors and eid in _event_cache}
+    for eid in [eid for eid, (fetched_at, _) in _event_cache.items() if now - fetched_at >= EVENT_ODDS_TTL]:
+        del _event_cache[eid]
+    return found, errors
+
+
+class OddsSnapshot:
+    """Formatted hockey events with per-league and per-id indexes"""
+
+    def __init__(self, events, versions, refreshed_at):
+        self.events = sorted(events, key=lambda x: x.get('scheduled') or 0)
+        self.versions = versions
+        self.refreshed_at = refreshed_at
+        self.by_id = {}
+        self.by_league = {}
+        for event in self.events:
+            self.by_id[event['event_id']] = event
+            self.by_league.setdefault(event.get('league'), []).append(event)
+
+    @property
+    def age(self):
+        return time.time() - self.refreshed_at
+
+    def select(self, league=None):
+        if league:
+            return self.by_league.get(league.upper(), [])
+        return self.events
+
+    def to_json(self):
+        return json.dumps({'events': self.events, 'versions': self.versions, 'refreshed_at': self.refreshed_at})
+
+    @classmethod
+    def from_json(cls, raw):
+        data = json.loads(raw)
+        return cls(data['events'], data['versions'], data['refreshed_at'])
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+async def build_snapshot(previous=None):
+    """Refresh incrementally: nothing is re-downloaded if the chunk versions are
+    unchanged, and otherwise only new chunks are (see _chunk_cache)"""
+    async with pooled_client(timeout=30.0) as client:
+        versions = await fetch_versions(client)
+    if previous is not None and previous.versions == versions:
+        return OddsSnapshot(previous.events, versions, time.time())
+
+    # Only merged versions are recorded: a snapshot missing a failed chunk
+    # never matches the listing, so the next refresh retries that chunk
+    events, tournaments, merged = await fetch_all_hockey_events(versions)
+    formatted = [format_event(eid, ev, tournaments) for eid, ev in events.items()]
+    return OddsSnapshot([f for f in formatted if f], merged, time.time())
+
+
+def get_snapshot_redis():
+    """Redis client for the shared snapshot, or None when not configured"""
+    if not (os.environ.get('KV_REST_API_URL') or os.environ.get('UPSTASH_REDIS_REST_URL')):
+        return None
+    from auth_helpers import get_redis
+    return get_redis()
+
+
+def get_snapshot():
+    """Current snapshot; refreshed by at most one caller per SNAPSHOT_TTL"""
+    global _snapshot
+    if _snapshot is not None and _snapshot.age < SNAPSHOT_TTL:
+        return _snapshot
+
+    with _snapshot_lock:
+        if _snapshot is not None and _snapshot.age < SNAPSHOT_TTL:
+            return _snapshot
+
+        redis = get_snapshot_redis()
+        if redis is not None:
+            try:
+                raw = redis.get(SNAPSHOT_KEY)
+                stored = OddsSnapshot.from_json(raw) if raw else None
+                if stored and (_snapshot is None or stored.refreshed_at > _snapshot.refreshed_at):
+                    _snapshot = stored
+                if _snapshot is not None and _snapshot.age < SNAPSHOT_TTL:
+                    return _snapshot
+                if _snapshot is not None and not redis.set(SNAPSHOT_LOCK_KEY, '1', nx=True, ex=SNAPSHOT_LOCK_SECONDS):
+                    # Another instance is refreshing; a slightly stale snapshot is fine
+                    return _snapshot
+            except Exception as e:
+                print(f"Odds snapshot Redis error: {e}")
+
+        try:
+            _snapshot = run(build_snapshot(_snapshot))
+        except Exception as e:
+            if _snapshot is None:
+                raise
+            print(f"Odds snapshot refresh failed, serving {int(_snapshot.age)}s old data: {e}")
+            return _snapshot
+
+        if redis is not None:
+            try:
+                redis.set(SNAPSHOT_KEY, _snapshot.to_json())
+                redis.delete(SNAPSHOT_LOCK_KEY)
+            except Exception as e:
+                print(f"Odds snapshot Redis error: {e}")
+        return _snapshot
+
+
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
-        import asyncio
         from auth_helpers import require_approved, send_json
 
         user = require_approved(self.headers)
@@ -254,12 +496,31 @@ class handler(BaseHTTPRequestHandler):
 
         league = params.get('league', [None])[0]
         event_id = params.get('event_id', [None])[0]
+        event_ids = [eid for value in params.get('event_ids', []) for eid in value.split(',') if eid]
 
         try:
-            if event_id:
+            if event_ids:
+                # Detailed odds for many events in one call
+                event_ids = list(dict.fromkeys(event_ids))[:MAX_BATCH_EVENTS]
+                found, errors = run(get_events_odds(event_ids))
+                if len(errors) == len(event_ids):
+                    # Nothing could be fetched: report the outage, not empty results
+                    raise next(iter(errors.values()))
+                events = {eid: event for eid, event in found.items() if event}
+                result = {
+                    'events': events,
+                    'missing': [eid for eid in event_ids if eid not in events and eid not in errors],
+                    'failed': list(errors),
+                    'count': len(events)
+                }
+
+            elif event_id:
                 # Fetch specific event with detailed odds
-                event = asyncio.run(fetch_event_odds(event_id))
-                if not event:
+                found, errors = run(get_events_odds([event_id]))
+                if event_id in errors:
+                    raise errors[event_id]
+                result = found.get(event_id)
+                if not result:
                     self.send_response(404)
                     self.send_header("Content-type", "application/json")
                     self.send_header("Access-Control-Allow-Origin", "*")
@@ -267,24 +528,11 @@ class handler(BaseHTTPRequestHandler):
                     self.wfile.write(json.dumps({"error": "Event not found"}).encode())
                     return
 
-                result = format_event(event_id, event, {})
-
             else:
-                # Fetch all hockey events
-                events, tournaments = asyncio.run(fetch_all_hockey_events())
-
-                results = []
-                for eid, ev in events.items():
-                    formatted = format_event(eid, ev, tournaments)
-                    if formatted:
-                        # Filter by league if specified
-                        if league and formatted.get('league') != league.upper():
-                            continue
-                        results.append(formatted)
-
-                # Sort by scheduled time
-                results.sort(key=lambda x: x.get('scheduled', 0))
-                result = {'events': results, 'count': len(results)}
+                # All hockey events (sorted by scheduled time) from the snapshot
+                snapshot = get_snapshot()
+                results = snapshot.select(league)
+                result = {'events': results, 'count': len(results), 'updated_at': snapshot.refreshed_at}
 
             self.send_response(200)
             self.send_header("Content-type", "application/json")
@@ -293,6 +541,21 @@ class handler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(json.dumps(result).encode())
 
+        except CircuitOpenError as e:
+            # Upstream is down and nothing cached: fail fast instead of timing out
+            self.send_response(503)
+            self.send_header("Content-type", "application/json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Retry-After", "30")
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": str(e)}).encode())
+        except httpx.HTTPError as e:
+            # Upstream failed for every requested event
+            self.send_response(502)
+            self.send_header("Content-type", "application/json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": str(e)}).encode())
         except Exception as e:
             self.send_response(500)
             self.send_header("Content-type", "application/json")
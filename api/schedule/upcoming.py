@@ -1,11 +1,17 @@
 """GET /api/schedule/upcoming - Get upcoming games"""
 from http.server import BaseHTTPRequestHandler
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
 import json
-import asyncio
 import unicodedata
 from urllib.parse import urlparse, parse_qs
 from datetime import datetime, timedelta, timezone
+from typing import List
 import httpx
+from http_client import CircuitOpenError, pooled_client, run
+from app.services.flashscore_feed import DayFeedCache, FeedMatch, league_matches
+from app.services.team_aliases import TeamAliasIndex
 
 
 def normalize_abbrev(text: str) -> str:
@@ -202,15 +208,12 @@ NL_TEAMS = {
     "EHC Biel-Bienne", "HC Davos", "HC Ambri-Piotta",
     "SCL Tigers", "HC Ajoie"
 }
-
-# Flashscore API configuration
-FLASHSCORE_BASE_URL = "https://2.flashscore.ninja/2/x/feed"
-FLASHSCORE_HEADERS = {"x-fsign": "SW9D1eZo"}
+NL_TEAM_INDEX = TeamAliasIndex.from_names(NL_TEAMS)
 
 
 async def get_nhl_schedule(days: int):
     games = []
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with pooled_client(timeout=30.0) as client:
         for i in range(days):
             # Use Kyiv timezone for date calculation
             date = (datetime.now(KYIV_TZ) + timedelta(days=i)).strftime("%Y-%m-%d")
@@ -252,7 +255,11 @@ async def get_nhl_schedule(days: int):
                                 },
                                 "venue": game.get("venue", {}).get("default", "")
                             })
-            except Exception as e:
+            except CircuitOpenError as e:
+                # Upstream is down; remaining days would fail the same way
+                print(f"Stopping NHL schedule at {date}: {e}")
+                break
+            except (httpx.HTTPError, ValueError) as e:
                 print(f"Error fetching NHL schedule for {date}: {e}")
     return games
 
@@ -262,7 +269,7 @@ async def get_ahl_schedule(days: int):
     seen_ids = set()
     base_url = "https://lscluster.hockeytech.com/feed/index.php"
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with pooled_client(timeout=30.0) as client:
         for i in range(days):
             # Use Kyiv timezone for date calculation
             date = (datetime.now(KYIV_TZ) + timedelta(days=i)).strftime("%Y-%m-%d")
@@ -308,13 +315,16 @@ async def get_ahl_schedule(days: int):
                         },
                         "venue": game.get("venue_name", "")
                     })
-            except Exception as e:
+            except CircuitOpenError as e:
+                print(f"Stopping AHL schedule at {date}: {e}")
+                break
+            except (httpx.HTTPError, ValueError) as e:
                 print(f"Error fetching AHL schedule for {date}: {e}")
     return games
 
 
 async def get_liiga_schedule(days: int):
-    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+    async with pooled_client(timeout=30.0, follow_redirects=True) as client:
         response = await client.get("https://liiga.fi/api/v2/games?tournament=runkosarja&season=2026")
         response.raise_for_status()
         all_games = response.json()
@@ -379,7 +389,7 @@ async def get_liiga_schedule(days: int):
 
 async def get_del_schedule(days: int):
     """Get DEL (German) schedule from OpenLigaDB"""
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with pooled_client(timeout=30.0) as client:
         response = await client.get("https://api.openligadb.de/getmatchdata/del/2025")
         response.raise_for_status()
         all_games = response.json()
@@ -443,15 +453,7 @@ FLASHSCORE_LOGO_BASE = "https://static.flashscore.com/res/image/data/"
 
 def is_nl_team(team_name: str) -> bool:
     """Check if team is in Swiss National League"""
-    if not team_name:
-        return False
-    if team_name in NL_TEAMS:
-        return True
-    name_lower = team_name.lower()
-    for nl_team in NL_TEAMS:
-        if nl_team.lower() in name_lower or name_lower in nl_team.lower():
-            return True
-    return False
+    return bool(team_name) and team_name in NL_TEAM_INDEX
 
 
 async def get_austria_schedule(days: int):
@@ -460,7 +462,7 @@ async def get_austria_schedule(days: int):
     season = "2025"
     league_id = "1"
 
-    async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
+    async with pooled_client(timeout=60.0, follow_redirects=True) as client:
         url = f"{base_url}/data/export/season/{season}/league/{league_id}/schedule_export.json"
         response = await client.get(url)
         response.raise_for_status()
@@ -530,7 +532,7 @@ async def get_swiss_schedule(days: int):
     base_url = "https://data.sihf.ch/Statistic/api/cms"
     league_id = "1"
 
-    async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
+    async with pooled_client(timeout=60.0, follow_redirects=True) as client:
         # Get all pages of results
         all_matches = []
         page = 1
@@ -633,85 +635,56 @@ async def get_swiss_schedule(days: int):
     return sorted(result, key=lambda g: g.get("date_iso", ""))
 
 
-async def parse_flashscore_data(data: str, target_league: str, team_names_ru: dict) -> list:
-    """Parse Flashscore feed data and extract matches for a specific league.
-    Uses same parsing approach as flashscore_service.py which works correctly.
-    """
-    if not data or data.strip() in ('0', ''):
-        return []
+def get_feed_redis():
+    """Redis client for shared day feeds, or None when not configured"""
+    if not (os.environ.get('KV_REST_API_URL') or os.environ.get('UPSTASH_REDIS_REST_URL')):
+        return None
+    from auth_helpers import get_redis
+    return get_redis()
 
-    items = data.split('¬')
 
-    # Group items into dicts like flashscore_service.py does
-    data_list = [{}]
-    for item in items:
-        if '÷' not in item:
-            continue
-        parts = item.split('÷')
-        key = parts[0]
-        value = parts[-1] if len(parts) > 1 else ''
+# Flashscore day feeds and their league index, shared by all leagues/requests
+_day_feeds = DayFeedCache(redis_factory=get_feed_redis)
 
-        if '~' in key:
-            data_list.append({key: value})
-        else:
-            data_list[-1].update({key: value})
+# Parallel day feed downloads per schedule request
+FLASHSCORE_SCHEDULE_CONCURRENCY = int(os.environ.get('FLASHSCORE_SCHEDULE_CONCURRENCY', '4'))
 
+
+def format_flashscore_matches(matches: List[FeedMatch], team_names_ru: dict) -> list:
+    """Schedule entries for one league's matches from a day feed index."""
     result = []
-    league_name = ''
+    for match in matches:
+        home = match.home
+        away = match.away
 
-    for game in data_list:
-        keys = list(game.keys())
-        if not keys:
+        try:
+            game_date = datetime.fromtimestamp(int(match.timestamp), tz=timezone.utc)
+            game_date = to_kyiv_time(game_date)
+        except ValueError:
             continue
 
-        # Check for league header
-        if '~ZA' in keys[0]:
-            league_name = game.get('~ZA', '')
-
-        # Check for match entry
-        if 'AA' in keys[0]:
-            # Filter by target league
-            if target_league.lower() not in league_name.lower():
-                continue
-
-            match_id = game.get('~AA', '')
-            home = game.get('AE', '')
-            away = game.get('AF', '')
-            timestamp = game.get('AD', '')
-            status = game.get('AB', '')
-            home_logo = game.get('OA', '')
-            away_logo = game.get('OB', '')
-            home_score = game.get('AG', '')
-            away_score = game.get('AH', '')
-
-            try:
-                game_date = datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
-                game_date = to_kyiv_time(game_date)
-            except:
-                continue
-
-            result.append({
-                "game_id": f"fs_{match_id}",
-                "date": game_date.strftime("%d.%m.%Y %H:%M"),
-                "date_iso": game_date.isoformat(),
-                "home_team": {
-                    "abbrev": home,
-                    "name": home,
-                    "name_ru": team_names_ru.get(home, home),
-                    "logo_url": f"{FLASHSCORE_LOGO_BASE}{home_logo}" if home_logo else ""
-                },
-                "away_team": {
-                    "abbrev": away,
-                    "name": away,
-                    "name_ru": team_names_ru.get(away, away),
-                    "logo_url": f"{FLASHSCORE_LOGO_BASE}{away_logo}" if away_logo else ""
-                },
-                "venue": "",
-                "status": status,
-                "home_score": home_score,
-                "away_score": away_score,
-                "league": league_name
-            })
+        result.append({
+            "game_id": f"fs_{match.id}",
+            "date": game_date.strftime("%d.%m.%Y %H:%M"),
+            "date_iso": game_date.isoformat(),
+            "home_team": {
+                "abbrev": home,
+                "name": home,
+                "name_ru": team_names_ru.get(home, home),
+                "logo_url": f"{FLASHSCORE_LOGO_BASE}{match.home_logo}" if match.home_logo else ""
+            },
+            "away_team": {
+                "abbrev": away,
+                "name": away,
+                "name_ru": team_names_ru.get(away, away),
+                "logo_url": f"{FLASHSCORE_LOGO_BASE}{match.away_logo}" if match.away_logo else ""
+            },
+            "venue": "",
+            "status": match.status,
+            "home_score": match.home_score,
+            "away_score": match.away_score,
+            "league": match.league
+        })
 
     return sorted(result, key=lambda g: g.get("date_iso", ""))
 
@@ -731,16 +704,13 @@ async def get_flashscore_schedule(league: str, days: int) -> list:
 
     target_name, team_names = league_config[league.upper()]
 
+    # All days at once; a failed day contributes no games instead of failing the schedule
+    async with pooled_client(timeout=30.0, follow_redirects=True) as client:
+        indexes = await _day_feeds.get_indexes(client, range(days), FLASHSCORE_SCHEDULE_CONCURRENCY)
+
     result = []
-    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-        for day_offset in range(days):
-            try:
-                url = f"{FLASHSCORE_BASE_URL}/f_4_{day_offset}_3_en_5"
-                response = await client.get(url, headers=FLASHSCORE_HEADERS)
-                matches = await parse_flashscore_data(response.text, target_name, team_names)
-                result.extend(matches)
-            except Exception as e:
-                print(f"Error fetching Flashscore day {day_offset}: {e}")
+    for index in indexes:
+        result.extend(format_flashscore_matches(league_matches(index, target_name), team_names))
 
     return result
 
@@ -767,13 +737,20 @@ class handler(BaseHTTPRequestHandler):
         days = int(params.get("days", ["7"])[0])
 
         try:
-            games = asyncio.run(get_schedule(league, days))
+            games = run(get_schedule(league, days))
             self.send_response(200)
             self.send_header("Content-type", "application/json")
             self.send_header("Access-Control-Allow-Origin", "*")
             self.send_header("Cache-Control", "s-maxage=300, stale-while-revalidate")
             self.end_headers()
             self.wfile.write(json.dumps({"games": games, "league": league}).encode())
+        except CircuitOpenError as e:
+            self.send_response(503)
+            self.send_header("Content-type", "application/json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Retry-After", "30")
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": str(e)}).encode())
         except Exception as e:
             self.send_response(500)
             self.send_header("Content-type", "application/json")
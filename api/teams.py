@@ -2,10 +2,11 @@
 from http.server import BaseHTTPRequestHandler
 import sys, os
 sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 import json
-import asyncio
 from urllib.parse import urlparse, parse_qs
-import httpx
+from http_client import pooled_client, run
+from app.services.team_aliases import TeamAliasIndex
 
 TEAM_NAMES_RU = {
     "ANA": "Анахайм Дакс", "ARI": "Аризона Койотс", "BOS": "Бостон Брюинз",
@@ -100,10 +101,11 @@ NL_TEAMS = {
     "EHC Biel-Bienne", "HC Davos", "HC Ambri-Piotta",
     "SCL Tigers", "HC Ajoie"
 }
+NL_TEAM_INDEX = TeamAliasIndex.from_names(NL_TEAMS)
 
 
 async def get_nhl_teams():
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with pooled_client(timeout=30.0) as client:
         response = await client.get("https://api-web.nhle.com/v1/standings/now")
         response.raise_for_status()
         standings = response.json()
@@ -121,7 +123,7 @@ async def get_nhl_teams():
 
 
 async def get_ahl_teams():
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with pooled_client(timeout=30.0) as client:
         url = "https://lscluster.hockeytech.com/feed/index.php?feed=modulekit&view=teamsbyseason&key=50c2cd9b5e18e390&fmt=json&client_code=ahl&lang=en&season_id=90"
         response = await client.get(url)
         response.raise_for_status()
@@ -140,7 +142,7 @@ async def get_ahl_teams():
 
 
 async def get_liiga_teams():
-    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+    async with pooled_client(timeout=30.0, follow_redirects=True) as client:
         response = await client.get("https://liiga.fi/api/v2/games?tournament=runkosarja&season=2026")
         response.raise_for_status()
         games = response.json()
@@ -162,7 +164,7 @@ async def get_liiga_teams():
 
 async def get_del_teams():
     """Get DEL teams from OpenLigaDB"""
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with pooled_client(timeout=30.0) as client:
         response = await client.get("https://api.openligadb.de/getavailableteams/del/2025")
         response.raise_for_status()
         teams_data = response.json()
@@ -185,7 +187,7 @@ async def get_austria_teams():
     season = "2025"
     league_id = "1"
 
-    async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
+    async with pooled_client(timeout=60.0, follow_redirects=True) as client:
         url = f"{base_url}/data/export/season/{season}/league/{league_id}/schedule_export.json"
         response = await client.get(url)
         response.raise_for_status()
@@ -210,15 +212,7 @@ async def get_austria_teams():
 
 def is_nl_team(team_name: str) -> bool:
     """Check if team is in Swiss National League"""
-    if not team_name:
-        return False
-    if team_name in NL_TEAMS:
-        return True
-    name_lower = team_name.lower()
-    for nl_team in NL_TEAMS:
-        if nl_team.lower() in name_lower or name_lower in nl_team.lower():
-            return True
-    return False
+    return bool(team_name) and team_name in NL_TEAM_INDEX
 
 
 async def get_swiss_teams():
@@ -226,7 +220,7 @@ async def get_swiss_teams():
     base_url = "https://data.sihf.ch/Statistic/api/cms"
     league_id = "1"
 
-    async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
+    async with pooled_client(timeout=60.0, follow_redirects=True) as client:
         # Get first page to collect teams
         url = f"{base_url}/cache600?alias=results&searchQuery={league_id}//&page=1"
         response = await client.get(url)
@@ -298,7 +292,7 @@ class handler(BaseHTTPRequestHandler):
         league = params.get("league", ["NHL"])[0].upper()
 
         try:
-            teams = asyncio.run(get_teams(league))
+            teams = run(get_teams(league))
             self.send_response(200)
             self.send_header("Content-type", "application/json")
             self.send_header("Access-Control-Allow-Origin", "*")
@@ -1,7 +1,11 @@
 """GET /api/teams/[team]/stats - Get team statistics"""
 from http.server import BaseHTTPRequestHandler
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'backend'))
 import json
 import asyncio
+import time
 import unicodedata
 from urllib.parse import urlparse, parse_qs
 import re
@@ -13,6 +17,10 @@ KYIV_TZ = timezone(timedelta(hours=2))  # Winter time, DST handled manually if n
 from typing import List, Dict, Tuple
 import math
 import httpx
+from http_client import pooled_client, run
+from app.services.flashscore_feed import DayFeedCache, league_matches
+from app.services.team_aliases import TeamAliasIndex
+from app.services.team_names_ru import AUSTRIA_TEAM_NAMES_RU, SWISS_TEAM_NAMES_RU
 
 
 def normalize_abbrev(text: str) -> str:
@@ -134,64 +142,6 @@ DENMARK_TEAM_NAMES_RU = {
     "Herlev": "Herlev",
 }
 
-# Austria ICE Hockey League Team Names
-AUSTRIA_TEAM_NAMES_RU = {
-    "Salzburg": "Ред Булл Зальцбург",
-    "Vienna Capitals": "Вена Кэпиталз",
-    "KAC": "КАЦ Клагенфурт",
-    "Villach": "ВСВ Филлах",
-    "Graz 99ers": "Грац 99ерс",
-    "Innsbruck": "ХК Инсбрук",
-    "Dornbirn": "Дорнбирн Бульдогс",
-    "Linz": "Блэк Уингс Линц",
-    "Fehervar AV19": "Фехервар АВ19",
-    "Val Pusteria": "Пустерталь Вёльфе",
-    "Znojmo": "Орли Знойимо",
-    "Bratislava Capitals": "Братислава Кэпиталз",
-    "Bolzano": "ХК Больцано",
-    "Asiago": "Азиаго Хоккей",
-    # ICE HL S3 API abbreviations
-    "RBS": "Ред Булл Зальцбург",
-    "VIC": "Вена Кэпиталз",
-    "KAC": "КАЦ Клагенфурт",
-    "VSV": "ВСВ Филлах",
-    "G99": "Грац 99ерс",
-    "HCI": "ХК Инсбрук",
-    "DEC": "Дорнбирн Бульдогс",
-    "BWL": "Блэк Уингс Линц",
-    "AVS": "Фехервар АВ19",
-    "PUS": "Пустерталь Вёльфе",
-    "ZNO": "Орли Знойимо",
-    "BRC": "Братислава Кэпиталз",
-    "HCB": "ХК Больцано",
-    "ASH": "Азиаго Хоккей",
-    "TWK": "ТВК Инсбрук",
-}
-
-# Swiss National League Team Names
-SWISS_TEAM_NAMES_RU = {
-    "ZSC": "Цюрих Лайонс",
-    "SCB": "СК Берн",
-    "EVZ": "ЭВ Цуг",
-    "HCL": "ХК Лугано",
-    "FRI": "Фрибур-Готтерон",
-    "LAU": "Лозанна",
-    "LHC": "Лозанна ХК",
-    "KLO": "ЭХК Клотен",
-    "SCRJ": "Раппершвиль-Йона Лейкерс",
-    "GEN": "Женева-Сервет",
-    "GSH": "Женева-Сервет",
-    "BIE": "ЭХК Биль",
-    "EHCB": "ЭХК Биль",
-    "DAV": "ХК Давос",
-    "HCD": "ХК Давос",
-    "AMB": "ХК Амбри-Пиотта",
-    "HCA": "ХК Амбри-Пиотта",
-    "SCL": "СЦЛ Тигерс",
-    "LAN": "СЦЛ Тигерс",
-    "AJO": "ХК Ажуа",
-}
-
 # Known Swiss National League teams (for filtering)
 NL_TEAMS = {
     "ZSC Lions", "SC Bern", "EV Zug", "HC Lugano",
@@ -200,11 +150,7 @@ NL_TEAMS = {
     "EHC Biel-Bienne", "HC Davos", "HC Ambri-Piotta",
     "SCL Tigers", "HC Ajoie"
 }
-
-# Flashscore API configuration
-FLASHSCORE_BASE_URL = "https://2.flashscore.ninja/2/x/feed"
-FLASHSCORE_HEADERS = {"x-fsign": "SW9D1eZo"}
-
+NL_TEAM_INDEX = TeamAliasIndex.from_names(NL_TEAMS)
 
 @dataclass
 class GameResult:
@@ -294,7 +240,7 @@ def get_full_team_stats(home_matches: List[GameResult], away_matches: List[GameR
 
 
 async def get_nhl_team_stats(team_abbrev: str, last_n: int = 0):
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with pooled_client(timeout=30.0) as client:
         response = await client.get(f"https://api-web.nhle.com/v1/club-schedule-season/{team_abbrev}/20252026")
         response.raise_for_status()
         schedule = response.json()
@@ -341,7 +287,7 @@ async def get_nhl_team_stats(team_abbrev: str, last_n: int = 0):
 async def get_ahl_team_stats(team_abbrev: str, last_n: int = 0):
     base_url = "https://lscluster.hockeytech.com/feed/index.php"
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with pooled_client(timeout=30.0) as client:
         # Get teams
         url = f"{base_url}?feed=modulekit&view=teamsbyseason&key=50c2cd9b5e18e390&fmt=json&client_code=ahl&lang=en&season_id=90"
         response = await client.get(url)
@@ -393,7 +339,7 @@ async def get_ahl_team_stats(team_abbrev: str, last_n: int = 0):
 
 
 async def get_liiga_team_stats(team_abbrev: str, last_n: int = 0):
-    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+    async with pooled_client(timeout=30.0, follow_redirects=True) as client:
         response = await client.get("https://liiga.fi/api/v2/games?tournament=runkosarja&season=2026")
         response.raise_for_status()
         games = response.json()
@@ -462,7 +408,7 @@ async def get_del_team_stats(team_abbrev: str, last_n: int = 0):
     if not team_id:
         return {}
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with pooled_client(timeout=30.0) as client:
         response = await client.get("https://api.openligadb.de/getmatchdata/del/2025")
         response.raise_for_status()
         all_games = response.json()
@@ -543,76 +489,28 @@ async def get_del_team_stats(team_abbrev: str, last_n: int = 0):
     return {"team": team_info, "stats": get_full_team_stats(home_matches, away_matches)}
 
 
-async def fetch_flashscore_day(client, day_offset: int, target_league: str) -> list:
-    """Fetch one day of Flashscore results using same parsing as parse_flashscore_data."""
-    try:
-        url = f"{FLASHSCORE_BASE_URL}/f_4_{day_offset}_3_en_5"
-        response = await client.get(url, headers=FLASHSCORE_HEADERS)
-        data = response.text
-
-        if not data or data.strip() in ('0', ''):
-            return []
-
-        items = data.split('¬')
-
-        # Group items into dicts like parse_flashscore_data does
-        data_list = [{}]
-        for item in items:
-            if '÷' not in item:
-                continue
-            parts = item.split('÷')
-            key = parts[0]
-            value = parts[-1] if len(parts) > 1 else ''
-
-            if '~' in key:
-                data_list.append({key: value})
-            else:
-                data_list[-1].update({key: value})
-
-        matches = []
-        league_name = ''
-
-        for game in data_list:
-            keys = list(game.keys())
-            if not keys:
-                continue
-
-            # Check for league header
-            if '~ZA' in keys[0]:
-                league_name = game.get('~ZA', '')
-
-            # Check for match entry
-            if 'AA' in keys[0]:
-                # Filter by target league
-                if target_league.lower() not in league_name.lower():
-                    continue
-
-                matches.append({
-                    'id': game.get('~AA', ''),
-                    'home': game.get('AE', ''),
-                    'away': game.get('AF', ''),
-                    'home_score': game.get('AG', ''),
-                    'away_score': game.get('AH', ''),
-                    'status': game.get('AB', ''),
-                    'timestamp': game.get('AD', '')
-                })
-
-        return matches
-    except Exception:
-        return []
+def get_feed_redis():
+    """Redis client for shared day feeds, or None when not configured"""
+    if not (os.environ.get('KV_REST_API_URL') or os.environ.get('UPSTASH_REDIS_REST_URL')):
+        return None
+    from auth_helpers import get_redis
+    return get_redis()
+
+
+# Flashscore day feeds by calendar date; finished days are never refetched
+_day_feeds = DayFeedCache(redis_factory=get_feed_redis)
+
+# League -> alias index of the Flashscore team names seen so far
+_flashscore_team_indexes: Dict[str, TeamAliasIndex] = {}
+
+# League -> (built_at, alias index of DB team ids); teams change rarely
+DB_TEAM_INDEX_TTL = 600
+_db_team_indexes: Dict[str, Tuple[float, TeamAliasIndex]] = {}
 
 
 def is_nl_team(team_name: str) -> bool:
     """Check if team is in Swiss National League"""
-    if not team_name:
-        return False
-    if team_name in NL_TEAMS:
-        return True
-    name_lower = team_name.lower()
-    for nl_team in NL_TEAMS:
-        if nl_team.lower() in name_lower or name_lower in nl_team.lower():
-            return True
-    return False
+    return bool(team_name) and team_name in NL_TEAM_INDEX
 
 
 async def get_flashscore_team_stats(team_name: str, league: str, last_n: int = 0):
@@ -629,19 +527,21 @@ async def get_flashscore_team_stats(team_name: str, league: str, last_n: int = 0
         return {}
 
     target_league, names_ru = league_config[league_upper]
-    team_name_lower = team_name.lower()
-
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # Fetch past 60 days of results in parallel batches
-        all_matches = []
-        batch_size = 10  # Fetch 10 days at a time to avoid overwhelming the API
-        for batch_start in range(-60, 1, batch_size):
-            batch_end = min(batch_start + batch_size, 1)
-            tasks = [fetch_flashscore_day(client, day_offset, target_league)
-                     for day_offset in range(batch_start, batch_end)]
-            results = await asyncio.gather(*tasks)
-            for matches in results:
-                all_matches.extend(matches)
+
+    async with pooled_client(timeout=30.0) as client:
+        # Past 60 days of results; only days not cached yet (normally today) hit the API
+        indexes = await _day_feeds.get_indexes(client, range(-60, 1))
+    all_matches = []
+    for index in indexes:
+        all_matches.extend(league_matches(index, target_league))
+
+    # Resolve the requested team (name or 3-letter abbrev) to its Flashscore name
+    team_index = _flashscore_team_indexes.setdefault(league_upper, TeamAliasIndex())
+    for name in {name for match in all_matches for name in (match.home, match.away)} - team_index.teams:
+        team_index.add(name, name, name[:3])
+    target_team = team_index.resolve(team_name)
+    if not target_team:
+        return {}
 
     # Find team and collect matches
     team_info = None
@@ -649,20 +549,20 @@ async def get_flashscore_team_stats(team_name: str, league: str, last_n: int = 0
     away_matches = []
 
     for match in all_matches:
-        home = match.get('home', '')
-        away = match.get('away', '')
-        home_score_str = match.get('home_score', '')
-        away_score_str = match.get('away_score', '')
-        timestamp = match.get('timestamp', '')
-        status = match.get('status', '')
+        home = match.home
+        away = match.away
+        home_score_str = match.home_score
+        away_score_str = match.away_score
+        timestamp = match.timestamp
+        status = match.status
 
         # Only finished matches (status 3 = finished)
         if status != '3':
             continue
 
         # Check if team is in this match
-        is_home = team_name_lower in home.lower() or home.lower() in team_name_lower
-        is_away = team_name_lower in away.lower() or away.lower() in team_name_lower
+        is_home = home == target_team
+        is_away = away == target_team
 
         if not is_home and not is_away:
             continue
@@ -688,7 +588,7 @@ async def get_flashscore_team_stats(team_name: str, league: str, last_n: int = 0
         if is_home:
             opp_name = away
             result = GameResult(
-                match.get('id', ''),
+                match.id,
                 game_date,
                 names_ru.get(opp_name, opp_name),
                 opp_name[:3].upper(),
@@ -701,7 +601,7 @@ async def get_flashscore_team_stats(team_name: str, league: str, last_n: int = 0
         else:
             opp_name = home
             result = GameResult(
-                match.get('id', ''),
+                match.id,
                 game_date,
                 names_ru.get(opp_name, opp_name),
                 opp_name[:3].upper(),
@@ -728,10 +628,10 @@ async def get_flashscore_team_stats(team_name: str, league: str, last_n: int = 0
 
 
 def get_db_team_stats(team_name: str, league: str, last_n: int = 0):
-    """Get team stats from database (synced from API-Sports).
+    """Get team stats from database.
 
-    Reads from pre-synced database for KHL, Czech Extraliga, Denmark Metal Ligaen.
-    Data is synced daily via cron job at 10:00 UTC.
+    Reads from pre-synced database for KHL, Czech Extraliga, Denmark Metal Ligaen
+    (API-Sports cron at 10:00 UTC) and Austria, Swiss (Flashscore cron at 10:30 UTC).
     """
     import sys
     import os
@@ -746,6 +646,8 @@ def get_db_team_stats(team_name: str, league: str, last_n: int = 0):
         "KHL": KHL_TEAM_NAMES_RU,
         "CZECH": CZECH_TEAM_NAMES_RU,
         "DENMARK": DENMARK_TEAM_NAMES_RU,
+        "AUSTRIA": AUSTRIA_TEAM_NAMES_RU,
+        "SWISS": SWISS_TEAM_NAMES_RU,
     }
 
     league_upper = league.upper()
@@ -756,20 +658,17 @@ def get_db_team_stats(team_name: str, league: str, last_n: int = 0):
 
     db = SessionLocal()
     try:
-        # Find team by name (case-insensitive partial match)
-        team_name_lower = team_name.lower()
-        teams = db.query(Team).filter(Team.league == league_upper).all()
-
-        team = None
-        for t in teams:
-            # Match by name, abbrev, or name_ru
-            if (team_name_lower in (t.name or "").lower() or
-                (t.name or "").lower() in team_name_lower or
-                team_name_lower == (t.abbrev or "").lower() or
-                team_name_lower in (t.name_ru or "").lower()):
-                team = t
-                break
-
+        # Find team by name, abbrev or name_ru via the league's alias index
+        cached = _db_team_indexes.get(league_upper)
+        if cached is None or time.time() - cached[0] > DB_TEAM_INDEX_TTL:
+            team_index = TeamAliasIndex()
+            for t in db.query(Team.id, Team.name, Team.abbrev, Team.name_ru).filter(Team.league == league_upper):
+                team_index.add(str(t.id), *(alias for alias in (t.name, t.abbrev, t.name_ru) if alias))
+            cached = (time.time(), team_index)
+            _db_team_indexes[league_upper] = cached
+
+        team_id = cached[1].resolve(team_name)
+        team = db.query(Team).get(int(team_id)) if team_id else None
         if not team:
             return {}
 
@@ -850,7 +749,9 @@ async def get_team_stats(league: str, team_abbrev: str, last_n: int = 0):
     elif league == "DEL":
         return await get_del_team_stats(team_abbrev, last_n)
     elif league.upper() in ("AUSTRIA", "SWISS"):
-        return await get_flashscore_team_stats(team_abbrev, league.upper(), last_n)
+        # Synced games cover the whole season; the live 60-day feed scan is the fallback
+        return get_db_team_stats(team_abbrev, league, last_n) or \
+            await get_flashscore_team_stats(team_abbrev, league.upper(), last_n)
     elif league.upper() in ("KHL", "CZECH", "DENMARK"):
         return get_db_team_stats(team_abbrev, league, last_n)
     return {}
@@ -880,7 +781,7 @@ class handler(BaseHTTPRequestHandler):
             team_abbrev = team_abbrev.upper()
 
         try:
-            stats = asyncio.run(get_team_stats(league, team_abbrev, last_n))
+            stats = run(get_team_stats(league, team_abbrev, last_n))
             if not stats:
                 self.send_response(404)
                 self.send_header("Content-type", "application/json")
@@ -1,11 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
+from datetime import datetime, timedelta
 
-from ..models.database import get_db, Team
+from ..models.database import get_db, Team, SyncRun
 from ..services.cache_service import cache
 from ..services.sync_service import sync_service
-from ..services.flashscore_service import get_matches_list, get_team_lineup, get_match_lineups
+from ..services.sync_telemetry import serialize_run, summarize_runs
+from ..services.api_sports_service import ApiSportsService
+from ..services.resilience import breaker_status
+from ..services.flashscore_service import get_matches_list
+from ..services import player_store
 
 router = APIRouter()
 
@@ -132,7 +137,7 @@ async def sync_all():
 async def get_status(
     league: str = Query("NHL", description="League: NHL or AHL")
 ):
-    """Get system status and cache info"""
+    """Get system status, cache info and per-league readiness"""
     league_upper = league.upper()
 
     last_sync = cache.get_last_sync(league_upper)
@@ -142,12 +147,54 @@ async def get_status(
     teams = cache.get_teams(league_upper)
     teams_count = len(teams) if teams else 0
 
+    leagues_status = sync_service.get_leagues_status()
+
     return {
         "status": "ok",
         "league": league_upper,
+        "ready": cache.is_ready(league_upper),
         "teams_count": teams_count,
         "last_update": last_sync.isoformat() if last_sync else None,
-        "cache_loaded": is_loaded
+        "cache_loaded": is_loaded,
+        "leagues": leagues_status,
+        "all_ready": all(s["state"] == "ready" for s in leagues_status.values()),
+        "api_sports_quota": ApiSportsService.limiter.get_status(),
+        "upstream_circuits": breaker_status()
+    }
+
+
+@router.get("/scheduler/jobs")
+async def get_scheduler_jobs():
+    """Get scheduled sync jobs"""
+    return {"jobs": sync_service.get_scheduled_jobs()}
+
+
+@router.get("/sync/runs")
+async def get_sync_runs(
+    league: Optional[str] = Query(None, description="Filter by league"),
+    limit: int = Query(20, ge=1, le=200, description="Number of most recent runs"),
+    db: Session = Depends(get_db)
+):
+    """Get recent sync runs with per-stage timings and counters"""
+    query = db.query(SyncRun)
+    if league:
+        query = query.filter(SyncRun.league == league.upper())
+    runs = query.order_by(SyncRun.started_at.desc()).limit(limit).all()
+    return {"runs": [serialize_run(run) for run in runs]}
+
+
+@router.get("/sync/runs/summary")
+async def get_sync_runs_summary(
+    days: int = Query(7, ge=1, le=90, description="Look-back window in days"),
+    db: Session = Depends(get_db)
+):
+    """Get time spent per league and stage, slowest first"""
+    since = datetime.utcnow() - timedelta(days=days)
+    runs = db.query(SyncRun).filter(SyncRun.started_at >= since).all()
+    return {
+        "days": days,
+        "runs": len(runs),
+        "stages": summarize_runs(runs)
     }
 
 
@@ -240,11 +287,12 @@ async def get_lineups_matches(
 
 @router.get("/lineups/team")
 async def get_lineup_for_team(
-    url: str = Query(..., description="Flashscore team page URL")
+    url: str = Query(..., description="Flashscore team page URL"),
+    db: Session = Depends(get_db)
 ):
-    """Get team lineup with categorized players"""
+    """Get team lineup with categorized players (stored players unless the team has played since)"""
     try:
-        lineup = await get_team_lineup(url)
+        lineup = await player_store.get_team_lineup(db, url)
         return {
             "success": True,
             **lineup
@@ -255,11 +303,12 @@ async def get_lineup_for_team(
 
 @router.get("/lineups/match")
 async def get_lineup_for_match(
-    url: str = Query(..., description="Flashscore match page URL")
+    url: str = Query(..., description="Flashscore match page URL"),
+    db: Session = Depends(get_db)
 ):
     """Get lineups for both teams in a match"""
     try:
-        lineups = await get_match_lineups(url)
+        lineups = await player_store.get_match_lineups(db, url)
         return {
             "success": True,
             "home": lineups.get('home'),
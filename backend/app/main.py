@@ -1,11 +1,12 @@
-import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from .models.database import init_db
 from .api.routes import router
-from .services.sync_service import sync_service
+from .services.sync_service import sync_service, LeagueWarmingError
+from .services import cpu_pool
 
 
 @asynccontextmanager
@@ -15,14 +16,12 @@ async def lifespan(app: FastAPI):
     print("Starting up...")
     init_db()
 
-    # Load data for all leagues on startup
-    print("Loading initial data...")
-    try:
-        await sync_service.sync_all(force=False)
-    except Exception as e:
-        print(f"Error during initial sync: {e}")
+    # Load data for all leagues in the background, start serving right away.
+    # Each league becomes available as soon as its own sync completes.
+    print("Loading initial data in background...")
+    sync_service.start_initial_sync()
 
-    # Start scheduler for automatic updates at 12:00
+    # Start scheduler: per-league cron syncs and post-game result refreshes
     sync_service.start_scheduler()
 
     yield
@@ -30,6 +29,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     print("Shutting down...")
     await sync_service.close()
+    cpu_pool.shutdown()
 
 
 app = FastAPI(
@@ -52,6 +52,21 @@ app.add_middleware(
 app.include_router(router, prefix="/api")
 
 
+@app.exception_handler(LeagueWarmingError)
+async def league_warming_handler(request: Request, exc: LeagueWarmingError):
+    """Fast explicit response for leagues whose first sync hasn't finished"""
+    return JSONResponse(
+        status_code=503,
+        content={
+            "status": "warming",
+            "league": exc.league,
+            "detail": str(exc),
+            "league_status": sync_service.get_leagues_status().get(exc.league)
+        },
+        headers={"Retry-After": "15"}
+    )
+
+
 @app.get("/")
 async def root():
     return {
@@ -60,7 +75,7 @@ async def root():
         "version": "2.0.0",
         "features": [
             "In-memory caching",
-            "Automatic sync at 12:00 daily",
+            "Per-league scheduled sync with post-game refresh",
             "NHL and AHL support"
         ]
     }
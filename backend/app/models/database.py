@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, ForeignKey, Float, Text
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, ForeignKey, Float, Text, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
@@ -73,6 +73,29 @@ class DataUpdate(Base):
     update_type = Column(String(50))
 
 
+class SyncRun(Base):
+    __tablename__ = "sync_runs"
+
+    id = Column(Integer, primary_key=True)
+    league = Column(String(10), index=True)
+    trigger = Column(String(20))  # startup, scheduled, results, manual
+    started_at = Column(DateTime, default=datetime.utcnow, index=True)
+    duration_ms = Column(Integer)
+    status = Column(String(10))  # ok, error
+
+    # Totals across stages
+    requests = Column(Integer, default=0)
+    bytes_downloaded = Column(Integer, default=0)
+    rows_inserted = Column(Integer, default=0)
+    rows_updated = Column(Integer, default=0)
+    rows_unchanged = Column(Integer, default=0)
+    error_count = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+
+    # JSON list of per-stage records (teams, games, schedule, stats)
+    stages = Column(Text)
+
+
 class ValueBetPrediction(Base):
     __tablename__ = "value_bet_predictions"
 
@@ -108,6 +131,46 @@ class ValueBetPrediction(Base):
     checked_at = Column(DateTime, nullable=True)
 
 
+class Player(Base):
+    __tablename__ = "players"
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String(300), unique=True, index=True)  # Flashscore player page
+    name = Column(String(100))
+    team_name = Column(String(100))  # Flashscore team name
+    team_url = Column(String(300), nullable=True, index=True)  # Team page listing the player; NULL once off the roster
+    status = Column(String(50), default="")  # Last match: заявлен, injury, ...
+    scraped_at = Column(DateTime, index=True)
+
+    season_stats = relationship("PlayerSeasonStats", back_populates="player")
+
+    __table_args__ = (
+        {"sqlite_autoincrement": True},
+    )
+
+
+class PlayerSeasonStats(Base):
+    __tablename__ = "player_season_stats"
+
+    id = Column(Integer, primary_key=True)
+    player_id = Column(Integer, ForeignKey("players.id"), index=True)
+    team_name = Column(String(100))
+    season = Column(String(10))  # "2024/2025", as on Flashscore
+    matches = Column(Integer, default=0)
+    goals = Column(Integer, default=0)
+    assists = Column(Integer, default=0)
+    points = Column(Integer, default=0)
+    efficiency = Column(Float, default=0.0)  # Points per game
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    player = relationship("Player", back_populates="season_stats")
+
+    __table_args__ = (
+        UniqueConstraint("player_id", "team_name", "season"),
+        {"sqlite_autoincrement": True},
+    )
+
+
 def init_db():
     Base.metadata.create_all(bind=engine)
 
@@ -3,6 +3,9 @@ from datetime import datetime, timedelta
 from typing import Optional, List
 import asyncio
 
+from .http_cache import caching_transport
+from .sync_telemetry import HTTPX_EVENT_HOOKS
+
 
 class AHLApiService:
     """AHL API Service using HockeyTech API"""
@@ -13,7 +16,12 @@ class AHLApiService:
     CURRENT_SEASON_ID = "90"  # 2025-26 Regular Season
 
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            follow_redirects=True,
+            transport=caching_transport(),
+            event_hooks=HTTPX_EVENT_HOOKS
+        )
 
     async def close(self):
         await self.client.aclose()
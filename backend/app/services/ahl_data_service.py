@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 from ..models.database import Team, Game, DataUpdate
 from .ahl_api import AHLApiService, AHL_TEAM_NAMES_RU
 from .stats_calculator import StatsCalculator, GameResult
+from .sync_pipeline import GameSyncPipeline, GameRow
+from . import sync_telemetry
 
 
 def get_last_ahl_update(db: Session) -> Optional[datetime]:
@@ -64,81 +66,50 @@ class AHLDataService:
 
         return teams
 
-    async def sync_team_games(self, db: Session, team_id: str) -> int:
-        """Sync all games for a specific AHL team"""
-        games_data = await self.api.get_team_game_log(team_id)
-        synced_count = 0
-
-        for game_data in games_data:
-            game_id = f"ahl_{game_data.get('game_id')}"
-            existing = db.query(Game).filter(Game.game_id == game_id).first()
-
-            home_team_api_id = game_data.get("home_team")
-            away_team_api_id = game_data.get("visiting_team")
-
-            home_team = db.query(Team).filter(
-                Team.league == self.LEAGUE,
-                Team.team_id == home_team_api_id
-            ).first()
-            away_team = db.query(Team).filter(
-                Team.league == self.LEAGUE,
-                Team.team_id == away_team_api_id
-            ).first()
-
-            if not home_team or not away_team:
-                continue
-
-            # Parse date
-            game_date_str = game_data.get("date_played")
+    async def _iter_game_pages(self, teams: List[Team]):
+        """Yield each team's game log, skipping teams that fail to load"""
+        for team in teams:
             try:
-                game_date = datetime.strptime(game_date_str, "%Y-%m-%d")
-            except:
-                continue
-
-            home_score = int(game_data.get("home_goal_count", 0) or 0)
-            away_score = int(game_data.get("visiting_goal_count", 0) or 0)
-            is_finished = game_data.get("game_status") == "Final" or game_data.get("final") == "1"
-
-            if existing:
-                existing.home_score = home_score
-                existing.away_score = away_score
-                existing.is_finished = is_finished
-            else:
-                game = Game(
-                    league=self.LEAGUE,
-                    game_id=game_id,
-                    date=game_date,
-                    home_team_id=home_team.id,
-                    away_team_id=away_team.id,
-                    home_score=home_score,
-                    away_score=away_score,
-                    is_finished=is_finished,
-                    season="20252026"
-                )
-                db.add(game)
-                synced_count += 1
-
-        db.commit()
-        return synced_count
+                yield await self.api.get_team_game_log(team.team_id)
+            except Exception as e:
+                print(f"Error syncing AHL team {team.abbrev}: {e}")
+                sync_telemetry.record_error(f"{team.abbrev}: {e}")
+
+    def _normalize_game(self, game_data: dict) -> Optional[GameRow]:
+        """Convert AHL schedule entry to a GameRow"""
+        try:
+            game_date = datetime.strptime(game_data.get("date_played"), "%Y-%m-%d")
+        except (TypeError, ValueError):
+            return None
+
+        return GameRow(
+            game_id=f"ahl_{game_data.get('game_id')}",
+            date=game_date,
+            home_team_key=game_data.get("home_team"),
+            away_team_key=game_data.get("visiting_team"),
+            home_score=int(game_data.get("home_goal_count", 0) or 0),
+            away_score=int(game_data.get("visiting_goal_count", 0) or 0),
+            is_finished=game_data.get("game_status") == "Final" or game_data.get("final") == "1",
+            season="20252026"
+        )
 
     async def sync_all_games(self, db: Session) -> int:
         """Sync games for all AHL teams"""
         teams = db.query(Team).filter(Team.league == self.LEAGUE).all()
-        total_synced = 0
 
-        for team in teams:
-            try:
-                synced = await self.sync_team_games(db, team.team_id)
-                total_synced += synced
-            except Exception as e:
-                print(f"Error syncing AHL team {team.abbrev}: {e}")
+        pipeline = GameSyncPipeline(
+            league=self.LEAGUE,
+            pages=self._iter_game_pages(teams),
+            normalize=self._normalize_game
+        )
+        stats = await pipeline.run(db)
 
         # Log update
         update = DataUpdate(update_type="ahl_games_sync")
         db.add(update)
         db.commit()
 
-        return total_synced
+        return stats.inserted
 
     def get_team_matches(
         self,
@@ -9,7 +9,10 @@ from sqlalchemy.orm import Session
 
 from ..models.database import Team, Game, DataUpdate
 from .api_sports_service import KHLApiService, CzechApiService, DenmarkApiService
+from .rate_limiter import PRIORITY_DEFAULT, PRIORITY_SCHEDULE
 from .stats_calculator import StatsCalculator, GameResult
+from .sync_pipeline import GameSyncPipeline, GameRow
+from . import sync_telemetry
 
 
 # Russian names for KHL teams
@@ -139,80 +142,55 @@ class ApiSportsDataService:
 
         return teams
 
+    def _normalize_game(self, game_data: dict) -> Optional[GameRow]:
+        """Convert API-Sports game to a GameRow"""
+        try:
+            game_date = datetime.fromisoformat(game_data.get("date", "").replace("Z", "+00:00"))
+        except (AttributeError, ValueError):
+            return None
+
+        scores = game_data.get("scores", {})
+        status = game_data.get("status", {}).get("short", "")
+        season_year = game_data.get("league", {}).get("season", 2024)
+
+        return GameRow(
+            game_id=f"{self.LEAGUE.lower()}_{game_data['id']}",
+            date=game_date,
+            home_team_key=str(game_data.get("teams", {}).get("home", {}).get("id")),
+            away_team_key=str(game_data.get("teams", {}).get("away", {}).get("id")),
+            home_score=scores.get("home"),
+            away_score=scores.get("away"),
+            is_finished=status == "FT",
+            season=f"{season_year}{season_year + 1}"
+        )
+
+    async def _iter_game_pages(self):
+        """Yield the whole season as a single payload.
+
+        This is the league's only games source, so it runs at default priority
+        rather than in the backfill lane the daily reserve shuts off.
+        """
+        try:
+            yield await self.api.get_all_games(priority=PRIORITY_DEFAULT)
+        except Exception as e:
+            print(f"Error fetching {self.LEAGUE} games: {e}")
+            sync_telemetry.record_error(str(e))
+
     async def sync_all_games(self, db: Session) -> int:
         """Sync all games for the league - ONE request for all games"""
-        games_data = await self.api.get_all_games()
-        synced_count = 0
-
-        for game_data in games_data:
-            game_api_id = str(game_data["id"])
-            game_id = f"{self.LEAGUE.lower()}_{game_api_id}"
-
-            existing = db.query(Game).filter(Game.game_id == game_id).first()
-
-            # Get team IDs from API response
-            home_team_api_id = str(game_data.get("teams", {}).get("home", {}).get("id"))
-            away_team_api_id = str(game_data.get("teams", {}).get("away", {}).get("id"))
-
-            home_team = db.query(Team).filter(
-                Team.league == self.LEAGUE,
-                Team.team_id == home_team_api_id
-            ).first()
-            away_team = db.query(Team).filter(
-                Team.league == self.LEAGUE,
-                Team.team_id == away_team_api_id
-            ).first()
-
-            if not home_team or not away_team:
-                continue
-
-            # Parse date
-            game_date_str = game_data.get("date", "")
-            try:
-                game_date = datetime.fromisoformat(game_date_str.replace("Z", "+00:00"))
-            except:
-                continue
-
-            # Get scores
-            scores = game_data.get("scores", {})
-            home_score = scores.get("home")
-            away_score = scores.get("away")
-
-            # Check if finished
-            status = game_data.get("status", {}).get("short", "")
-            is_finished = status == "FT"
-
-            # Get season
-            season_year = game_data.get("league", {}).get("season", 2024)
-            season = f"{season_year}{season_year + 1}"
-
-            if existing:
-                existing.home_score = home_score
-                existing.away_score = away_score
-                existing.is_finished = is_finished
-            else:
-                game = Game(
-                    league=self.LEAGUE,
-                    game_id=game_id,
-                    date=game_date,
-                    home_team_id=home_team.id,
-                    away_team_id=away_team.id,
-                    home_score=home_score,
-                    away_score=away_score,
-                    is_finished=is_finished,
-                    season=season
-                )
-                db.add(game)
-                synced_count += 1
-
-        db.commit()
+        pipeline = GameSyncPipeline(
+            league=self.LEAGUE,
+            pages=self._iter_game_pages(),
+            normalize=self._normalize_game
+        )
+        stats = await pipeline.run(db)
 
         # Log update
         update = DataUpdate(update_type=f"{self.LEAGUE.lower()}_games_sync")
         db.add(update)
         db.commit()
 
-        return synced_count
+        return stats.inserted
 
     def get_team_matches(
         self,
@@ -305,8 +283,8 @@ class ApiSportsDataService:
 
     async def get_upcoming_games(self, db: Session, days: int = 7) -> List[dict]:
         """Get upcoming games for the next N days"""
-        # Get all games and filter upcoming ones
-        all_games = await self.api.get_all_games()
+        # Get all games and filter upcoming ones (reuses the payload fetched by the games sync)
+        all_games = await self.api.get_all_games(priority=PRIORITY_SCHEDULE)
         now = datetime.now()
         end_date = now + timedelta(days=days)
 
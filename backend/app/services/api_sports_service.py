@@ -4,11 +4,35 @@ https://api-sports.io/documentation/hockey/v1
 """
 
 import httpx
-import asyncio
-from datetime import datetime
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 import os
 
+from .http_replay import upstream_transport
+from .json_stream import StreamCollector, project
+from .sync_telemetry import HTTPX_EVENT_HOOKS
+from .rate_limiter import (
+    AdaptiveRateLimiter, PRIORITY_BACKFILL, PRIORITY_DEFAULT, PRIORITY_SCHEDULE, header_values
+)
+
+
+# Fields of a game that the data service reads
+GAME_FIELDS = {
+    "id": None,
+    "date": None,
+    "status": {"short": None, "long": None},
+    "league": {"id": None, "season": None},
+    "teams": None,
+    "scores": None,
+}
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
 
 class ApiSportsService:
     """Base service for API-Sports Hockey API"""
@@ -26,40 +50,74 @@ class ApiSportsService:
     # Current season (starts in September, so 2024 = 2024-2025 season)
     CURRENT_SEASON = 2024
 
+    # One API key = one quota, so the limiter is shared by all league services
+    limiter = AdaptiveRateLimiter(
+        "api-sports",
+        per_window=int(os.getenv("API_SPORTS_PER_MINUTE", "10")),
+        window_seconds=60.0,
+        daily_limit=int(os.getenv("API_SPORTS_DAILY_LIMIT", "100")),
+        daily_reserve=int(os.getenv("API_SPORTS_DAILY_RESERVE", "10"))
+    )
+    MAX_RATE_LIMIT_RETRIES = 3
+
+    # Season game lists are reused for this long (sync and schedule need the same payload)
+    GAMES_CACHE_TTL = 300
+
     def __init__(self):
         self.client = httpx.AsyncClient(
             timeout=30.0,
-            headers={"x-apisports-key": self.API_KEY}
+            headers={"x-apisports-key": self.API_KEY},
+            transport=upstream_transport(),
+            event_hooks=HTTPX_EVENT_HOOKS
         )
+        self._games_cache: Dict[Tuple[int, int], Tuple[float, List[dict]]] = {}
 
     async def close(self):
         await self.client.aclose()
 
-    async def _request(self, endpoint: str, params: dict = None) -> dict:
-        """Make API request with rate limiting (10 req/min for free tier)"""
+    async def _request(
+        self,
+        endpoint: str,
+        params: dict = None,
+        priority: int = PRIORITY_DEFAULT,
+        fields: Optional[dict] = None
+    ) -> dict:
+        """Make API request through the shared quota-aware rate limiter.
+
+        The body is decoded incrementally into {"errors": ..., "response": [...]};
+        `fields` projects each response item down to what callers need.
+        """
         url = f"{self.BASE_URL}/{endpoint}"
-        response = await self.client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-
-        if data.get("errors") and len(data["errors"]) > 0:
-            # Check for rate limit error
-            if "rateLimit" in str(data["errors"]):
-                print("Rate limit hit, waiting 60 seconds...")
-                await asyncio.sleep(60)
-                # Retry once
-                response = await self.client.get(url, params=params)
+
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            await self.limiter.acquire(priority)
+            items = []
+            collector = StreamCollector().keep("errors").on_item(
+                "response.item", lambda item: items.append(project(item, fields))
+            )
+            async with self.client.stream("GET", url, params=params) as response:
+                self.limiter.update_from_headers(**header_values(response.headers))
+
+                if response.status_code == 429:
+                    print(f"API-Sports rate limit hit (HTTP 429), backing off (attempt {attempt + 1})")
+                    self.limiter.on_rate_limited(_retry_after(response))
+                    continue
+
                 response.raise_for_status()
-                data = response.json()
-                if data.get("errors") and len(data["errors"]) > 0:
-                    raise Exception(f"API-Sports error: {data['errors']}")
-            else:
-                raise Exception(f"API-Sports error: {data['errors']}")
+                await collector.feed_response(response)
+            data = {"errors": collector.values["errors"], "response": items}
+
+            errors = data.get("errors")
+            if errors and "rateLimit" in str(errors):
+                print(f"API-Sports rate limit hit, backing off (attempt {attempt + 1})")
+                self.limiter.on_rate_limited()
+                continue
+            if errors:
+                raise Exception(f"API-Sports error: {errors}")
 
-        # Small delay between requests to avoid rate limit (free tier: 10 req/min)
-        await asyncio.sleep(7)  # 60/10 = 6 sec minimum, use 7 for safety
+            return data
 
-        return data
+        raise Exception(f"API-Sports rate limit: gave up after {self.MAX_RATE_LIMIT_RETRIES} retries")
 
     async def get_leagues(self) -> List[dict]:
         """Get all available leagues"""
@@ -72,20 +130,26 @@ class ApiSportsService:
         data = await self._request("teams", {"league": league_id, "season": season})
         return data.get("response", [])
 
-    async def get_games(self, league_id: int, season: int = None) -> List[dict]:
+    async def get_games(self, league_id: int, season: int = None, priority: int = PRIORITY_DEFAULT) -> List[dict]:
         """Get all games for a league in a season"""
         season = season or self.CURRENT_SEASON
-        data = await self._request("games", {"league": league_id, "season": season})
-        return data.get("response", [])
+        cached = self._games_cache.get((league_id, season))
+        if cached and time.monotonic() - cached[0] < self.GAMES_CACHE_TTL:
+            return cached[1]
+
+        data = await self._request("games", {"league": league_id, "season": season}, priority, GAME_FIELDS)
+        games = data.get("response", [])
+        self._games_cache[(league_id, season)] = (time.monotonic(), games)
+        return games
 
     async def get_games_by_date(self, date: str) -> List[dict]:
         """Get games for a specific date (YYYY-MM-DD)"""
-        data = await self._request("games", {"date": date})
+        data = await self._request("games", {"date": date}, PRIORITY_SCHEDULE)
         return data.get("response", [])
 
     async def get_game(self, game_id: int) -> Optional[dict]:
         """Get single game by ID"""
-        data = await self._request("games", {"id": game_id})
+        data = await self._request("games", {"id": game_id}, PRIORITY_SCHEDULE)
         games = data.get("response", [])
         return games[0] if games else None
 
@@ -106,13 +170,13 @@ class KHLApiService(ApiSportsService):
             and "All Star" not in t.get("name", "")
         ]
 
-    async def get_all_games(self, season: int = None) -> List[dict]:
+    async def get_all_games(self, season: int = None, priority: int = PRIORITY_DEFAULT) -> List[dict]:
         """Get all KHL games for the season"""
-        return await self.get_games(self.LEAGUE_ID, season)
+        return await self.get_games(self.LEAGUE_ID, season, priority)
 
     async def get_finished_games(self, season: int = None) -> List[dict]:
         """Get only finished games"""
-        games = await self.get_all_games(season)
+        games = await self.get_all_games(season, PRIORITY_BACKFILL)
         return [g for g in games if g.get("status", {}).get("short") == "FT"]
 
 
@@ -126,13 +190,13 @@ class CzechApiService(ApiSportsService):
         teams = await self.get_teams(self.LEAGUE_ID)
         return [t for t in teams if t.get("national") is False]
 
-    async def get_all_games(self, season: int = None) -> List[dict]:
+    async def get_all_games(self, season: int = None, priority: int = PRIORITY_DEFAULT) -> List[dict]:
         """Get all Czech Extraliga games for the season"""
-        return await self.get_games(self.LEAGUE_ID, season)
+        return await self.get_games(self.LEAGUE_ID, season, priority)
 
     async def get_finished_games(self, season: int = None) -> List[dict]:
         """Get only finished games"""
-        games = await self.get_all_games(season)
+        games = await self.get_all_games(season, PRIORITY_BACKFILL)
         return [g for g in games if g.get("status", {}).get("short") == "FT"]
 
 
@@ -146,11 +210,11 @@ class DenmarkApiService(ApiSportsService):
         teams = await self.get_teams(self.LEAGUE_ID)
         return [t for t in teams if t.get("national") is False]
 
-    async def get_all_games(self, season: int = None) -> List[dict]:
+    async def get_all_games(self, season: int = None, priority: int = PRIORITY_DEFAULT) -> List[dict]:
         """Get all Denmark Metal Ligaen games for the season"""
-        return await self.get_games(self.LEAGUE_ID, season)
+        return await self.get_games(self.LEAGUE_ID, season, priority)
 
     async def get_finished_games(self, season: int = None) -> List[dict]:
         """Get only finished games"""
-        games = await self.get_all_games(season)
+        games = await self.get_all_games(season, PRIORITY_BACKFILL)
         return [g for g in games if g.get("status", {}).get("short") == "FT"]
@@ -6,6 +6,9 @@ import httpx
 from datetime import datetime, timedelta
 from typing import Optional, List
 
+from .http_cache import caching_transport
+from .sync_telemetry import HTTPX_EVENT_HOOKS
+
 
 class AustriaApiService:
     """Austrian ICE Hockey League API Service using S3 bucket"""
@@ -15,7 +18,12 @@ class AustriaApiService:
     LEAGUE_ID = "1"  # ICE HL main league
 
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=60.0, follow_redirects=True)
+        self.client = httpx.AsyncClient(
+            timeout=60.0,
+            follow_redirects=True,
+            transport=caching_transport(),
+            event_hooks=HTTPX_EVENT_HOOKS
+        )
         self._teams_cache = None
         self._matches_cache = None
 
@@ -8,6 +8,8 @@ from sqlalchemy.orm import Session
 from ..models.database import Team, Game, DataUpdate
 from .austria_api import AustriaApiService, AUSTRIA_TEAM_NAMES_RU
 from .stats_calculator import StatsCalculator, GameResult
+from .sync_pipeline import GameSyncPipeline, GameRow
+from . import sync_telemetry
 
 
 class AustriaDataService:
@@ -59,85 +61,59 @@ class AustriaDataService:
 
         return teams
 
-    async def sync_team_games(self, db: Session, team_id: str) -> int:
-        """Sync all games for a specific ICE HL team"""
-        games_data = await self.api.get_team_game_log(team_id)
-        synced_count = 0
-
-        for game_data in games_data:
-            game_id = f"austria_{game_data.get('id')}"
-            existing = db.query(Game).filter(Game.game_id == game_id).first()
-
-            home_team_api_id = str(game_data.get("home", {}).get("id", ""))
-            away_team_api_id = str(game_data.get("guest", {}).get("id", ""))
-
-            home_team = db.query(Team).filter(
-                Team.league == self.LEAGUE,
-                Team.team_id == home_team_api_id
-            ).first()
-            away_team = db.query(Team).filter(
-                Team.league == self.LEAGUE,
-                Team.team_id == away_team_api_id
-            ).first()
-
-            if not home_team or not away_team:
-                continue
-
-            # Parse date
-            game_date_str = game_data.get("start_date", "")
-            try:
-                # Format: "2025-09-12 19:15:00"
-                game_date = datetime.strptime(game_date_str.split()[0], "%Y-%m-%d")
-            except (ValueError, IndexError):
-                continue
-
-            # Get scores from results
-            results = game_data.get("results", {})
-            score = results.get("score", {}).get("final", {})
-            home_score = score.get("score_home", 0) or 0
-            away_score = score.get("score_guest", 0) or 0
-            is_finished = game_data.get("status") == "AFTER_MATCH"
-
-            if existing:
-                existing.home_score = home_score
-                existing.away_score = away_score
-                existing.is_finished = is_finished
-            else:
-                game = Game(
-                    league=self.LEAGUE,
-                    game_id=game_id,
-                    date=game_date,
-                    home_team_id=home_team.id,
-                    away_team_id=away_team.id,
-                    home_score=home_score,
-                    away_score=away_score,
-                    is_finished=is_finished,
-                    season="20252026"
-                )
-                db.add(game)
-                synced_count += 1
-
-        db.commit()
-        return synced_count
+    async def _iter_game_pages(self):
+        """Yield the season's matches in one payload (instead of once per team)"""
+        try:
+            yield await self.api.get_all_matches()
+        except Exception as e:
+            print(f"Error fetching Austria matches: {e}")
+            sync_telemetry.record_error(str(e))
+
+    @staticmethod
+    def _parse_game_page(matches: List[dict]):
+        """Keep only finished matches"""
+        return (m for m in matches if m.get("status") == "AFTER_MATCH")
+
+    def _normalize_game(self, game_data: dict) -> Optional[GameRow]:
+        """Convert ICE HL match to a GameRow"""
+        game_date_str = game_data.get("start_date", "")
+        try:
+            # Format: "2025-09-12 19:15:00"
+            game_date = datetime.strptime(game_date_str.split()[0], "%Y-%m-%d")
+        except (ValueError, IndexError):
+            return None
+
+        # Get scores from results
+        results = game_data.get("results", {})
+        score = results.get("score", {}).get("final", {})
+
+        return GameRow(
+            game_id=f"austria_{game_data.get('id')}",
+            date=game_date,
+            home_team_key=str(game_data.get("home", {}).get("id", "")),
+            away_team_key=str(game_data.get("guest", {}).get("id", "")),
+            home_score=score.get("score_home", 0) or 0,
+            away_score=score.get("score_guest", 0) or 0,
+            is_finished=game_data.get("status") == "AFTER_MATCH",
+            season="20252026"
+        )
 
     async def sync_all_games(self, db: Session) -> int:
         """Sync games for all ICE HL teams"""
-        teams = db.query(Team).filter(Team.league == self.LEAGUE).all()
-        total_synced = 0
-
-        for team in teams:
-            try:
-                synced = await self.sync_team_games(db, team.team_id)
-                total_synced += synced
-            except Exception as e:
-                print(f"Error syncing Austria team {team.abbrev}: {e}")
+        pipeline = GameSyncPipeline(
+            league=self.LEAGUE,
+            pages=self._iter_game_pages(),
+            parse_page=self._parse_game_page,
+            normalize=self._normalize_game
+        )
+        stats = await pipeline.run(db)
 
         # Log update
         update = DataUpdate(update_type="austria_games_sync")
         db.add(update)
         db.commit()
 
-        return total_synced
+        return stats.inserted
 
     def get_team_matches(
         self,
@@ -36,6 +36,8 @@ class CacheService:
         self._schedules: Dict[str, CacheEntry] = {}  # league -> schedule
         self._team_stats: Dict[str, Dict[str, CacheEntry]] = {}  # league -> {abbrev -> stats}
         self._last_sync: Dict[str, datetime] = {}  # league -> last sync time
+        self._syncing: Dict[str, bool] = {}  # league -> sync in progress
+        self._sync_errors: Dict[str, str] = {}  # league -> last sync error
 
         # Lock for thread safety
         self._lock = asyncio.Lock()
@@ -43,10 +45,7 @@ class CacheService:
     @property
     def is_loaded(self) -> Dict[str, bool]:
         """Check if data is loaded for each league"""
-        return {
-            "NHL": "NHL" in self._teams and len(self._teams.get("NHL", [])) > 0,
-            "AHL": "AHL" in self._teams and len(self._teams.get("AHL", [])) > 0
-        }
+        return {league: len(teams) > 0 for league, teams in self._teams.items()}
 
     def get_last_sync(self, league: str) -> Optional[datetime]:
         """Get last sync time for a league"""
@@ -94,6 +93,43 @@ class CacheService:
         """Mark league as synced"""
         self._last_sync[league] = datetime.now()
 
+    def mark_syncing(self, league: str, syncing: bool):
+        """Mark league sync as started/finished"""
+        self._syncing[league] = syncing
+
+    def mark_sync_error(self, league: str, error: Optional[str]):
+        """Store last sync error for a league (None clears it)"""
+        if error is None:
+            self._sync_errors.pop(league, None)
+        else:
+            self._sync_errors[league] = error
+
+    def is_ready(self, league: str) -> bool:
+        """League is ready once at least one sync has completed"""
+        return league in self._last_sync
+
+    def get_league_status(self, league: str) -> dict:
+        """Get readiness info for a league.
+
+        state: ready - synced at least once; warming - first sync pending or running;
+        error - first sync failed.
+        """
+        last_sync = self._last_sync.get(league)
+        error = self._sync_errors.get(league)
+        if last_sync:
+            state = "ready"
+        elif error and not self._syncing.get(league, False):
+            state = "error"
+        else:
+            state = "warming"
+
+        return {
+            "state": state,
+            "syncing": self._syncing.get(league, False),
+            "last_sync": last_sync.isoformat() if last_sync else None,
+            "error": error
+        }
+
     def needs_sync(self, league: str, max_age_hours: int = 12) -> bool:
         """Check if league needs sync"""
         last_sync = self._last_sync.get(league)
@@ -108,6 +144,7 @@ class CacheService:
         self._schedules.pop(league, None)
         self._team_stats.pop(league, None)
         self._last_sync.pop(league, None)
+        self._sync_errors.pop(league, None)
 
     def clear_all(self):
         """Clear entire cache"""
@@ -115,6 +152,7 @@ class CacheService:
         self._schedules.clear()
         self._team_stats.clear()
         self._last_sync.clear()
+        self._sync_errors.clear()
 
 
 # Global cache instance
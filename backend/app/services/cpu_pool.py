@@ -0,0 +1,57 @@
+"""
+Process pool for CPU-bound parsing (feed splitting, results pages, HTML).
+
+Parsing large payloads on the event loop stalls every request being served
+at the same time. Work submitted here runs in separate processes; parse
+functions must be module-level (picklable) and should return compact records
+rather than parser objects.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+
+def _default_workers() -> int:
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+# 0 disables the pool: parsing then runs inline on the event loop
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", str(_default_workers())))
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> Optional[ProcessPoolExecutor]:
+    """Get the shared pool, creating it on first use (None if disabled)"""
+    global _executor
+    if CPU_POOL_WORKERS <= 0:
+        return None
+    if _executor is None:
+        # spawn: forking a process that already runs an event loop and threads is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=CPU_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+async def run_cpu(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a CPU-bound function in the process pool and await its result"""
+    executor = get_executor()
+    if executor is None:
+        return func(*args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+def shutdown():
+    """Stop worker processes"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
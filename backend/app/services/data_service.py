@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 from ..models.database import Team, Game, DataUpdate, get_db
 from .nhl_api import NHLApiService, TEAM_NAMES_RU
 from .stats_calculator import StatsCalculator, GameResult
+from .sync_pipeline import GameSyncPipeline, GameRow
+from . import sync_telemetry
 
 
 class DataService:
@@ -52,79 +54,51 @@ class DataService:
 
         return teams
 
-    async def sync_team_games(self, db: Session, team_abbrev: str, season: str = "20242025") -> int:
-        """Sync all games for a specific team"""
-        games_data = await self.api.get_team_game_log(team_abbrev, season)
-        synced_count = 0
-
-        for game_data in games_data:
-            game_id = f"nhl_{game_data.get('id')}"
-            existing = db.query(Game).filter(Game.game_id == game_id).first()
-
-            if existing:
-                # Update existing game
-                existing.home_score = game_data.get("homeTeam", {}).get("score")
-                existing.away_score = game_data.get("awayTeam", {}).get("score")
-                existing.is_finished = game_data.get("gameState") in ["OFF", "FINAL"]
-            else:
-                # Get or create teams
-                home_abbrev = game_data.get("homeTeam", {}).get("abbrev")
-                away_abbrev = game_data.get("awayTeam", {}).get("abbrev")
-
-                home_team = db.query(Team).filter(
-                    Team.league == self.LEAGUE,
-                    Team.abbrev == home_abbrev
-                ).first()
-                away_team = db.query(Team).filter(
-                    Team.league == self.LEAGUE,
-                    Team.abbrev == away_abbrev
-                ).first()
-
-                if not home_team or not away_team:
-                    continue
-
-                # Parse date
-                game_date_str = game_data.get("gameDate")
-                try:
-                    game_date = datetime.strptime(game_date_str, "%Y-%m-%d")
-                except:
-                    continue
-
-                game = Game(
-                    league=self.LEAGUE,
-                    game_id=game_id,
-                    date=game_date,
-                    home_team_id=home_team.id,
-                    away_team_id=away_team.id,
-                    home_score=game_data.get("homeTeam", {}).get("score"),
-                    away_score=game_data.get("awayTeam", {}).get("score"),
-                    is_finished=game_data.get("gameState") in ["OFF", "FINAL"],
-                    season=season
-                )
-                db.add(game)
-                synced_count += 1
-
-        db.commit()
-        return synced_count
+    async def _iter_game_pages(self, teams: List[Team], season: str):
+        """Yield each team's game log, skipping teams that fail to load"""
+        for team in teams:
+            try:
+                yield await self.api.get_team_game_log(team.abbrev, season)
+            except Exception as e:
+                print(f"Error syncing {team.abbrev}: {e}")
+                sync_telemetry.record_error(f"{team.abbrev}: {e}")
+
+    def _normalize_game(self, game_data: dict, season: str) -> Optional[GameRow]:
+        """Convert NHL game log entry to a GameRow"""
+        try:
+            game_date = datetime.strptime(game_data.get("gameDate"), "%Y-%m-%d")
+        except (TypeError, ValueError):
+            return None
+
+        return GameRow(
+            game_id=f"nhl_{game_data.get('id')}",
+            date=game_date,
+            home_team_key=game_data.get("homeTeam", {}).get("abbrev"),
+            away_team_key=game_data.get("awayTeam", {}).get("abbrev"),
+            home_score=game_data.get("homeTeam", {}).get("score"),
+            away_score=game_data.get("awayTeam", {}).get("score"),
+            is_finished=game_data.get("gameState") in ["OFF", "FINAL"],
+            season=season
+        )
 
     async def sync_all_games(self, db: Session, season: str = "20242025") -> int:
         """Sync games for all teams"""
         teams = db.query(Team).filter(Team.league == self.LEAGUE).all()
-        total_synced = 0
 
-        for team in teams:
-            try:
-                synced = await self.sync_team_games(db, team.abbrev, season)
-                total_synced += synced
-            except Exception as e:
-                print(f"Error syncing {team.abbrev}: {e}")
+        pipeline = GameSyncPipeline(
+            league=self.LEAGUE,
+            pages=self._iter_game_pages(teams, season),
+            normalize=lambda game_data: self._normalize_game(game_data, season),
+            team_key="abbrev"
+        )
+        stats = await pipeline.run(db)
 
         # Log update
         update = DataUpdate(update_type="nhl_games_sync")
         db.add(update)
         db.commit()
 
-        return total_synced
+        return stats.inserted
 
     def get_team_matches(
         self,
@@ -0,0 +1,301 @@
+"""
+Flashscore daily feed (f_4_{offset}_3_en_5): tokenizer and a cache keyed by
+calendar date.
+
+Feed format: records separated by "¬~", fields "KEY÷value" separated by "¬".
+A league header record (ZA = name, ZC = id) is followed by its match records
+(AA = event id). iter_feed_matches walks the text once with str.find, skips
+match records of non-target leagues without touching their fields and slices
+only the fields it returns.
+
+The feed is addressed by day offset from today, but a finished day never
+changes, so feeds are stored by the date they cover:
+- past days are kept forever (memory, disk, optionally Redis);
+- today and future days are refetched after FEED_TODAY_TTL seconds.
+
+A past day is only stored once it is verifiably complete: no live matches,
+and its match timestamps fall on the expected date (guards against our
+day boundary differing from Flashscore's around midnight).
+"""
+
+import asyncio
+import os
+import re
+import tempfile
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+import httpx
+
+
+FEED_BASE_URL = "https://2.flashscore.ninja/2/x/feed"
+FEED_HEADERS = {"x-fsign": "SW9D1eZo"}
+# Timezone segment ("3") of the feed name: days run on UTC+3
+FEED_TZ = timezone(timedelta(hours=3))
+
+FEED_CACHE_DIR = os.getenv("FLASHSCORE_FEED_CACHE_DIR", os.path.join(tempfile.gettempdir(), "flashscore_feeds"))
+FEED_TODAY_TTL = int(os.getenv("FLASHSCORE_FEED_TODAY_TTL", "60"))
+FEED_FETCH_CONCURRENCY = int(os.getenv("FLASHSCORE_FEED_CONCURRENCY", "10"))
+REDIS_KEY_PREFIX = "fs:feed:"
+
+_TIMESTAMP_RE = re.compile(r"¬AD÷(\d+)")
+
+
+class FeedMatch(NamedTuple):
+    id: str
+    league: str
+    league_id: str
+    timestamp: str  # AD, unix seconds
+    status: str  # AB: 1 = scheduled, 2 = live, 3 = finished
+    home: str
+    away: str
+    home_score: str
+    away_score: str
+    home_logo: str
+    away_logo: str
+
+
+def _field(text: str, key: str, start: int, end: int) -> str:
+    """Value of `key` within the record text[start:end] ("" if absent)"""
+    i = text.find(key, start, end)
+    if i < 0:
+        return ""
+    i += len(key)
+    j = text.find("¬", i, end)
+    return text[i:j if j >= 0 else end]
+
+
+def iter_feed_matches(text: str, target_league: Optional[str] = None) -> Iterator[FeedMatch]:
+    """Match records of a day feed, optionally only for leagues whose name
+    contains `target_league` (case-insensitive)"""
+    if not text:
+        return
+    target = target_league.lower() if target_league else None
+    league = league_id = ""
+    wanted = target is None
+    end_of_text = len(text)
+
+    if text.startswith("~"):
+        start = 1
+    else:
+        start = text.find("¬~")
+        if start < 0:
+            return
+        start += 2
+
+    while True:
+        next_record = text.find("¬~", start)
+        end = next_record if next_record >= 0 else end_of_text
+
+        if text.startswith("AA÷", start):
+            if wanted:
+                head_end = text.find("¬", start, end)
+                yield FeedMatch(
+                    text[start + 3:head_end if head_end >= 0 else end],
+                    league,
+                    league_id,
+                    _field(text, "¬AD÷", start, end),
+                    _field(text, "¬AB÷", start, end),
+                    _field(text, "¬AE÷", start, end),
+                    _field(text, "¬AF÷", start, end),
+                    _field(text, "¬AG÷", start, end),
+                    _field(text, "¬AH÷", start, end),
+                    _field(text, "¬OA÷", start, end),
+                    _field(text, "¬OB÷", start, end),
+                )
+        elif text.startswith("ZA÷", start):
+            head_end = text.find("¬", start, end)
+            league = text[start + 3:head_end if head_end >= 0 else end]
+            league_id = _field(text, "¬ZC÷", start, end)
+            wanted = target is None or target in league.lower()
+
+        if next_record < 0:
+            return
+        start = next_record + 2
+
+
+LeagueIndex = Dict[str, List[FeedMatch]]
+
+
+def index_feed(text: str) -> LeagueIndex:
+    """Parse a day feed once into lowercased league name -> matches"""
+    index: LeagueIndex = {}
+    for match in iter_feed_matches(text):
+        index.setdefault(match.league.lower(), []).append(match)
+    return index
+
+
+def league_matches(index: LeagueIndex, target_league: str) -> List[FeedMatch]:
+    """Matches of leagues whose name contains `target_league` (case-insensitive)"""
+    target = target_league.lower()
+    if target in index:
+        return index[target]
+    return [match for name, matches in index.items() if target in name for match in matches]
+
+
+def feed_url(day_offset: int) -> str:
+    return f"{FEED_BASE_URL}/f_4_{day_offset}_3_en_5"
+
+
+def feed_today() -> date:
+    return datetime.now(FEED_TZ).date()
+
+
+def is_complete_day(text: str, day: date, today: date) -> bool:
+    """Whether a past day's feed can be cached forever"""
+    if day >= today or "¬AB÷2¬" in text:  # Status 2 = live
+        return False
+    days = Counter(
+        datetime.fromtimestamp(int(ts), FEED_TZ).date()
+        for ts in _TIMESTAMP_RE.findall(text)
+    )
+    if not days:
+        # Nothing to verify against; only trust days clear of the boundary
+        return day <= today - timedelta(days=2)
+    return days.most_common(1)[0][0] == day
+
+
+class DayFeedCache:
+    """Per-date feed cache: memory -> disk -> Redis (optional) -> network.
+
+    Args:
+        redis_factory: Returns an Upstash-style client (mget/set) or None
+    """
+
+    def __init__(self, directory: str = FEED_CACHE_DIR, redis_factory: Optional[Callable] = None):
+        self.directory = directory
+        self.redis_factory = redis_factory
+        self._final: Dict[date, str] = {}  # Complete past days
+        self._recent: Dict[date, tuple] = {}  # date -> (fetched_at, text) for today/future/incomplete
+        self._indexes: Dict[date, tuple] = {}  # date -> (text, LeagueIndex), rebuilt when the text changes
+
+    def _path(self, day: date) -> str:
+        return os.path.join(self.directory, f"{day.isoformat()}.txt")
+
+    def _load_disk(self, day: date) -> Optional[str]:
+        try:
+            with open(self._path(day), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _save_disk(self, day: date, text: str):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = self._path(day) + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, self._path(day))
+        except OSError as e:
+            print(f"Flashscore feed cache write failed for {day}: {e}")
+
+    def _redis(self):
+        if self.redis_factory is None:
+            return None
+        try:
+            return self.redis_factory()
+        except Exception as e:
+            print(f"Flashscore feed cache Redis unavailable: {e}")
+            return None
+
+    async def _fetch(self, client, day_offset: int) -> Optional[str]:
+        try:
+            response = await client.get(feed_url(day_offset), headers=FEED_HEADERS)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"Error fetching Flashscore day {day_offset}: {e}")
+            return None
+        return response.text
+
+    async def get_many(self, client, day_offsets: Iterable[int], concurrency: int = FEED_FETCH_CONCURRENCY) -> List[str]:
+        """Feed text for each day offset (empty string when a day fails, the rest are still returned)"""
+        today = feed_today()
+        offsets = list(day_offsets)
+        days = {offset: today + timedelta(days=offset) for offset in offsets}
+        texts: Dict[int, str] = {}
+        now = time.time()
+
+        # Memory and disk
+        for offset, day in days.items():
+            if day in self._final:
+                texts[offset] = self._final[day]
+                continue
+            recent = self._recent.get(day)
+            if recent and now - recent[0] < FEED_TODAY_TTL:
+                texts[offset] = recent[1]
+                continue
+            if day < today:
+                text = self._load_disk(day)
+                if text is not None:
+                    self._final[day] = text
+                    texts[offset] = text
+
+        # Redis, one round trip for every remaining past day
+        past = [offset for offset in offsets if offset not in texts and days[offset] < today]
+        redis = self._redis() if past else None
+        if redis is not None:
+            try:
+                values = redis.mget(*[REDIS_KEY_PREFIX + days[offset].isoformat() for offset in past])
+                for offset, text in zip(past, values):
+                    if text is not None:
+                        self._final[days[offset]] = text
+                        self._save_disk(days[offset], text)
+                        texts[offset] = text
+            except Exception as e:
+                print(f"Flashscore feed cache Redis error: {e}")
+
+        # Network for the rest (normally only today)
+        missing = [offset for offset in offsets if offset not in texts]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(offset):
+            async with semaphore:
+                return await self._fetch(client, offset)
+
+        fetched = await asyncio.gather(*(fetch(offset) for offset in missing))
+        for offset, text in zip(missing, fetched):
+            if text is None:
+                texts[offset] = ""
+                continue
+            texts[offset] = text
+            day = days[offset]
+            if is_complete_day(text, day, today):
+                self._final[day] = text
+                self._save_disk(day, text)
+                self._store_redis(redis, day, text)
+            else:
+                self._recent[day] = (time.time(), text)
+
+        for day in [day for day in self._recent if day < today - timedelta(days=1)]:
+            del self._recent[day]
+        return [texts[offset] for offset in offsets]
+
+    async def get_indexes(self, client, day_offsets: Iterable[int], concurrency: int = FEED_FETCH_CONCURRENCY) -> List[LeagueIndex]:
+        """League index for each day offset; each feed text is parsed only once"""
+        offsets = list(day_offsets)
+        today = feed_today()
+        texts = await self.get_many(client, offsets, concurrency)
+        indexes = []
+        for offset, text in zip(offsets, texts):
+            day = today + timedelta(days=offset)
+            cached = self._indexes.get(day)
+            if cached is None or cached[0] is not text:
+                cached = (text, index_feed(text))
+                self._indexes[day] = cached
+            indexes.append(cached[1])
+
+        for day in [day for day in self._indexes if day not in self._final and day not in self._recent]:
+            del self._indexes[day]
+        return indexes
+
+    def _store_redis(self, redis, day: date, text: str):
+        if redis is None:
+            redis = self._redis()
+        if redis is None:
+            return
+        try:
+            redis.set(REDIS_KEY_PREFIX + day.isoformat(), text)
+        except Exception as e:
+            print(f"Flashscore feed cache Redis error: {e}")
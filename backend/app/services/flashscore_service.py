@@ -3,12 +3,19 @@ Flashscore parsing service for team lineups and player statistics.
 Adapted from tg_bot_parsing_flashscore project.
 """
 
-import json
-import re
+import asyncio
+import os
+import time
+import weakref
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Tuple
 import httpx
-from bs4 import BeautifulSoup
+
+from .cpu_pool import run_cpu
+from .flashscore_feed import iter_feed_matches
+from .html_extract import extract_script_json, extract_team_page
+from .http_cache import caching_transport
 
 
 # Flashscore feed codes for different leagues
@@ -21,6 +28,46 @@ LEAGUE_FEEDS = {
 
 HEADERS = {"x-fsign": "SW9D1eZo"}
 
+# Player pages fetched at once per lineup, and how long parsed stats are reused
+PLAYER_FETCH_CONCURRENCY = int(os.getenv("LINEUP_PLAYER_CONCURRENCY", "8"))
+PLAYER_STATS_TTL = int(os.getenv("LINEUP_PLAYER_STATS_TTL", "1800"))
+PLAYER_STATS_CACHE_SIZE = 5000
+
+# Points per game above which a player counts as a leader
+EFFICIENCY_THRESHOLD = 0.3
+
+# (player_url, team_name) -> (fetched_at, stats)
+_player_stats_cache: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+
+
+# Event loop -> shared Flashscore client
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+@asynccontextmanager
+async def lineup_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Shared Flashscore client for the running event loop (match feeds, match
+    pages, team pages, player pages): one connection pool and one cache /
+    resilience stack for all requests. Leaving the block does not close it.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            transport=caching_transport(limits=httpx.Limits(max_connections=PLAYER_FETCH_CONCURRENCY * 2)),
+            follow_redirects=True,
+            timeout=30.0
+        )
+        _clients[loop] = client
+    yield client
+
+
+class ScrapedTeam(NamedTuple):
+    team: str
+    players: List[dict]  # Stats of players whose page was parsed, with 'url'
+    listed: List[str]  # Every player page linked from the team page, parsed or not
+
 
 def is_in_season(season: str) -> bool:
     """Check if current date is within the season."""
@@ -50,74 +97,47 @@ async def get_matches_list(league: str, day_offset: int = 0) -> list:
 
     url = f'https://2.flashscore.ninja/2/x/feed/{feed}'
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=HEADERS, timeout=30.0)
-        data = response.text.split('¬')
-
-    data_list = [{}]
-    result = []
-
-    for item in data:
-        parts = item.split('÷')
-        key = parts[0]
-        value = parts[-1] if len(parts) > 1 else ''
-
-        if '~' in key:
-            data_list.append({key: value})
-        else:
-            data_list[-1].update({key: value})
-
-    league_name = ''
-    league_id = ''
-
-    for game in data_list:
-        keys = list(game.keys())
-        if not keys:
-            continue
-
-        if '~ZA' in keys[0]:
-            league_name = game.get('~ZA', '')
-            league_id = game.get('ZC', '')
-
-        if 'AA' in keys[0]:
-            event_id = game.get("~AA", "")
-            match_url = f'https://www.flashscore.com/match/{event_id}/#/match-summary/match-summary'
-            team_1 = game.get("AE", "")
-            team_2 = game.get("AF", "")
-
-            result.append({
-                'id': event_id,
-                'url': match_url,
-                'home': team_1,
-                'away': team_2,
-                'league': league_name,
-                'league_id': league_id
-            })
+    async with lineup_client() as client:
+        response = await client.get(url, headers=HEADERS)
 
-    return result
+    return await run_cpu(parse_matches_feed, response.text)
+
+
+def parse_matches_feed(feed_text: str) -> list:
+    """Split a Flashscore day feed into match records (runs in the CPU pool)"""
+    return [
+        {
+            'id': match.id,
+            'url': f'https://www.flashscore.com/match/{match.id}/#/match-summary/match-summary',
+            'home': match.home,
+            'away': match.away,
+            'league': match.league,
+            'league_id': match.league_id
+        }
+        for match in iter_feed_matches(feed_text)
+    ]
 
 
-async def get_team_urls(match_url: str) -> dict:
+async def get_team_urls(match_url: str, client: Optional[httpx.AsyncClient] = None) -> dict:
     """
     Get team page URLs from a match page.
 
     Returns:
         Dict with 'home' and 'away' team URLs
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(match_url, headers=HEADERS, timeout=30.0)
-        html_content = response.text
+    if client is None:
+        async with lineup_client() as client:
+            return await get_team_urls(match_url, client)
 
-    soup = BeautifulSoup(html_content, 'lxml')
-    result_string = soup.find('script', string=re.compile(r"window\.environment"))
+    response = await client.get(match_url, headers=HEADERS)
+    return await run_cpu(parse_team_urls, response.text)
 
-    if not result_string:
-        return {}
 
-    match = re.search(r"window\.environment\s*=\s*(\{.*\});", result_string.string)
+def parse_team_urls(html_content: str) -> dict:
+    """Extract home/away team page URLs from match page HTML (runs in the CPU pool)"""
+    json_data = extract_script_json(html_content, "environment")
 
-    if match:
-        json_data = json.loads(match.group(1))
+    if json_data:
         home_link = json_data.get('participantsData', {}).get('home', [{}])[0].get('detail_link', '')
         away_link = json_data.get('participantsData', {}).get('away', [{}])[0].get('detail_link', '')
 
@@ -129,26 +149,32 @@ async def get_team_urls(match_url: str) -> dict:
     return {}
 
 
-async def get_player_stats(player_url: str, player_name: str, team_name: str) -> dict:
+async def get_player_stats(client: httpx.AsyncClient, player_url: str, player_name: str, team_name: str) -> dict:
     """
-    Get individual player statistics.
+    Get individual player statistics (cached per player URL for PLAYER_STATS_TTL).
 
     Returns:
         Dict with player stats including status, games, goals, assists, points
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(player_url, headers=HEADERS, timeout=30.0)
-        player_html = response.text
+    key = (player_url, team_name)
+    cached = _player_stats_cache.get(key)
+    if cached and time.time() - cached[0] < PLAYER_STATS_TTL:
+        return {**cached[1], 'name': player_name}
+
+    response = await client.get(player_url, headers=HEADERS)
+    stats = await run_cpu(parse_player_profile, response.text, player_name, team_name)
+
+    # Entries stay in fetch order, so the first ones are the oldest
+    _player_stats_cache.pop(key, None)
+    while len(_player_stats_cache) >= PLAYER_STATS_CACHE_SIZE:
+        del _player_stats_cache[next(iter(_player_stats_cache))]
+    _player_stats_cache[key] = (time.time(), stats)
+    return stats
 
-    soup = BeautifulSoup(player_html, 'lxml')
-    result_string = soup.find('script', string=re.compile(r"window\.playerProfilePageEnvironment"))
 
-    json_data = {}
-    if result_string:
-        script_content = result_string.string
-        match = re.search(r"window\.playerProfilePageEnvironment\s*=\s*(\{.*\});", script_content)
-        if match:
-            json_data = json.loads(match.group(1))
+def parse_player_profile(player_html: str, player_name: str, team_name: str) -> dict:
+    """Extract status and current season stats from player page HTML (runs in the CPU pool)"""
+    json_data = extract_script_json(player_html, "playerProfilePageEnvironment")
 
     # Determine player status from last matches
     last_match_status = ''
@@ -173,19 +199,21 @@ async def get_player_stats(player_url: str, player_name: str, team_name: str) ->
     points = 0
     season_name = ''
 
-    seasons = json_data.get('careerTables', [{}])[0].get('seasons', []) if json_data.get('careerTables') else []
-
-    for season in seasons:
-        try:
-            if is_in_season(season.get('season_name', '')) and season.get('team_name') == team_name:
-                matches_played = int(season.get('matches_played', 0) or 0)
-                goals = int(season.get('goals', 0) or 0)
-                assists = int(season.get('assists', 0) or 0)
-                points = int(season.get('points', 0) or 0)
-                season_name = season.get('season_name', '')
-                break
-        except (ValueError, TypeError):
-            continue
+    # First career table (league, cup, ...) with a current season row for the team
+    for table in json_data.get('careerTables', []):
+        for season in table.get('seasons', []):
+            try:
+                if is_in_season(season.get('season_name', '')) and season.get('team_name') == team_name:
+                    matches_played = int(season.get('matches_played', 0) or 0)
+                    goals = int(season.get('goals', 0) or 0)
+                    assists = int(season.get('assists', 0) or 0)
+                    points = int(season.get('points', 0) or 0)
+                    season_name = season.get('season_name', '')
+                    break
+            except (ValueError, TypeError):
+                continue
+        if matches_played > 0:
+            break
 
     # Calculate efficiency (points per game)
     efficiency = round(points / matches_played, 2) if matches_played > 0 else 0.0
@@ -202,55 +230,111 @@ async def get_player_stats(player_url: str, player_name: str, team_name: str) ->
     }
 
 
-async def get_team_lineup(team_url: str) -> dict:
+async def scrape_team_players(
+    team_url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    on_team: Optional[Callable[[str, int], None]] = None,
+    on_player: Optional[Callable[[dict], None]] = None
+) -> ScrapedTeam:
     """
-    Get full team lineup with player statistics.
+    Scrape a team page and the stats of every listed player.
+
+    Player pages are fetched concurrently, at most PLAYER_FETCH_CONCURRENCY
+    at a time (the semaphore is shared when both teams load together).
+    on_team(team_name, players_listed) is called once the team page is
+    parsed and on_player(player) as each player page is, for streaming.
 
     Returns:
-        Dict with team name and categorized players
+        Team name, stats of the players whose page could be parsed, and all
+        listed player links (a failed player page is not a roster change)
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(team_url, headers=HEADERS, timeout=30.0)
-        html_content = response.text
-
-    soup = BeautifulSoup(html_content, 'lxml')
-
-    # Get team name
-    team_name_elem = soup.find("div", class_="heading__name")
-    team_name = team_name_elem.text.strip() if team_name_elem else "Unknown"
-
-    # Get all players
-    players_elements = soup.find_all("a", class_="lineupTable__cell--name")
-
-    players = []
-    seen_links = set()
-
-    for player_elem in players_elements:
-        player_name = player_elem.get_text(strip=True)
-        player_link = f'https://www.flashscore.com{player_elem.get("href", "")}'
-
-        if player_link in seen_links:
-            continue
-        seen_links.add(player_link)
-
+    if client is None:
+        async with lineup_client() as client:
+            return await scrape_team_players(team_url, client, semaphore, on_team, on_player)
+    semaphore = semaphore or asyncio.Semaphore(PLAYER_FETCH_CONCURRENCY)
+
+    response = await client.get(team_url, headers=HEADERS)
+    team_page = await run_cpu(parse_team_page, response.text)
+    team_name = team_page['team']
+    if on_team:
+        on_team(team_name, len(team_page['players']))
+
+    async def fetch_player(player_name: str, player_link: str) -> Optional[dict]:
         try:
-            player_stats = await get_player_stats(player_link, player_name, team_name)
-            players.append(player_stats)
+            async with semaphore:
+                stats = await get_player_stats(client, player_link, player_name, team_name)
         except Exception as e:
             # Skip players with parsing errors
             print(f"Error parsing player {player_name}: {e}")
-            continue
+            return None
+        player = {**stats, 'url': player_link}
+        if on_player:
+            on_player(player)
+        return player
+
+    results = await asyncio.gather(*(fetch_player(name, link) for name, link in team_page['players']))
+    return ScrapedTeam(
+        team_name,
+        [player for player in results if player is not None],
+        [link for _, link in team_page['players']]
+    )
+
+
+async def get_team_lineup(
+    team_url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    semaphore: Optional[asyncio.Semaphore] = None
+) -> dict:
+    """
+    Get full team lineup with player statistics.
+
+    Returns:
+        Dict with team name and categorized players
+    """
+    scraped = await scrape_team_players(team_url, client, semaphore)
+    return team_lineup(scraped.team, scraped.players)
 
-    # Categorize players according to requirements
-    categorized = categorize_players(players)
 
+def team_lineup(team_name: str, players: list) -> dict:
+    """Lineup response for a team: players categorized by form and availability"""
     return {
         'team': team_name,
-        'players': categorized,
+        'players': categorize_players(players),
         'total_players': len(players)
     }
 
 
+def parse_team_page(html_content: str) -> dict:
+    """Extract team name and unique (name, link) player pairs from team page HTML (runs in the CPU pool)"""
+    return extract_team_page(html_content)
+
+
+def player_category(player: dict) -> str:
+    """
+    Group of a player (see categorize_players): leaders_active,
+    leaders_questionable, absent or others.
+    """
+    efficiency = player.get('efficiency', 0)
+    status = player.get('status', '').lower()
+
+    is_available = status == 'заявлен'
+    is_top_player = efficiency > EFFICIENCY_THRESHOLD
+    is_absent = status in ['травма', 'не заявлен', 'injury', 'missing'] or (status != 'заявлен' and status != '')
+
+    if is_absent:
+        # Red group - absent players
+        return 'absent'
+    if is_top_player and is_available:
+        # Yellow group - top players in roster
+        return 'leaders_active'
+    if is_top_player and not is_available:
+        # Orange group - top players questionable
+        return 'leaders_questionable'
+    # No color - other players
+    return 'others'
+
+
 def categorize_players(players: list) -> dict:
     """
     Categorize players into groups:
@@ -259,33 +343,20 @@ def categorize_players(players: list) -> dict:
     3. absent - injured/not in roster, sorted by points (red)
     4. others - <0.5 ppg, in roster (no color)
     """
-    leaders_active = []      # Yellow: top players who played
-    leaders_questionable = [] # Orange: top players who missed last match
-    absent = []              # Red: injured/not available
-    others = []              # No color: low-efficiency players
-
-    EFFICIENCY_THRESHOLD = 0.3
+    groups = {
+        'leaders_active': [],        # Yellow: top players who played
+        'leaders_questionable': [],  # Orange: top players who missed last match
+        'absent': [],                # Red: injured/not available
+        'others': []                 # No color: low-efficiency players
+    }
 
     for player in players:
-        efficiency = player.get('efficiency', 0)
-        status = player.get('status', '').lower()
-
-        is_available = status == 'заявлен'
-        is_top_player = efficiency > EFFICIENCY_THRESHOLD
-        is_absent = status in ['травма', 'не заявлен', 'injury', 'missing'] or (status != 'заявлен' and status != '')
-
-        if is_absent or (status != 'заявлен' and status != ''):
-            # Red group - absent players
-            absent.append(player)
-        elif is_top_player and is_available:
-            # Yellow group - top players in roster
-            leaders_active.append(player)
-        elif is_top_player and not is_available:
-            # Orange group - top players questionable
-            leaders_questionable.append(player)
-        else:
-            # No color - other players
-            others.append(player)
+        groups[player_category(player)].append(player)
+
+    leaders_active = groups['leaders_active']
+    leaders_questionable = groups['leaders_questionable']
+    absent = groups['absent']
+    others = groups['others']
 
     # Sort each group
     leaders_active.sort(key=lambda x: x.get('efficiency', 0), reverse=True)
@@ -308,17 +379,17 @@ async def get_match_lineups(match_url: str) -> dict:
     Returns:
         Dict with home and away team lineups
     """
-    team_urls = await get_team_urls(match_url)
-
     result = {
         'home': None,
         'away': None
     }
 
-    if team_urls.get('home'):
-        result['home'] = await get_team_lineup(team_urls['home'])
-
-    if team_urls.get('away'):
-        result['away'] = await get_team_lineup(team_urls['away'])
+    # Both teams share one client and one player-page limit
+    semaphore = asyncio.Semaphore(PLAYER_FETCH_CONCURRENCY)
+    async with lineup_client() as client:
+        team_urls = await get_team_urls(match_url, client)
+        sides = [side for side in ('home', 'away') if team_urls.get(side)]
+        lineups = await asyncio.gather(*(get_team_lineup(team_urls[side], client, semaphore) for side in sides))
 
+    result.update(zip(sides, lineups))
     return result
@@ -0,0 +1,91 @@
+"""
+HTML extraction helpers for scraped pages (Flashscore lineups, club news).
+
+Pages are parsed with lxml (C parser) when installed, falling back to
+html.parser, and only the elements a caller needs are built (SoupStrainer)
+instead of the whole document tree. Embedded page JSON (window.environment,
+window.playerProfilePageEnvironment) is cut out of the raw HTML without
+parsing at all. Each helper falls back to the previous full-document
+selectors when the fast path finds nothing, so a markup change degrades to
+the old speed instead of empty results.
+"""
+
+import json
+import re
+from typing import List, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+FLASHSCORE_URL = "https://www.flashscore.com"
+
+# Tags dropped from article pages before reading text
+ARTICLE_NOISE_TAGS = ['script', 'style', 'nav', 'footer', 'header', 'aside', 'button', 'form']
+
+
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+
+def extract_script_json(html: str, variable: str) -> dict:
+    """Decode `window.<variable> = {...};` from a page"""
+    pattern = re.compile(r"window\." + re.escape(variable) + r"\s*=\s*(\{.*\});")
+
+    # Fast path: the assignment inside its <script> on the raw text
+    start = html.find(f"window.{variable}")
+    if start >= 0:
+        end = html.find("</script>", start)
+        match = pattern.search(html, start, end if end >= 0 else len(html))
+        if match:
+            try:
+                return json.loads(match.group(1))
+            except ValueError:
+                pass
+
+    # Fallback: parse <script> tags only
+    soup = make_soup(html, SoupStrainer("script"))
+    script = soup.find('script', string=re.compile(r"window\." + re.escape(variable)))
+    if script and script.string:
+        match = pattern.search(script.string)
+        if match:
+            return json.loads(match.group(1))
+    return {}
+
+
+def _team_page_parts(soup: BeautifulSoup) -> Tuple[str, List[Tuple[str, str]]]:
+    team_name_elem = soup.find("div", class_="heading__name")
+    team_name = team_name_elem.text.strip() if team_name_elem else "Unknown"
+
+    players = []
+    seen_links = set()
+    for player_elem in soup.find_all("a", class_="lineupTable__cell--name"):
+        player_name = player_elem.get_text(strip=True)
+        player_link = f'{FLASHSCORE_URL}{player_elem.get("href", "")}'
+        if player_link in seen_links:
+            continue
+        seen_links.add(player_link)
+        players.append((player_name, player_link))
+    return team_name, players
+
+
+def extract_team_page(html: str) -> dict:
+    """Team name and unique (name, link) player pairs from a Flashscore team page"""
+    strainer = SoupStrainer(class_=["heading__name", "lineupTable__cell--name"])
+    team_name, players = _team_page_parts(make_soup(html, strainer))
+    if not players:
+        team_name, players = _team_page_parts(make_soup(html))
+    return {'team': team_name, 'players': players}
+
+
+def article_soup(html: str, body_only: bool = True) -> BeautifulSoup:
+    """Article page with noise tags removed; body_only builds just <main>/<article>"""
+    soup = make_soup(html, SoupStrainer(["main", "article"]) if body_only else None)
+    for tag in soup(ARTICLE_NOISE_TAGS):
+        tag.decompose()
+    return soup
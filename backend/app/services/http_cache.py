@@ -0,0 +1,241 @@
+"""
+Conditional-request HTTP cache as an httpx transport.
+
+Wraps another transport and, for GETs matching a cache rule:
+- serves the stored body without touching the network while the entry is
+  younger than the rule's freshness floor (or the server's max-age);
+- otherwise revalidates with If-None-Match / If-Modified-Since, turning an
+  unchanged payload into a 304 instead of a full download.
+
+If the upstream is down (transport error, open circuit, 5xx), an entry no
+older than the rule's stale_if_error window is served instead.
+
+Entries are kept on disk (raw body + headers), so they survive restarts and,
+on serverless, warm invocations. URLs without a rule pass straight through.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import httpx
+
+from .http_replay import upstream_transport
+from .resilience import ResilientTransport
+
+
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(tempfile.gettempdir(), "hockey_http_cache"))
+HTTP_CACHE_DISABLED = os.getenv("HTTP_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+# Larger bodies are not stored
+MAX_ENTRY_BYTES = int(os.getenv("HTTP_CACHE_MAX_ENTRY_BYTES", str(20 * 1024 * 1024)))
+
+# Hop-by-hop / framing headers that must not be replayed from the cache
+_SKIP_HEADERS = {"transfer-encoding", "connection", "keep-alive"}
+
+
+@dataclass
+class CacheRule:
+    """Cache GETs to `host` whose path matches `path_pattern` (regex, search)"""
+    host: str
+    path_pattern: str
+    freshness: int  # Seconds the stored body is served without revalidation
+    stale_if_error: int = 6 * 3600  # Max age served when the upstream fails
+
+    def matches(self, url: httpx.URL) -> bool:
+        return url.host == self.host and re.search(self.path_pattern, url.path) is not None
+
+
+# Freshness floors per upstream endpoint
+DEFAULT_RULES: List[CacheRule] = [
+    # NHL
+    CacheRule("api-web.nhle.com", r"^/v1/club-schedule-season/", 600),
+    CacheRule("api-web.nhle.com", r"^/v1/standings/", 600),
+    CacheRule("api-web.nhle.com", r"^/v1/schedule/", 300),
+    # Liiga
+    CacheRule("liiga.fi", r"^/api/v2/games", 300),
+    CacheRule("liiga.fi", r"^/api/v2/", 600),
+    # Austria ICE HL (S3 bucket, proper ETags)
+    CacheRule("s3.dualstack.eu-west-1.amazonaws.com", r"^/icehl\.hokejovyzapis\.cz/", 300),
+    # AHL (HockeyTech)
+    CacheRule("lscluster.hockeytech.com", r"^/feed/", 300),
+    # DEL (OpenLigaDB)
+    CacheRule("api.openligadb.de", r"^/getavailableteams/", 3600),
+    CacheRule("api.openligadb.de", r"^/getmatchdata/", 300),
+    # Flashscore feed and JetTon odds change constantly; cached mainly so a
+    # degraded upstream can be answered from recent data
+    CacheRule("2.flashscore.ninja", r"^/2/x/feed/", 30, stale_if_error=600),
+    # JetTon prematch chunks (/en/<version>, version > 0) are left out: a cached
+    # entry buffers the whole body before the caller sees it, which defeats the
+    # streaming hockey filter, and odds.py already keeps parsed chunks by version
+    CacheRule("sp.btspcloud.xyz", r"^/api/v4/prematch/(?!brand/\d+/en/[1-9]\d*$)", 30, stale_if_error=900),
+]
+
+
+def _max_age(headers: httpx.Headers) -> Optional[int]:
+    match = re.search(r"max-age=(\d+)", headers.get("cache-control", ""))
+    return int(match.group(1)) if match else None
+
+
+class DiskCacheStore:
+    """Stores one metadata JSON + one raw body file per URL"""
+
+    def __init__(self, directory: str = HTTP_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".body"
+
+    def load(self, url: str) -> Optional[Tuple[dict, bytes]]:
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return meta, body
+
+    def save(self, url: str, meta: dict, body: Optional[bytes] = None):
+        meta_path, body_path = self._paths(url)
+        try:
+            if body is not None:
+                self._atomic_write(body_path, body)
+            self._atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError as e:
+            print(f"HTTP cache write failed for {url}: {e}")
+
+    def _atomic_write(self, path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """httpx transport adding on-disk conditional caching for matching GETs.
+
+    Responses carry extensions["http_cache"] = "hit" | "revalidated" | "stale" | "miss".
+    """
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rules: Optional[List[CacheRule]] = None,
+        store: Optional[DiskCacheStore] = None
+    ):
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.store = store or DiskCacheStore()
+
+    def _rule_for(self, request: httpx.Request) -> Optional[CacheRule]:
+        if HTTP_CACHE_DISABLED or request.method != "GET":
+            return None
+        for rule in self.rules:
+            if rule.matches(request.url):
+                return rule
+        return None
+
+    @staticmethod
+    def _cached_response(request: httpx.Request, meta: dict, body: bytes, state: str) -> httpx.Response:
+        return httpx.Response(
+            status_code=meta["status"],
+            headers=meta["headers"],
+            content=body,
+            request=request,
+            extensions={"http_cache": state}
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        rule = self._rule_for(request)
+        if rule is None:
+            return await self.transport.handle_async_request(request)
+
+        url = str(request.url)
+        cached = self.store.load(url)
+        age = None
+        if cached:
+            meta, body = cached
+            age = time.time() - meta["stored_at"]
+            freshness = max(rule.freshness, meta.get("max_age") or 0)
+            if age < freshness:
+                return self._cached_response(request, meta, body, "hit")
+
+            if meta.get("etag"):
+                request.headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request.headers["If-Modified-Since"] = meta["last_modified"]
+
+        can_serve_stale = cached is not None and age < rule.stale_if_error
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TransportError as e:
+            if not can_serve_stale:
+                raise
+            print(f"Serving stale {url} ({int(age)}s old): {e!r}")
+            meta, body = cached
+            return self._cached_response(request, meta, body, "stale")
+
+        if can_serve_stale and response.status_code >= 500:
+            await response.aclose()
+            print(f"Serving stale {url} ({int(age)}s old): HTTP {response.status_code}")
+            meta, body = cached
+            return self._cached_response(request, meta, body, "stale")
+
+        if cached and response.status_code == 304:
+            await response.aclose()
+            meta, body = cached
+            meta["stored_at"] = time.time()
+            meta["max_age"] = _max_age(response.headers) or meta.get("max_age")
+            self.store.save(url, meta)
+            return self._cached_response(request, meta, body, "revalidated")
+
+        if response.status_code != 200:
+            return response
+
+        # Buffer the raw (still encoded) body so it can be stored and replayed;
+        # the client decodes it from the stored Content-Encoding as usual
+        try:
+            chunks = []
+            async for chunk in response.aiter_raw():
+                chunks.append(chunk)
+        finally:
+            await response.aclose()
+        body = b"".join(chunks)
+
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _SKIP_HEADERS]
+        meta = {
+            "url": url,
+            "status": response.status_code,
+            "headers": headers,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "max_age": _max_age(response.headers),
+            "stored_at": time.time()
+        }
+        if len(body) <= MAX_ENTRY_BYTES and "no-store" not in response.headers.get("cache-control", ""):
+            self.store.save(url, meta, body)
+        return self._cached_response(request, meta, body, "miss")
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def caching_transport(**kwargs) -> CachingTransport:
+    """Cache -> resilience layer -> AsyncHTTPTransport built from kwargs"""
+    return CachingTransport(ResilientTransport(upstream_transport(**kwargs)))
@@ -0,0 +1,164 @@
+"""
+Record/replay transport for upstream HTTP traffic.
+
+HTTP_REPLAY_MODE=record  - requests go to the network and every response is
+                           written to the fixture store
+HTTP_REPLAY_MODE=replay  - responses are served from the fixture store only;
+                           a request without a fixture fails (no network)
+
+Fixtures are one readable JSON file per request (method + URL with sorted
+query + body hash), so a recorded session can be committed or edited by hand.
+In replay mode HTTP_REPLAY_LATENCY_MS / HTTP_REPLAY_JITTER_MS add a simulated
+network delay per request (jitter is seeded, so runs are repeatable).
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import time
+from typing import Optional
+
+import httpx
+
+
+HTTP_REPLAY_MODE = os.getenv("HTTP_REPLAY_MODE", "").lower()
+HTTP_FIXTURES_DIR = os.getenv(
+    "HTTP_FIXTURES_DIR",
+    os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "http_fixtures")
+)
+HTTP_REPLAY_LATENCY_MS = float(os.getenv("HTTP_REPLAY_LATENCY_MS", "0"))
+HTTP_REPLAY_JITTER_MS = float(os.getenv("HTTP_REPLAY_JITTER_MS", "0"))
+HTTP_REPLAY_SEED = int(os.getenv("HTTP_REPLAY_SEED", "0"))
+
+# Recorded bodies are stored decoded, so these no longer describe them
+_SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+class FixtureMissingError(httpx.TransportError):
+    """Replay mode request with no recorded response"""
+
+
+def fixture_key(method: str, url: str, body: bytes = b"") -> str:
+    parsed = httpx.URL(url)
+    normalized = f"{parsed.scheme}://{parsed.netloc.decode('ascii')}{parsed.path}"
+    query = "&".join(sorted(f"{k}={v}" for k, v in parsed.params.multi_items()))
+    raw = f"{method.upper()} {normalized}?{query}"
+    if body:
+        raw += " " + hashlib.sha256(body).hexdigest()
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """Directory of recorded responses"""
+
+    def __init__(self, directory: str = HTTP_FIXTURES_DIR):
+        self.directory = os.path.abspath(directory)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, key: str, method: str, url: str, status: int, headers: list, body: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        fixture = {
+            "method": method,
+            "url": url,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "status": status,
+            "headers": headers,
+        }
+        try:
+            fixture["text"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            fixture["base64"] = base64.b64encode(body).decode("ascii")
+
+        tmp_path = self._path(key) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self._path(key))
+
+    @staticmethod
+    def body(fixture: dict) -> bytes:
+        if "base64" in fixture:
+            return base64.b64decode(fixture["base64"])
+        return fixture.get("text", "").encode("utf-8")
+
+
+class RecordReplayTransport(httpx.AsyncBaseTransport):
+    """Records responses from `transport`, or replays them without it"""
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        mode: str = HTTP_REPLAY_MODE,
+        store: Optional[FixtureStore] = None,
+        latency_ms: float = HTTP_REPLAY_LATENCY_MS,
+        jitter_ms: float = HTTP_REPLAY_JITTER_MS
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown HTTP replay mode: {mode!r}")
+        self.transport = transport
+        self.mode = mode
+        self.store = store or FixtureStore()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(HTTP_REPLAY_SEED)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        key = fixture_key(request.method, str(request.url), body)
+
+        if self.mode == "replay":
+            fixture = self.store.load(key)
+            if fixture is None:
+                raise FixtureMissingError(f"No fixture for {request.method} {request.url}", request=request)
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+            return httpx.Response(
+                status_code=fixture["status"],
+                headers=fixture["headers"],
+                content=self.store.body(fixture),
+                request=request,
+                extensions={"http_replay": "replayed"}
+            )
+
+        response = await self.transport.handle_async_request(request)
+        try:
+            content = await response.aread()  # Decoded body
+        finally:
+            await response.aclose()
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _SKIP_HEADERS]
+        self.store.save(key, request.method, str(request.url), response.status_code, headers, content)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            content=content,
+            request=request,
+            extensions={"http_replay": "recorded"}
+        )
+
+    async def aclose(self):
+        if self.transport is not None:
+            await self.transport.aclose()
+
+
+def wrap_transport(transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+    """Put the record/replay layer in front of `transport` when enabled"""
+    if HTTP_REPLAY_MODE:
+        return RecordReplayTransport(transport)
+    return transport
+
+
+def upstream_transport(**kwargs) -> httpx.AsyncBaseTransport:
+    """AsyncHTTPTransport built from kwargs, behind record/replay when enabled"""
+    return wrap_transport(httpx.AsyncHTTPTransport(**kwargs))
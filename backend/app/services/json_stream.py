@@ -0,0 +1,155 @@
+"""
+Incremental JSON decoding for large upstream payloads.
+
+StreamCollector decodes a response body as it streams in (ijson) and hands
+each array item / map entry under a registered prefix to a callback one at a
+time, so callers can filter and project records without the whole document
+ever being materialized. Everything outside the registered prefixes is skipped.
+
+Prefixes use ijson notation: "item" for the items of a top-level array,
+"response.item" for {"response": [...]}, and map bases like "events" for the
+entries of {"events": {...}}.
+
+Without ijson installed the body is decoded with json.loads and walked with
+the same callbacks, so results are identical (only the memory profile differs).
+"""
+
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+
+class _AsyncByteReader:
+    """Async file-like view over an async byte iterator (what ijson expects)"""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._buffer = b""
+
+    async def read(self, size: int = -1) -> bytes:
+        while not self._buffer:
+            try:
+                self._buffer = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                return b""
+        if size is None or size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class StreamCollector:
+    """Routes decoded values under chosen prefixes to callbacks"""
+
+    def __init__(self):
+        self._items: Dict[str, Callable[[Any], None]] = {}
+        self._entries: Dict[str, Callable[[str, Any], None]] = {}
+        self.values: Dict[str, Any] = {}
+
+    def on_item(self, prefix: str, handler: Callable[[Any], None]) -> "StreamCollector":
+        """Call handler(item) for each array item at `prefix` (e.g. "response.item")"""
+        self._items[prefix] = handler
+        return self
+
+    def on_entry(self, base: str, handler: Callable[[str, Any], None]) -> "StreamCollector":
+        """Call handler(key, value) for each entry of the object at `base`"""
+        self._entries[base] = handler
+        return self
+
+    def keep(self, prefix: str) -> "StreamCollector":
+        """Store the whole value at `prefix` in self.values (for small fields)"""
+        self.values.setdefault(prefix, None)
+        return self
+
+    async def feed_response(self, response) -> "StreamCollector":
+        """Decode an httpx streaming response (inside `client.stream(...)`)"""
+        if HAS_IJSON:
+            try:
+                await self._feed_events(response.aiter_bytes())
+            except ijson.JSONError as e:
+                # Same exception type as the json.loads path
+                raise ValueError(f"Invalid JSON: {e}") from e
+        else:
+            self.feed_object(json.loads(await response.aread()))
+        return self
+
+    async def _feed_events(self, chunks: AsyncIterator[bytes]):
+        builder = None
+        depth = 0
+        target = None
+        current_keys: Dict[str, str] = {}
+
+        async for prefix, event, value in ijson.parse_async(_AsyncByteReader(chunks), use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if event in ("start_map", "start_array"):
+                    depth += 1
+                elif event in ("end_map", "end_array"):
+                    depth -= 1
+                    if depth == 0:
+                        target(builder.value)
+                        builder = None
+                continue
+
+            if event == "map_key" and prefix in self._entries:
+                current_keys[prefix] = value
+                continue
+            if event in ("end_map", "end_array", "map_key"):
+                continue
+
+            handler = self._handler_for(prefix, current_keys)
+            if handler is None:
+                continue
+            if event in ("start_map", "start_array"):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                depth = 1
+                target = handler
+            else:
+                handler(value)
+
+    def _handler_for(self, prefix: str, current_keys: Dict[str, str]) -> Optional[Callable[[Any], None]]:
+        if prefix in self._items:
+            return self._items[prefix]
+        if prefix in self.values:
+            return lambda value: self.values.__setitem__(prefix, value)
+        for base, key in current_keys.items():
+            if prefix == (f"{base}.{key}" if base else key):
+                return lambda value, base=base, key=key: self._entries[base](key, value)
+        return None
+
+    def feed_object(self, data: Any):
+        """Apply the callbacks to an already decoded document"""
+        for prefix, handler in self._items.items():
+            items = _resolve(data, prefix[:-len("item")].rstrip("."))
+            for item in items if isinstance(items, list) else []:
+                handler(item)
+        for base, handler in self._entries.items():
+            entries = _resolve(data, base)
+            for key, value in entries.items() if isinstance(entries, dict) else []:
+                handler(key, value)
+        for prefix in self.values:
+            self.values[prefix] = _resolve(data, prefix)
+
+
+def _resolve(data: Any, path: str) -> Any:
+    for part in path.split(".") if path else []:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def project(data: Any, fields: Optional[dict]) -> Any:
+    """Keep only `fields` of a decoded object.
+
+    `fields` maps key -> None (keep the value as is) or a nested spec.
+    """
+    if fields is None or not isinstance(data, dict):
+        return data
+    return {key: project(data[key], spec) for key, spec in fields.items() if key in data}
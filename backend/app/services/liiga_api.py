@@ -3,6 +3,10 @@ import unicodedata
 from datetime import datetime, timedelta
 from typing import Optional, List
 
+from .http_cache import caching_transport
+from .json_stream import StreamCollector, project
+from .sync_telemetry import HTTPX_EVENT_HOOKS
+
 
 def normalize_abbrev(text: str) -> str:
     """Normalize abbreviation by removing diacritics (ä->A, ö->O, etc.)"""
@@ -13,6 +17,19 @@ def normalize_abbrev(text: str) -> str:
     return ascii_text.upper()
 
 
+_TEAM_FIELDS = {"teamId": None, "teamName": None, "goals": None, "logos": {"darkBg": None}}
+
+# Fields of a season game that the sync and schedule code read
+GAME_FIELDS = {
+    "id": None,
+    "start": None,
+    "ended": None,
+    "homeTeam": _TEAM_FIELDS,
+    "awayTeam": _TEAM_FIELDS,
+    "iceRink": {"name": None},
+}
+
+
 class LiigaApiService:
     """Finnish Liiga API Service"""
 
@@ -20,7 +37,12 @@ class LiigaApiService:
     CURRENT_SEASON = 2026  # Season 2025-26
 
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            follow_redirects=True,
+            transport=caching_transport(),
+            event_hooks=HTTPX_EVENT_HOOKS
+        )
 
     async def close(self):
         await self.client.aclose()
@@ -35,9 +57,13 @@ class LiigaApiService:
         season = season or self.CURRENT_SEASON
         url = f"{self.BASE_URL}/games?tournament={tournament}&season={season}"
 
-        response = await self.client.get(url)
-        response.raise_for_status()
-        return response.json()
+        # Decode game by game, keeping only the fields we use
+        games = []
+        collector = StreamCollector().on_item("item", lambda game: games.append(project(game, GAME_FIELDS)))
+        async with self.client.stream("GET", url) as response:
+            response.raise_for_status()
+            await collector.feed_response(response)
+        return games
 
     async def get_schedule_week(self, start_date: Optional[str] = None) -> List[dict]:
         """Get upcoming games for the next 7 days"""
@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 from ..models.database import Team, Game, DataUpdate
 from .liiga_api import LiigaApiService, LIIGA_TEAM_NAMES_RU, normalize_abbrev
 from .stats_calculator import StatsCalculator, GameResult
+from .sync_pipeline import GameSyncPipeline, GameRow
+from . import sync_telemetry
 
 
 class LiigaDataService:
@@ -56,81 +58,54 @@ class LiigaDataService:
 
         return teams
 
-    async def sync_team_games(self, db: Session, team_id: str) -> int:
-        """Sync all games for a specific Liiga team"""
-        games_data = await self.api.get_team_game_log(team_id)
-        synced_count = 0
-
-        for game_data in games_data:
-            game_id = f"liiga_{game_data.get('id')}"
-            existing = db.query(Game).filter(Game.game_id == game_id).first()
-
-            home_team_api_id = game_data.get("homeTeam", {}).get("teamId", "")
-            away_team_api_id = game_data.get("awayTeam", {}).get("teamId", "")
-
-            home_team = db.query(Team).filter(
-                Team.league == self.LEAGUE,
-                Team.team_id == home_team_api_id
-            ).first()
-            away_team = db.query(Team).filter(
-                Team.league == self.LEAGUE,
-                Team.team_id == away_team_api_id
-            ).first()
-
-            if not home_team or not away_team:
-                continue
-
-            # Parse date
-            game_date_str = game_data.get("start", "")
-            try:
-                game_date = datetime.fromisoformat(game_date_str.replace("Z", "+00:00")).replace(tzinfo=None)
-            except:
-                continue
-
-            home_score = game_data.get("homeTeam", {}).get("goals", 0) or 0
-            away_score = game_data.get("awayTeam", {}).get("goals", 0) or 0
-            is_finished = game_data.get("ended", False)
-
-            if existing:
-                existing.home_score = home_score
-                existing.away_score = away_score
-                existing.is_finished = is_finished
-            else:
-                game = Game(
-                    league=self.LEAGUE,
-                    game_id=game_id,
-                    date=game_date,
-                    home_team_id=home_team.id,
-                    away_team_id=away_team.id,
-                    home_score=home_score,
-                    away_score=away_score,
-                    is_finished=is_finished,
-                    season="20252026"
-                )
-                db.add(game)
-                synced_count += 1
-
-        db.commit()
-        return synced_count
+    async def _iter_game_pages(self):
+        """Yield the season's games in one payload (instead of once per team)"""
+        try:
+            yield await self.api.get_games()
+        except Exception as e:
+            print(f"Error fetching Liiga games: {e}")
+            sync_telemetry.record_error(str(e))
+
+    @staticmethod
+    def _parse_game_page(games: List[dict]):
+        """Keep only finished games"""
+        return (g for g in games if g.get("ended", False) == True)
+
+    def _normalize_game(self, game_data: dict) -> Optional[GameRow]:
+        """Convert Liiga game to a GameRow"""
+        game_date_str = game_data.get("start", "")
+        try:
+            game_date = datetime.fromisoformat(game_date_str.replace("Z", "+00:00")).replace(tzinfo=None)
+        except (AttributeError, ValueError):
+            return None
+
+        return GameRow(
+            game_id=f"liiga_{game_data.get('id')}",
+            date=game_date,
+            home_team_key=game_data.get("homeTeam", {}).get("teamId", ""),
+            away_team_key=game_data.get("awayTeam", {}).get("teamId", ""),
+            home_score=game_data.get("homeTeam", {}).get("goals", 0) or 0,
+            away_score=game_data.get("awayTeam", {}).get("goals", 0) or 0,
+            is_finished=game_data.get("ended", False),
+            season="20252026"
+        )
 
     async def sync_all_games(self, db: Session) -> int:
         """Sync games for all Liiga teams"""
-        teams = db.query(Team).filter(Team.league == self.LEAGUE).all()
-        total_synced = 0
-
-        for team in teams:
-            try:
-                synced = await self.sync_team_games(db, team.team_id)
-                total_synced += synced
-            except Exception as e:
-                print(f"Error syncing Liiga team {team.abbrev}: {e}")
+        pipeline = GameSyncPipeline(
+            league=self.LEAGUE,
+            pages=self._iter_game_pages(),
+            parse_page=self._parse_game_page,
+            normalize=self._normalize_game
+        )
+        stats = await pipeline.run(db)
 
         # Log update
         update = DataUpdate(update_type="liiga_games_sync")
         db.add(update)
         db.commit()
 
-        return total_synced
+        return stats.inserted
 
     def get_team_matches(
         self,
@@ -0,0 +1,82 @@
+"""
+Precomputed match lineups in Redis.
+
+The lineup precompute cron scrapes upcoming matches ahead of time and stores
+{home, away} here keyed by Flashscore event id; the lineup endpoint reads it
+before scraping on demand. An entry computed within LINEUP_KICKOFF_WINDOW
+of its match stays fresh until kickoff: no team plays twice in that window,
+so stats and statuses can't change before the match. Entries for later
+matches (a team may play in between) are fresh for LINEUP_MAX_AGE, like
+those stored without a kickoff time. Entries outlive their freshness window
+(by LINEUP_CACHE_TTL) so a stale lineup can still be served when a live
+scrape fails.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Optional
+
+
+LINEUP_MAX_AGE = int(os.getenv("LINEUP_MAX_AGE", "3600"))
+LINEUP_CACHE_TTL = int(os.getenv("LINEUP_CACHE_TTL", str(6 * 3600)))
+# Entries computed this close to kickoff stay fresh until kickoff
+LINEUP_KICKOFF_WINDOW = int(os.getenv("LINEUP_KICKOFF_WINDOW", str(12 * 3600)))
+KEY_PREFIX = "lineup:match:"
+
+_EVENT_ID_RE = re.compile(r"[?&]mid=([A-Za-z0-9]+)|/match/([A-Za-z0-9]{8})(?:/|$)")
+
+
+def match_key(match_url: str) -> str:
+    """Redis key for a match page URL (event id, or a hash for unusual URLs)"""
+    match = _EVENT_ID_RE.search(match_url)
+    if match:
+        return KEY_PREFIX + (match.group(1) or match.group(2))
+    return KEY_PREFIX + hashlib.sha1(match_url.encode("utf-8")).hexdigest()[:16]
+
+
+def load(redis, match_url: str) -> Optional[dict]:
+    """Stored lineups with an 'age' field (seconds), or None"""
+    if redis is None:
+        return None
+    try:
+        raw = redis.get(match_key(match_url))
+    except Exception as e:
+        print(f"Lineup cache read failed: {e}")
+        return None
+    if not raw:
+        return None
+    try:
+        entry = json.loads(raw)
+    except ValueError:
+        return None
+    entry["age"] = time.time() - entry.get("computed_at", 0)
+    return entry
+
+
+def is_fresh(entry: dict) -> bool:
+    """Whether a loaded entry can be served without scraping again"""
+    kickoff = entry.get("kickoff")
+    if kickoff and time.time() < kickoff and kickoff - entry.get("computed_at", 0) <= LINEUP_KICKOFF_WINDOW:
+        return True
+    return entry["age"] < LINEUP_MAX_AGE
+
+
+def store(redis, match_url: str, lineups: dict, kickoff: Optional[int] = None):
+    """Store lineups; `kickoff` (unix time of the match start) keeps them fresh until then"""
+    if redis is None:
+        return
+    now = time.time()
+    entry = {
+        "home": lineups.get("home"),
+        "away": lineups.get("away"),
+        "computed_at": now,
+        "kickoff": kickoff
+    }
+    ttl = LINEUP_CACHE_TTL + max(0, int((kickoff or 0) - now))
+    try:
+        redis.set(match_key(match_url), json.dumps(entry, ensure_ascii=False), ex=ttl)
+    except Exception as e:
+        print(f"Lineup cache write failed: {e}")
@@ -3,12 +3,20 @@ from datetime import datetime, timedelta
 from typing import Optional
 import asyncio
 
+from .http_cache import caching_transport
+from .sync_telemetry import HTTPX_EVENT_HOOKS
+
 
 class NHLApiService:
     BASE_URL = "https://api-web.nhle.com/v1"
 
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            follow_redirects=True,
+            transport=caching_transport(),
+            event_hooks=HTTPX_EVENT_HOOKS
+        )
 
     async def close(self):
         await self.client.aclose()
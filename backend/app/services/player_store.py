@@ -0,0 +1,335 @@
+"""
+Persistent Flashscore player stats (players, player_season_stats tables).
+
+Lineups used to scrape every player page on every request and throw the
+stats away. Scraped stats are now stored per player and season. A team's
+players are only scraped again once the team has finished a game since
+their last scrape (checked against the Flashscore day feeds), or after
+PLAYER_REFRESH_MAX_AGE as a catch-all for roster moves. Lineups of teams
+that have not played since are built from one indexed join.
+
+The store is an optimization: when the database is unavailable lineups are
+scraped as before.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func
+
+from ..models.database import Player, PlayerSeasonStats
+from .flashscore_feed import DayFeedCache
+from .flashscore_service import (
+    PLAYER_FETCH_CONCURRENCY, ScrapedTeam, get_team_urls, lineup_client, scrape_team_players, team_lineup
+)
+from .team_aliases import TeamAliasIndex
+
+
+# Stored players older than this are scraped again even if their team has not played
+PLAYER_REFRESH_MAX_AGE = int(os.getenv("PLAYER_REFRESH_MAX_AGE", str(7 * 86400)))
+# Days of day feeds searched for a team's last finished game
+LAST_GAME_DAYS = int(os.getenv("PLAYER_LAST_GAME_DAYS", "7"))
+# Game start to final stats on player pages
+GAME_LENGTH = 3 * 3600
+
+# team_url -> scraped team page and players
+TeamScraper = Callable[[str], Awaitable[ScrapedTeam]]
+
+_day_feeds = DayFeedCache()
+
+# One store call at a time per session (both teams of a match may share one)
+_session_locks = weakref.WeakKeyDictionary()
+
+
+def current_season() -> str:
+    """Flashscore season name of today ("2024/2025"); seasons start in July"""
+    today = datetime.now()
+    start = today.year if today.month >= 7 else today.year - 1
+    return f"{start}/{start + 1}"
+
+
+class LastGames:
+    """Start time of each team's latest finished game in the day feeds"""
+
+    def __init__(self, latest: Dict[str, int]):
+        self._latest = latest
+        self._index = TeamAliasIndex.from_names(latest)
+
+    def get(self, team_name: str) -> Optional[int]:
+        name = self._index.resolve(team_name)
+        return self._latest.get(name) if name else None
+
+
+async def load_last_games(client, feeds: Optional[DayFeedCache] = None, days: int = LAST_GAME_DAYS) -> Optional[LastGames]:
+    """Latest finished games of the last `days` days, or None when the feeds are unavailable"""
+    try:
+        indexes = await (feeds or _day_feeds).get_indexes(client, range(-(days - 1), 1))
+    except Exception as e:
+        print(f"Day feeds unavailable for player refresh: {e}")
+        return None
+
+    latest: Dict[str, int] = {}
+    for index in indexes:
+        for matches in index.values():
+            for match in matches:
+                if match.status != '3':  # Finished
+                    continue
+                try:
+                    started = int(match.timestamp)
+                except ValueError:
+                    continue
+                for name in (match.home, match.away):
+                    if started > latest.get(name, 0):
+                        latest[name] = started
+    return LastGames(latest)
+
+
+async def run_db(db, func: Callable, *args):
+    """Run a blocking call on session `db` in a worker thread, so queries
+    don't stall the event loop scraping and streaming other teams"""
+    lock = _session_locks.get(db)
+    if lock is None:
+        lock = _session_locks[db] = asyncio.Lock()
+    async with lock:
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def needs_refresh(scraped_at: datetime, team_name: str, last_games: Optional[LastGames]) -> bool:
+    """Whether a team's stored players may be out of date"""
+    scraped = scraped_at.replace(tzinfo=timezone.utc).timestamp()
+    if time.time() - scraped >= PLAYER_REFRESH_MAX_AGE:
+        return True
+    if last_games is None:
+        return True  # Can't tell; scrape
+    last_start = last_games.get(team_name)
+    # A game in progress at scrape time also counts: its stats were not final yet
+    return last_start is not None and last_start + GAME_LENGTH > scraped
+
+
+def load_team_lineup(db, team_url: str) -> Optional[Tuple[dict, datetime]]:
+    """Stored lineup of a team page and the time the team was last scraped"""
+    rows = (
+        db.query(Player, PlayerSeasonStats)
+        .outerjoin(PlayerSeasonStats, and_(
+            PlayerSeasonStats.player_id == Player.id,
+            PlayerSeasonStats.team_name == Player.team_name,
+            PlayerSeasonStats.season == current_season()
+        ))
+        .filter(Player.team_url == team_url)
+        .all()
+    )
+    if not rows:
+        return None
+
+    players = []
+    for player, stats in rows:
+        players.append({
+            'name': player.name,
+            'status': player.status or '',
+            'matches': stats.matches if stats else 0,
+            'goals': stats.goals if stats else 0,
+            'assists': stats.assists if stats else 0,
+            'points': stats.points if stats else 0,
+            'efficiency': stats.efficiency if stats else 0.0,
+            'season': stats.season if stats else '',
+            'url': player.url
+        })
+    # Players whose page failed keep their older stats and scrape time
+    scraped_at = max(player.scraped_at for player, _ in rows)
+    return team_lineup(rows[0][0].team_name, players), scraped_at
+
+
+def save_team_players(db, team_url: str, scraped: ScrapedTeam):
+    """Upsert a scraped team page: its players, their current season stats, and roster departures"""
+    now = datetime.utcnow()
+    team_name = scraped.team
+    players = [data for data in scraped.players if data.get('url')]
+    urls = [data['url'] for data in players]
+
+    stored = {
+        player.url: player
+        for player in db.query(Player).filter(Player.url.in_(urls)).all()
+    } if urls else {}
+    for data in players:
+        player = stored.get(data['url'])
+        if player is None:
+            player = Player(url=data['url'])
+            db.add(player)
+            stored[data['url']] = player
+        player.name = data['name']
+        player.team_name = team_name
+        player.team_url = team_url
+        player.status = data.get('status', '')
+        player.scraped_at = now
+    db.flush()
+
+    # Season stats: only players with a current season row on their page
+    with_season = [data for data in players if data.get('season')]
+    player_ids = [stored[data['url']].id for data in with_season]
+    season_rows = {
+        (row.player_id, row.season): row
+        for row in db.query(PlayerSeasonStats).filter(
+            PlayerSeasonStats.player_id.in_(player_ids),
+            PlayerSeasonStats.team_name == team_name
+        ).all()
+    } if player_ids else {}
+    for data in with_season:
+        player_id = stored[data['url']].id
+        row = season_rows.get((player_id, data['season']))
+        if row is None:
+            row = PlayerSeasonStats(player_id=player_id, team_name=team_name, season=data['season'])
+            db.add(row)
+            season_rows[(player_id, data['season'])] = row
+        row.matches = data.get('matches', 0)
+        row.goals = data.get('goals', 0)
+        row.assists = data.get('assists', 0)
+        row.points = data.get('points', 0)
+        row.efficiency = data.get('efficiency', 0.0)
+        row.updated_at = now
+
+    # Players no longer listed on the team page left the roster. Listed players
+    # whose own page failed keep their row and team; an empty page is a failed scrape.
+    if scraped.listed:
+        db.query(Player).filter(
+            Player.team_url == team_url,
+            Player.url.notin_(scraped.listed)
+        ).update({Player.team_url: None}, synchronize_session=False)
+
+    db.commit()
+
+
+async def stored_team_lineup(
+    db,
+    team_url: str,
+    scrape: TeamScraper,
+    last_games: Optional[LastGames] = None
+) -> dict:
+    """
+    Team lineup from the store, scraping (and storing) the team page only
+    when the stored players may be out of date.
+
+    Returns:
+        Lineup dict as from flashscore_service.get_team_lineup, plus
+        'refreshed_at' (ISO time the players were scraped)
+    """
+    stored = None
+    try:
+        stored = await run_db(db, load_team_lineup, db, team_url)
+    except Exception as e:
+        await run_db(db, db.rollback)
+        print(f"Player store read failed: {e}")
+
+    if stored:
+        lineup, scraped_at = stored
+        if not needs_refresh(scraped_at, lineup['team'], last_games):
+            return {**lineup, 'refreshed_at': scraped_at.isoformat()}
+
+    try:
+        scraped = await scrape(team_url)
+    except Exception as e:
+        if stored:
+            print(f"Team scrape failed, serving stored players: {e}")
+            return {**stored[0], 'refreshed_at': stored[1].isoformat()}
+        raise
+
+    try:
+        await run_db(db, save_team_players, db, team_url, scraped)
+    except Exception as e:
+        await run_db(db, db.rollback)
+        print(f"Player store write failed: {e}")
+    return {**team_lineup(scraped.team, scraped.players), 'refreshed_at': datetime.utcnow().isoformat()}
+
+
+async def get_team_lineup(db, team_url: str, feeds: Optional[DayFeedCache] = None) -> dict:
+    """Lineup of one team page through the store"""
+    async with lineup_client() as client:
+        async def scrape(url: str):
+            return await scrape_team_players(url, client)
+
+        last_games = await load_last_games(client, feeds)
+        return await stored_team_lineup(db, team_url, scrape, last_games)
+
+
+async def get_match_lineups(db, match_url: str, feeds: Optional[DayFeedCache] = None) -> dict:
+    """
+    Lineups for both teams of a match through the store.
+
+    Returns:
+        Dict with home and away team lineups
+    """
+    result = {
+        'home': None,
+        'away': None
+    }
+
+    semaphore = asyncio.Semaphore(PLAYER_FETCH_CONCURRENCY)
+    async with lineup_client() as client:
+        async def scrape(team_url: str):
+            return await scrape_team_players(team_url, client, semaphore)
+
+        last_games = await load_last_games(client, feeds)
+        team_urls = await get_team_urls(match_url, client)
+        sides = [side for side in ('home', 'away') if team_urls.get(side)]
+        lineups = await asyncio.gather(*(
+            stored_team_lineup(db, team_urls[side], scrape, last_games) for side in sides
+        ))
+
+    result.update(zip(sides, lineups))
+    return result
+
+
+async def refresh_players(db, budget: float, scrape: Optional[TeamScraper] = None, feeds: Optional[DayFeedCache] = None) -> dict:
+    """
+    Re-scrape stored teams whose players may be out of date, least recently
+    scraped first, until `budget` seconds are spent. Teams that have not
+    played since their last scrape are skipped without a request.
+    """
+    started = time.monotonic()
+    result = {"refreshed": [], "current": 0, "remaining": 0, "errors": []}
+
+    teams = (
+        db.query(Player.team_url, func.max(Player.team_name), func.max(Player.scraped_at))
+        .filter(Player.team_url.isnot(None))
+        .group_by(Player.team_url)
+        .order_by(func.max(Player.scraped_at))
+        .all()
+    )
+
+    semaphore = asyncio.Semaphore(PLAYER_FETCH_CONCURRENCY)
+    async with lineup_client() as client:
+        if scrape is None:
+            async def scrape(team_url: str):
+                return await scrape_team_players(team_url, client, semaphore)
+
+        last_games = await load_last_games(client, feeds)
+        if last_games is None:
+            result["errors"].append("Day feeds unavailable")
+            return result
+
+        for position, (team_url, team_name, scraped_at) in enumerate(teams):
+            if not needs_refresh(scraped_at, team_name, last_games):
+                result["current"] += 1
+                continue
+
+            remaining = budget - (time.monotonic() - started)
+            if remaining <= 0:
+                result["remaining"] = len(teams) - position
+                break
+            try:
+                scraped = await asyncio.wait_for(scrape(team_url), timeout=remaining)
+                await run_db(db, save_team_players, db, team_url, scraped)
+                team_name = scraped.team
+            except asyncio.TimeoutError:
+                result["remaining"] = len(teams) - position
+                break
+            except Exception as e:
+                await run_db(db, db.rollback)
+                result["errors"].append(f"{team_name}: {e}")
+                continue
+            result["refreshed"].append(team_name)
+
+    return result
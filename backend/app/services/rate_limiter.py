@@ -0,0 +1,226 @@
+"""
+Adaptive token-bucket rate limiter with daily quota accounting and priority lanes.
+
+The bucket starts from configured limits and is corrected from the quota
+headers the upstream returns, so we only wait when the quota actually
+requires it. Waiting requests are served strictly by priority, then FIFO.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Mapping, Optional, Tuple
+
+
+# Priority lanes (lower value goes first)
+PRIORITY_SCHEDULE = 0   # Upcoming games / live refreshes
+PRIORITY_DEFAULT = 1    # Teams, metadata
+PRIORITY_BACKFILL = 2   # Full season history
+
+
+class QuotaExhaustedError(Exception):
+    """Raised when the daily quota left is reserved for higher priority requests"""
+
+
+class TokenBucket:
+    """Classic token bucket: `capacity` tokens, refilled evenly over `period` seconds"""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until_available(self) -> float:
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self._refill()
+        self.tokens -= 1
+
+    def sync(self, capacity: Optional[int] = None, remaining: Optional[int] = None,
+             reset_in: Optional[float] = None):
+        """Correct the bucket from server-reported limits"""
+        self._refill()
+        if capacity:
+            self.capacity = capacity
+            self.tokens = min(self.tokens, capacity)
+        if remaining is not None:
+            # The server is the source of truth (the key may be shared with other
+            # consumers), but never hand out more than our own bucket allows
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining <= 0 and reset_in and reset_in > 0:
+                # Next token becomes available when the window resets
+                self.tokens = min(self.tokens, 1 - reset_in * self.rate)
+
+    def drain(self, wait_seconds: Optional[float] = None):
+        """Empty the bucket after a rate-limit response"""
+        self._refill()
+        wait_seconds = wait_seconds if wait_seconds is not None else 1 / self.rate
+        self.tokens = min(self.tokens, 1 - wait_seconds * self.rate)
+
+
+class AdaptiveRateLimiter:
+    """Per-window token bucket plus daily quota, shared by all callers of one API key"""
+
+    def __init__(
+        self,
+        name: str,
+        per_window: int,
+        window_seconds: float = 60.0,
+        daily_limit: Optional[int] = None,
+        daily_reserve: int = 0
+    ):
+        self.name = name
+        self.bucket = TokenBucket(per_window, window_seconds)
+        self.daily_limit = daily_limit
+        self.daily_used = 0
+        self.daily_remaining: Optional[int] = daily_limit
+        self.daily_reserve = daily_reserve  # Kept back from backfill requests
+        self._day_reset_at = self._next_day_reset()
+        self._waiters: List[Tuple[int, int]] = []
+        self._counter = itertools.count()
+        self._condition: Optional[asyncio.Condition] = None
+
+    @staticmethod
+    def _next_day_reset() -> datetime:
+        # Daily quotas reset at midnight UTC
+        now = datetime.now(timezone.utc)
+        return (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def _roll_day(self):
+        if datetime.now(timezone.utc) >= self._day_reset_at:
+            self._day_reset_at = self._next_day_reset()
+            self.daily_used = 0
+            self.daily_remaining = self.daily_limit
+
+    def _check_daily(self, priority: int):
+        self._roll_day()
+        if self.daily_remaining is None:
+            return
+        if self.daily_remaining <= 0:
+            raise QuotaExhaustedError(f"{self.name}: daily quota exhausted until {self._day_reset_at.isoformat()}")
+        if priority >= PRIORITY_BACKFILL and self.daily_remaining <= self.daily_reserve:
+            raise QuotaExhaustedError(
+                f"{self.name}: {self.daily_remaining} requests left today, reserved for schedule refreshes"
+            )
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self, priority: int = PRIORITY_DEFAULT):
+        """Wait for a token. Higher priority waiters are always served first."""
+        self._check_daily(priority)
+        condition = self._get_condition()
+        entry = (priority, next(self._counter))
+
+        async with condition:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    timeout = None
+                    if self._waiters[0] == entry:
+                        timeout = self.bucket.time_until_available()
+                        if timeout <= 0:
+                            break
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    # Quota may have run out while waiting
+                    self._check_daily(priority)
+            except BaseException:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                condition.notify_all()
+                raise
+
+            heapq.heappop(self._waiters)
+            self.bucket.consume()
+            self.daily_used += 1
+            if self.daily_remaining is not None:
+                self.daily_remaining -= 1
+            condition.notify_all()
+
+    def update_from_headers(
+        self,
+        limit: Optional[str] = None,
+        remaining: Optional[str] = None,
+        reset: Optional[str] = None,
+        daily_limit: Optional[str] = None,
+        daily_remaining: Optional[str] = None
+    ):
+        """Sync state with quota headers (values as received, may be missing)"""
+        self._roll_day()
+        reset_in = _to_float(reset)
+        if reset_in is not None and reset_in > 1e9:
+            # Epoch timestamp rather than seconds
+            reset_in = reset_in - time.time()
+        self.bucket.sync(
+            capacity=_to_int(limit),
+            remaining=_to_int(remaining),
+            reset_in=reset_in
+        )
+        if _to_int(daily_limit):
+            self.daily_limit = _to_int(daily_limit)
+        if _to_int(daily_remaining) is not None:
+            self.daily_remaining = _to_int(daily_remaining)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        """Back off after the server rejected a request for rate limiting"""
+        self.bucket.drain(retry_after if retry_after is not None else self.bucket.period)
+
+    def get_status(self) -> dict:
+        self._roll_day()
+        return {
+            "name": self.name,
+            "tokens": round(max(self.bucket.tokens, 0), 2),
+            "per_window": self.bucket.capacity,
+            "window_seconds": self.bucket.period,
+            "daily_limit": self.daily_limit,
+            "daily_used": self.daily_used,
+            "daily_remaining": self.daily_remaining,
+            "daily_reset_at": self._day_reset_at.isoformat(),
+            "waiting": len(self._waiters)
+        }
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def header_values(headers: Mapping[str, str]) -> dict:
+    """Extract API-Sports style quota headers (case-insensitive mapping)"""
+    return {
+        "limit": headers.get("x-ratelimit-limit"),
+        "remaining": headers.get("x-ratelimit-remaining"),
+        "reset": headers.get("x-ratelimit-reset"),
+        "daily_limit": headers.get("x-ratelimit-requests-limit"),
+        "daily_remaining": headers.get("x-ratelimit-requests-remaining"),
+    }
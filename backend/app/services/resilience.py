@@ -0,0 +1,259 @@
+"""
+Resilience layer for upstream HTTP calls, as an httpx transport.
+
+- Per-host circuit breakers: after repeated failures a host is short-circuited
+  for a while (CircuitOpenError, raised immediately) instead of every request
+  waiting for its full timeout. One probe request is let through to close it.
+- Retries for idempotent requests with jittered exponential backoff, capped
+  by a per-host retry budget so retries cannot multiply load on a struggling host.
+- Hedged GETs: if a response has not started within `hedge_after` seconds,
+  a second identical request is sent and whichever answers first wins.
+
+Breakers and budgets are process-wide, shared by every client using the layer.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import httpx
+
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without sending when the host's circuit breaker is open"""
+
+
+@dataclass
+class HostPolicy:
+    attempt_timeout: Optional[float] = None  # Per attempt, to response headers; None = client timeout
+    max_retries: int = 2
+    backoff_base: float = 0.3
+    backoff_cap: float = 5.0
+    hedge_after: Optional[float] = None  # Seconds before a hedged GET is sent; None disables
+    failure_threshold: int = 5  # Consecutive failures that open the circuit
+    reset_timeout: float = 30.0  # Seconds the circuit stays open before a probe
+
+
+DEFAULT_POLICY = HostPolicy()
+
+# Hosts behind the odds and lineup endpoints: fail fast, hedge slow responses
+HOST_POLICIES: Dict[str, HostPolicy] = {
+    "2.flashscore.ninja": HostPolicy(attempt_timeout=8.0, max_retries=1, hedge_after=1.5),
+    "www.flashscore.com": HostPolicy(attempt_timeout=10.0, max_retries=1, hedge_after=2.5),
+    "sp.btspcloud.xyz": HostPolicy(attempt_timeout=8.0, max_retries=1, hedge_after=2.0),
+}
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """closed -> open after `failure_threshold` consecutive failures,
+    half-open (single probe) after `reset_timeout`, closed again on success"""
+
+    def __init__(self, host: str, failure_threshold: int, reset_timeout: float):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probe_in_flight or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self._probe_in_flight:
+                    print(f"Circuit opened for {self.host} after {self.failures} failures")
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """Attempt abandoned without an outcome"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def get_status(self) -> dict:
+        return {"host": self.host, "state": self.state, "failures": self.failures}
+
+
+class RetryBudget:
+    """Each request earns `ratio` retry tokens (up to `max_tokens`); each retry
+    or hedge spends one. Keeps retries to ~ratio of traffic when a host degrades."""
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+_registry_lock = threading.Lock()
+_breakers: Dict[str, CircuitBreaker] = {}
+_budgets: Dict[str, RetryBudget] = {}
+
+
+def get_policy(host: str) -> HostPolicy:
+    return HOST_POLICIES.get(host, DEFAULT_POLICY)
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    with _registry_lock:
+        if host not in _breakers:
+            policy = get_policy(host)
+            _breakers[host] = CircuitBreaker(host, policy.failure_threshold, policy.reset_timeout)
+        return _breakers[host]
+
+
+def get_budget(host: str) -> RetryBudget:
+    with _registry_lock:
+        if host not in _budgets:
+            _budgets[host] = RetryBudget()
+        return _budgets[host]
+
+
+def breaker_status() -> list:
+    """State of every host seen so far"""
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return [breaker.get_status() for breaker in breakers]
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport with circuit breaking, budgeted retries and hedging"""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def _attempt(self, request: httpx.Request, policy: HostPolicy) -> httpx.Response:
+        breaker = get_breaker(request.url.host)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {request.url.host}", request=request)
+
+        try:
+            if policy.attempt_timeout:
+                try:
+                    response = await asyncio.wait_for(
+                        self.transport.handle_async_request(request), policy.attempt_timeout
+                    )
+                except asyncio.TimeoutError:
+                    raise httpx.ReadTimeout(
+                        f"No response from {request.url.host} within {policy.attempt_timeout}s",
+                        request=request
+                    )
+            else:
+                response = await self.transport.handle_async_request(request)
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            # Lost a hedge race; says nothing about host health
+            breaker.release_probe()
+            raise
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    async def _hedged(self, request: httpx.Request, policy: HostPolicy) -> httpx.Response:
+        first = asyncio.create_task(self._attempt(request, policy))
+        done, _ = await asyncio.wait({first}, timeout=policy.hedge_after)
+        if done or not get_budget(request.url.host).try_withdraw():
+            return await first
+
+        second = asyncio.create_task(self._attempt(request, policy))
+        pending = {first, second}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, httpx.Response):
+                    await result.aclose()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        policy = get_policy(host)
+        budget = get_budget(host)
+        budget.deposit()
+        idempotent = request.method in IDEMPOTENT_METHODS
+        hedge = idempotent and request.method == "GET" and policy.hedge_after is not None
+
+        attempt = 0
+        while True:
+            try:
+                if hedge:
+                    response = await self._hedged(request, policy)
+                else:
+                    response = await self._attempt(request, policy)
+            except CircuitOpenError:
+                raise
+            except httpx.TransportError:
+                if not idempotent or attempt >= policy.max_retries or not budget.try_withdraw():
+                    raise
+            else:
+                if (response.status_code not in RETRY_STATUSES or not idempotent
+                        or attempt >= policy.max_retries or not budget.try_withdraw()):
+                    return response
+                await response.aclose()
+
+            await asyncio.sleep(backoff_delay(attempt, policy.backoff_base, policy.backoff_cap))
+            attempt += 1
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,255 @@
+"""
+Job scheduler for background sync tasks.
+Supports cron-style recurring jobs (with jitter and missed-run catch-up)
+and one-shot jobs scheduled for a specific moment (e.g. after a game ends).
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+
+class CronExpression:
+    """Minimal 5-field cron expression: minute hour day-of-month month day-of-week.
+
+    Supports '*', numbers, ranges ('1-5'), lists ('1,3,5') and steps ('*/15', '0-30/10').
+    Day-of-week: 0 or 7 = Sunday. Times are evaluated in local time.
+    """
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+    SEARCH_DAYS = 366 * 4  # Enough to find any valid date (e.g. Feb 29)
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Invalid cron expression '{expression}': expected 5 fields")
+
+        self.minutes, self.hours, self.days, self.months, weekdays = [
+            self._parse_field(part, low, high)
+            for part, (low, high) in zip(parts, self.FIELD_RANGES)
+        ]
+        # Normalize Sunday (7 -> 0)
+        self.weekdays = {0 if d == 7 else d for d in weekdays}
+        self._days_restricted = parts[2] != "*"
+        self._weekdays_restricted = parts[4] != "*"
+        self._sorted_times = sorted((h, m) for h in self.hours for m in self.minutes)
+
+    @staticmethod
+    def _parse_field(field_expr: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for item in field_expr.split(","):
+            step = 1
+            if "/" in item:
+                item, step_str = item.split("/", 1)
+                step = int(step_str)
+                if step <= 0:
+                    raise ValueError(f"Invalid cron step: {step_str}")
+
+            if item == "*":
+                start, end = low, high
+            elif "-" in item:
+                start_str, end_str = item.split("-", 1)
+                start, end = int(start_str), int(end_str)
+            else:
+                start = int(item)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron value out of range: {field_expr}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _matches_day(self, day: datetime) -> bool:
+        if day.month not in self.months:
+            return False
+        cron_weekday = (day.weekday() + 1) % 7  # Python: Monday=0, cron: Sunday=0
+        day_ok = day.day in self.days
+        weekday_ok = cron_weekday in self.weekdays
+        # Standard cron semantics: if both fields are restricted, either may match
+        if self._days_restricted and self._weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """Get first fire time strictly after the given moment"""
+        after = after.replace(second=0, microsecond=0)
+        day = after.replace(hour=0, minute=0)
+        for _ in range(self.SEARCH_DAYS):
+            if self._matches_day(day):
+                for hour, minute in self._sorted_times:
+                    candidate = day.replace(hour=hour, minute=minute)
+                    if candidate > after:
+                        return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression '{self.expression}' never fires")
+
+    def prev_before(self, before: datetime) -> datetime:
+        """Get last fire time at or before the given moment"""
+        before = before.replace(second=0, microsecond=0)
+        day = before.replace(hour=0, minute=0)
+        for _ in range(self.SEARCH_DAYS):
+            if self._matches_day(day):
+                for hour, minute in reversed(self._sorted_times):
+                    candidate = day.replace(hour=hour, minute=minute)
+                    if candidate <= before:
+                        return candidate
+            day -= timedelta(days=1)
+        raise ValueError(f"Cron expression '{self.expression}' never fires")
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable[[], Awaitable]
+    next_run: datetime
+    cron: Optional[CronExpression] = None  # None = one-shot job
+    jitter: float = 0.0  # Max random delay in seconds added to each run
+    last_run: Optional[datetime] = None
+    running: bool = field(default=False, compare=False)
+
+
+class JobScheduler:
+    """Asyncio scheduler running cron and one-shot jobs"""
+
+    # Upper bound for a single sleep so clock changes are picked up
+    MAX_SLEEP_SECONDS = 300
+
+    def __init__(self):
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running_tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def _with_jitter(moment: datetime, jitter: float) -> datetime:
+        if jitter <= 0:
+            return moment
+        return moment + timedelta(seconds=random.uniform(0, jitter))
+
+    def _notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def add_cron_job(
+        self,
+        name: str,
+        expression: str,
+        func: Callable[[], Awaitable],
+        jitter: float = 0.0,
+        last_run: Optional[datetime] = None
+    ) -> ScheduledJob:
+        """Register a recurring job.
+
+        Args:
+            expression: 5-field cron expression in local time
+            jitter: Max random delay (seconds) added to every run
+            last_run: When the job last ran. If a scheduled run was missed since then,
+                the job runs immediately (catch-up) instead of waiting for the next slot.
+        """
+        cron = CronExpression(expression)
+        now = datetime.now()
+
+        next_run = self._with_jitter(cron.next_after(now), jitter)
+        if last_run is not None and cron.prev_before(now) > last_run:
+            print(f"[{now}] Job {name} missed a run since {last_run}, catching up")
+            next_run = now
+
+        job = ScheduledJob(name=name, func=func, next_run=next_run, cron=cron,
+                           jitter=jitter, last_run=last_run)
+        self._jobs[name] = job
+        self._notify()
+        return job
+
+    def add_date_job(self, name: str, run_at: datetime, func: Callable[[], Awaitable]) -> ScheduledJob:
+        """Register a one-shot job. Re-adding a job with the same name reschedules it."""
+        job = ScheduledJob(name=name, func=func, next_run=run_at)
+        self._jobs[name] = job
+        self._notify()
+        return job
+
+    def remove_job(self, name: str):
+        """Remove a job if registered"""
+        self._jobs.pop(name, None)
+
+    def has_job(self, name: str) -> bool:
+        return name in self._jobs
+
+    def get_jobs(self) -> List[ScheduledJob]:
+        """Get all registered jobs ordered by next run"""
+        return sorted(self._jobs.values(), key=lambda j: j.next_run)
+
+    async def _run_job(self, job: ScheduledJob):
+        job.running = True
+        try:
+            print(f"[{datetime.now()}] Running job {job.name}")
+            await job.func()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[{datetime.now()}] Job {job.name} failed: {e}")
+        finally:
+            job.running = False
+
+    def _dispatch_due_jobs(self, now: datetime):
+        for job in list(self._jobs.values()):
+            if job.next_run > now:
+                continue
+
+            if job.cron is None:
+                # One-shot job: run once and forget
+                self._jobs.pop(job.name, None)
+            else:
+                # Missed runs are coalesced into a single catch-up run
+                job.next_run = self._with_jitter(job.cron.next_after(now), job.jitter)
+
+            if job.running:
+                print(f"[{now}] Job {job.name} still running, skipping this run")
+                continue
+
+            job.last_run = now
+            task = asyncio.create_task(self._run_job(job))
+            self._running_tasks.add(task)
+            task.add_done_callback(self._running_tasks.discard)
+
+    async def _loop(self):
+        while True:
+            try:
+                self._wakeup.clear()
+                now = datetime.now()
+                self._dispatch_due_jobs(now)
+
+                upcoming = [job.next_run for job in self._jobs.values()]
+                wait_seconds = self.MAX_SLEEP_SECONDS
+                if upcoming:
+                    wait_seconds = min(wait_seconds, max((min(upcoming) - now).total_seconds(), 0))
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"Scheduler error: {e}")
+                await asyncio.sleep(60)
+
+    def start(self):
+        """Start the scheduler loop in the running event loop"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._loop())
+
+    def stop(self):
+        """Stop the scheduler loop and cancel running jobs"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+        for task in list(self._running_tasks):
+            task.cancel()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
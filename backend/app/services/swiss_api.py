@@ -2,9 +2,16 @@
 Swiss National League (SIHF) API Service.
 Uses official data.sihf.ch API.
 """
+import json
 import httpx
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Tuple
+
+from .cpu_pool import run_cpu
+from .http_replay import upstream_transport
+from .resilience import ResilientTransport
+from .sync_telemetry import HTTPX_EVENT_HOOKS
+from .team_aliases import TeamAliasIndex
 
 
 # Known Swiss National League teams (2025-26 season)
@@ -16,21 +23,80 @@ NL_TEAMS = {
     "EHC Biel-Bienne", "HC Davos", "HC Ambri-Piotta",
     "SCL Tigers", "HC Ajoie"
 }
+NL_TEAM_INDEX = TeamAliasIndex.from_names(NL_TEAMS)
 
 
 def is_nl_team(team_name: str) -> bool:
     """Check if team is in National League"""
-    if not team_name:
-        return False
-    # Direct match
-    if team_name in NL_TEAMS:
-        return True
-    # Partial match (for slight name variations)
-    name_lower = team_name.lower()
-    for nl_team in NL_TEAMS:
-        if nl_team.lower() in name_lower or name_lower in nl_team.lower():
-            return True
-    return False
+    return bool(team_name) and team_name in NL_TEAM_INDEX
+
+
+def parse_results_data(data: dict) -> List[dict]:
+    """Parse results data from SIHF response format"""
+    rows = data.get("data", [])
+    matches = []
+
+    for row in rows:
+        if not isinstance(row, list) or len(row) < 9:
+            continue
+
+        try:
+            # Parse row based on column structure:
+            # [0]=day, [1]=date, [2]=time, [3]=home_team, [4]=away_team,
+            # [5]=score, [6]=periods, [7]=OT/SO, [8]=status, [9]=details
+            date_str = row[1] if isinstance(row[1], str) else ""
+            time_str = row[2] if isinstance(row[2], str) else ""
+
+            home_team = row[3] if isinstance(row[3], dict) else {}
+            away_team = row[4] if isinstance(row[4], dict) else {}
+            score = row[5] if isinstance(row[5], dict) else {}
+            periods = row[6] if isinstance(row[6], dict) else {}
+            ot_so = row[7] if isinstance(row[7], str) else ""
+            status = row[8] if isinstance(row[8], dict) else {}
+            details = row[9] if len(row) > 9 and isinstance(row[9], dict) else {}
+
+            # Check if game is finished (status.id == 12 means "Ende" = finished)
+            is_finished = status.get("id") == 12 or status.get("percent", 0) == 100
+
+            match = {
+                "id": details.get("gameId", ""),
+                "date": date_str,
+                "time": time_str,
+                "start_date": f"{date_str} {time_str}" if date_str and time_str else "",
+                "home": {
+                    "id": str(home_team.get("id", "")),
+                    "name": home_team.get("name", ""),
+                    "abbrev": home_team.get("acronym", "")
+                },
+                "away": {
+                    "id": str(away_team.get("id", "")),
+                    "name": away_team.get("name", ""),
+                    "abbrev": away_team.get("acronym", "")
+                },
+                "home_score": int(score.get("homeTeam", 0)) if score.get("homeTeam") else None,
+                "away_score": int(score.get("awayTeam", 0)) if score.get("awayTeam") else None,
+                "periods_home": periods.get("homeTeam", []),
+                "periods_away": periods.get("awayTeam", []),
+                "overtime": ot_so,
+                "is_finished": is_finished,
+                "status": status
+            }
+            matches.append(match)
+
+        except (IndexError, ValueError, TypeError):
+            continue
+
+    return matches
+
+
+def parse_results_page(content: bytes) -> Tuple[int, List[dict]]:
+    """Decode and parse one SIHF results page (runs in the CPU pool)
+
+    Returns:
+        Total page count and parsed matches
+    """
+    data = json.loads(content)
+    return data.get("pages", 1), parse_results_data(data)
 
 
 class SwissApiService:
@@ -40,7 +106,12 @@ class SwissApiService:
     LEAGUE_ID = "1"  # National League
 
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=60.0, follow_redirects=True)
+        self.client = httpx.AsyncClient(
+            timeout=60.0,
+            follow_redirects=True,
+            transport=ResilientTransport(upstream_transport()),
+            event_hooks=HTTPX_EVENT_HOOKS
+        )
         self._teams_cache = None
         self._matches_cache = None
 
@@ -54,30 +125,34 @@ class SwissApiService:
         response.raise_for_status()
         return response.json()
 
-    async def get_all_matches(self) -> List[dict]:
-        """Get all National League matches for the season (paginated)"""
-        if self._matches_cache:
-            return self._matches_cache
-
-        all_matches = []
-        page = 1
-
-        # Get first page to know total pages
-        data = await self.get_all_results(page)
-        total_pages = data.get("pages", 1)
+    async def _fetch_results_page(self, page: int) -> Tuple[int, List[dict]]:
+        """Download a results page and parse it off the event loop"""
+        url = f"{self.BASE_URL}/cache600?alias=results&searchQuery={self.LEAGUE_ID}//&page={page}"
+        response = await self.client.get(url)
+        response.raise_for_status()
+        return await run_cpu(parse_results_page, response.content)
 
-        # Parse first page
-        matches = self._parse_results_data(data)
-        all_matches.extend(matches)
+    async def iter_results_pages(self) -> AsyncIterator[List[dict]]:
+        """Yield parsed matches page by page (failed pages after the first are skipped)"""
+        # First page tells total pages
+        total_pages, matches = await self._fetch_results_page(1)
+        yield matches
 
-        # Get remaining pages
         for page in range(2, total_pages + 1):
             try:
-                data = await self.get_all_results(page)
-                matches = self._parse_results_data(data)
-                all_matches.extend(matches)
+                _, matches = await self._fetch_results_page(page)
             except Exception:
                 continue
+            yield matches
+
+    async def get_all_matches(self) -> List[dict]:
+        """Get all National League matches for the season (paginated)"""
+        if self._matches_cache:
+            return self._matches_cache
+
+        all_matches = []
+        async for matches in self.iter_results_pages():
+            all_matches.extend(matches)
 
         # Filter for National League matches only
         nl_matches = [
@@ -89,63 +164,6 @@ class SwissApiService:
         self._matches_cache = nl_matches
         return nl_matches
 
-    def _parse_results_data(self, data: dict) -> List[dict]:
-        """Parse results data from SIHF response format"""
-        rows = data.get("data", [])
-        matches = []
-
-        for row in rows:
-            if not isinstance(row, list) or len(row) < 9:
-                continue
-
-            try:
-                # Parse row based on column structure:
-                # [0]=day, [1]=date, [2]=time, [3]=home_team, [4]=away_team,
-                # [5]=score, [6]=periods, [7]=OT/SO, [8]=status, [9]=details
-                date_str = row[1] if isinstance(row[1], str) else ""
-                time_str = row[2] if isinstance(row[2], str) else ""
-
-                home_team = row[3] if isinstance(row[3], dict) else {}
-                away_team = row[4] if isinstance(row[4], dict) else {}
-                score = row[5] if isinstance(row[5], dict) else {}
-                periods = row[6] if isinstance(row[6], dict) else {}
-                ot_so = row[7] if isinstance(row[7], str) else ""
-                status = row[8] if isinstance(row[8], dict) else {}
-                details = row[9] if len(row) > 9 and isinstance(row[9], dict) else {}
-
-                # Check if game is finished (status.id == 12 means "Ende" = finished)
-                is_finished = status.get("id") == 12 or status.get("percent", 0) == 100
-
-                match = {
-                    "id": details.get("gameId", ""),
-                    "date": date_str,
-                    "time": time_str,
-                    "start_date": f"{date_str} {time_str}" if date_str and time_str else "",
-                    "home": {
-                        "id": str(home_team.get("id", "")),
-                        "name": home_team.get("name", ""),
-                        "abbrev": home_team.get("acronym", "")
-                    },
-                    "away": {
-                        "id": str(away_team.get("id", "")),
-                        "name": away_team.get("name", ""),
-                        "abbrev": away_team.get("acronym", "")
-                    },
-                    "home_score": int(score.get("homeTeam", 0)) if score.get("homeTeam") else None,
-                    "away_score": int(score.get("awayTeam", 0)) if score.get("awayTeam") else None,
-                    "periods_home": periods.get("homeTeam", []),
-                    "periods_away": periods.get("awayTeam", []),
-                    "overtime": ot_so,
-                    "is_finished": is_finished,
-                    "status": status
-                }
-                matches.append(match)
-
-            except (IndexError, ValueError, TypeError):
-                continue
-
-        return matches
-
     async def get_teams(self) -> List[dict]:
         """Get all Swiss NL teams from match data"""
         if self._teams_cache:
@@ -8,6 +8,8 @@ from sqlalchemy.orm import Session
 from ..models.database import Team, Game, DataUpdate
 from .swiss_api import SwissApiService, SWISS_TEAM_NAMES_RU
 from .stats_calculator import StatsCalculator, GameResult
+from .sync_pipeline import GameSyncPipeline, GameRow
+from . import sync_telemetry
 
 
 class SwissDataService:
@@ -59,81 +61,55 @@ class SwissDataService:
 
         return teams
 
-    async def sync_team_games(self, db: Session, team_id: str) -> int:
-        """Sync all games for a specific Swiss NL team"""
-        games_data = await self.api.get_team_game_log(team_id)
-        synced_count = 0
-
-        for game_data in games_data:
-            game_id = f"swiss_{game_data.get('id')}"
-            existing = db.query(Game).filter(Game.game_id == game_id).first()
-
-            home_team_api_id = str(game_data.get("home", {}).get("id", ""))
-            away_team_api_id = str(game_data.get("away", {}).get("id", ""))
-
-            home_team = db.query(Team).filter(
-                Team.league == self.LEAGUE,
-                Team.team_id == home_team_api_id
-            ).first()
-            away_team = db.query(Team).filter(
-                Team.league == self.LEAGUE,
-                Team.team_id == away_team_api_id
-            ).first()
-
-            if not home_team or not away_team:
-                continue
-
-            # Parse date (format: "DD.MM.YYYY")
-            game_date_str = game_data.get("date", "")
-            try:
-                game_date = datetime.strptime(game_date_str, "%d.%m.%Y")
-            except ValueError:
-                continue
-
-            home_score = game_data.get("home_score") or 0
-            away_score = game_data.get("away_score") or 0
-            is_finished = game_data.get("is_finished", False)
-
-            if existing:
-                existing.home_score = home_score
-                existing.away_score = away_score
-                existing.is_finished = is_finished
-            else:
-                game = Game(
-                    league=self.LEAGUE,
-                    game_id=game_id,
-                    date=game_date,
-                    home_team_id=home_team.id,
-                    away_team_id=away_team.id,
-                    home_score=home_score,
-                    away_score=away_score,
-                    is_finished=is_finished,
-                    season="20252026"
-                )
-                db.add(game)
-                synced_count += 1
-
-        db.commit()
-        return synced_count
+    async def _iter_game_pages(self):
+        """Yield parsed SIHF results pages as they are downloaded"""
+        try:
+            async for data in self.api.iter_results_pages():
+                yield data
+        except Exception as e:
+            print(f"Error fetching Swiss results: {e}")
+            sync_telemetry.record_error(str(e))
+
+    @staticmethod
+    def _parse_game_page(matches: List[dict]):
+        """Keep only finished games"""
+        return (m for m in matches if m.get("is_finished"))
+
+    def _normalize_game(self, game_data: dict) -> Optional[GameRow]:
+        """Convert SIHF match to a GameRow (teams outside NL are dropped at upsert)"""
+        # Parse date (format: "DD.MM.YYYY")
+        try:
+            game_date = datetime.strptime(game_data.get("date", ""), "%d.%m.%Y")
+        except ValueError:
+            return None
+
+        return GameRow(
+            game_id=f"swiss_{game_data.get('id')}",
+            date=game_date,
+            home_team_key=str(game_data.get("home", {}).get("id", "")),
+            away_team_key=str(game_data.get("away", {}).get("id", "")),
+            home_score=game_data.get("home_score") or 0,
+            away_score=game_data.get("away_score") or 0,
+            is_finished=game_data.get("is_finished", False),
+            season="20252026"
+        )
 
     async def sync_all_games(self, db: Session) -> int:
-        """Sync games for all Swiss NL teams"""
-        teams = db.query(Team).filter(Team.league == self.LEAGUE).all()
-        total_synced = 0
-
-        for team in teams:
-            try:
-                synced = await self.sync_team_games(db, team.team_id)
-                total_synced += synced
-            except Exception as e:
-                print(f"Error syncing Swiss team {team.abbrev}: {e}")
+        """Sync games for all Swiss NL teams, streaming results page by page"""
+        pipeline = GameSyncPipeline(
+            league=self.LEAGUE,
+            pages=self._iter_game_pages(),
+            parse_page=self._parse_game_page,
+            normalize=self._normalize_game
+        )
+        stats = await pipeline.run(db)
 
         # Log update
         update = DataUpdate(update_type="swiss_games_sync")
         db.add(update)
         db.commit()
 
-        return total_synced
+        return stats.inserted
 
     def get_team_matches(
         self,
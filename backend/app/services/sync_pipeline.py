@@ -0,0 +1,207 @@
+"""
+Streaming game sync pipeline: fetch -> parse -> normalize -> batch upsert.
+
+Stages run concurrently and are connected by bounded queues, so the next page
+is downloaded while the previous one is being written, and a slow database
+applies backpressure to fetching instead of the whole season piling up in memory.
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models.database import Team, Game
+from . import sync_telemetry
+
+
+PAGE_QUEUE_SIZE = int(os.getenv("SYNC_PAGE_QUEUE_SIZE", "2"))
+ROW_QUEUE_SIZE = int(os.getenv("SYNC_ROW_QUEUE_SIZE", "500"))
+UPSERT_BATCH_SIZE = int(os.getenv("SYNC_UPSERT_BATCH_SIZE", "200"))
+
+_DONE = object()
+
+
+@dataclass
+class GameRow:
+    """Normalized game ready to be upserted"""
+    game_id: str
+    date: datetime
+    home_team_key: str  # Team.team_id or Team.abbrev, depending on league
+    away_team_key: str
+    home_score: Optional[int]
+    away_score: Optional[int]
+    is_finished: bool
+    season: str
+
+
+@dataclass
+class PipelineStats:
+    pages: int = 0
+    parsed: int = 0
+    parse_errors: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0  # Unparseable, duplicate or unknown-team games
+
+
+class GameSyncPipeline:
+    """Runs one league's game sync as a chain of bounded stages.
+
+    Args:
+        league: League code stored on Game rows
+        pages: Async iterator of raw API payloads (one per request)
+        parse_page: Turns a payload into raw game dicts. Defaults to iterating the payload.
+        normalize: Turns a raw game into a GameRow, or None to skip it
+        team_key: Team column that GameRow team keys refer to ("team_id" or "abbrev")
+    """
+
+    def __init__(
+        self,
+        league: str,
+        pages: AsyncIterator[Any],
+        normalize: Callable[[dict], Optional[GameRow]],
+        parse_page: Optional[Callable[[Any], Iterable[dict]]] = None,
+        team_key: str = "team_id",
+        batch_size: int = UPSERT_BATCH_SIZE
+    ):
+        self.league = league
+        self.pages = pages
+        self.normalize = normalize
+        self.parse_page = parse_page or (lambda page: page)
+        self.team_key = team_key
+        self.batch_size = batch_size
+        self.stats = PipelineStats()
+
+    async def run(self, db: Session) -> PipelineStats:
+        """Run all stages to completion and return counters"""
+        self.stats = PipelineStats()
+        pages_queue = asyncio.Queue(maxsize=PAGE_QUEUE_SIZE)
+        raw_queue = asyncio.Queue(maxsize=ROW_QUEUE_SIZE)
+        rows_queue = asyncio.Queue(maxsize=ROW_QUEUE_SIZE)
+
+        tasks = [
+            asyncio.create_task(self._fetch_stage(pages_queue)),
+            asyncio.create_task(self._parse_stage(pages_queue, raw_queue)),
+            asyncio.create_task(self._normalize_stage(raw_queue, rows_queue)),
+            asyncio.create_task(self._upsert_stage(db, rows_queue)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # A failed stage would leave the others blocked on full/empty queues
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        sync_telemetry.record_rows(
+            inserted=self.stats.inserted,
+            updated=self.stats.updated,
+            unchanged=self.stats.unchanged,
+            skipped=self.stats.skipped
+        )
+        return self.stats
+
+    async def _fetch_stage(self, out_queue: asyncio.Queue):
+        async for page in self.pages:
+            self.stats.pages += 1
+            await out_queue.put(page)
+        await out_queue.put(_DONE)
+
+    async def _parse_stage(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        while True:
+            page = await in_queue.get()
+            if page is _DONE:
+                break
+            try:
+                for raw in self.parse_page(page):
+                    self.stats.parsed += 1
+                    await out_queue.put(raw)
+            except Exception as e:
+                self.stats.parse_errors += 1
+                print(f"Error parsing {self.league} games page: {e}")
+                sync_telemetry.record_error(f"parse: {e}")
+        await out_queue.put(_DONE)
+
+    async def _normalize_stage(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        # Per-team logs contain every game twice (once for each side)
+        seen = set()
+        while True:
+            raw = await in_queue.get()
+            if raw is _DONE:
+                break
+            try:
+                row = self.normalize(raw)
+            except (KeyError, TypeError, ValueError):
+                row = None
+            if row is None or row.game_id in seen:
+                self.stats.skipped += 1
+                continue
+            seen.add(row.game_id)
+            await out_queue.put(row)
+        await out_queue.put(_DONE)
+
+    async def _upsert_stage(self, db: Session, in_queue: asyncio.Queue):
+        teams = db.query(Team).filter(Team.league == self.league).all()
+        team_ids = {
+            str(getattr(team, self.team_key)): team.id
+            for team in teams
+            if getattr(team, self.team_key)
+        }
+
+        batch: List[GameRow] = []
+        while True:
+            row = await in_queue.get()
+            if row is _DONE:
+                break
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._flush(db, batch, team_ids)
+                batch = []
+        if batch:
+            self._flush(db, batch, team_ids)
+
+    def _flush(self, db: Session, batch: List[GameRow], team_ids: Dict[str, int]):
+        """Upsert a batch with a single lookup query and a single commit"""
+        existing = {
+            game.game_id: game
+            for game in db.query(Game).filter(Game.game_id.in_([row.game_id for row in batch]))
+        }
+
+        for row in batch:
+            home_team_id = team_ids.get(str(row.home_team_key))
+            away_team_id = team_ids.get(str(row.away_team_key))
+            if not home_team_id or not away_team_id:
+                self.stats.skipped += 1
+                continue
+
+            game = existing.get(row.game_id)
+            if game:
+                if (game.home_score, game.away_score, game.is_finished) == \
+                        (row.home_score, row.away_score, row.is_finished):
+                    self.stats.unchanged += 1
+                    continue
+                game.home_score = row.home_score
+                game.away_score = row.away_score
+                game.is_finished = row.is_finished
+                self.stats.updated += 1
+            else:
+                db.add(Game(
+                    league=self.league,
+                    game_id=row.game_id,
+                    date=row.date,
+                    home_team_id=home_team_id,
+                    away_team_id=away_team_id,
+                    home_score=row.home_score,
+                    away_score=row.away_score,
+                    is_finished=row.is_finished,
+                    season=row.season
+                ))
+                self.stats.inserted += 1
+
+        db.commit()
@@ -4,8 +4,9 @@ Handles initial load on startup and scheduled updates.
 """
 
 import asyncio
-from datetime import datetime, time
-from typing import Optional
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 
 from ..models.database import SessionLocal, Team
@@ -16,13 +17,79 @@ from .liiga_data_service import LiigaDataService
 from .austria_data_service import AustriaDataService
 from .swiss_data_service import SwissDataService
 from .api_sports_data_service import KHLDataService, CzechDataService, DenmarkDataService
+from .scheduler import JobScheduler
+from . import player_store
+from . import sync_telemetry
+
+
+LEAGUES = ["NHL", "AHL", "LIIGA", "AUSTRIA", "SWISS", "KHL", "CZECH", "DENMARK"]
+
+# Regular full sync per league (cron, local time). Override with SYNC_CRON_<LEAGUE>.
+# Staggered early-morning slots so the syncs don't compete with daytime traffic;
+# fresh results after each game come from the post-game refresh jobs below.
+LEAGUE_SYNC_CRON = {
+    "NHL": "15 6 * * *",
+    "AHL": "30 6 * * *",
+    "LIIGA": "0 4 * * *",
+    "AUSTRIA": "10 4 * * *",
+    "SWISS": "20 4 * * *",
+    "KHL": "0 3 * * *",
+    "CZECH": "30 3 * * *",
+    "DENMARK": "45 3 * * *",
+}
+
+# Stored lineup players refresh (teams that played since their last scrape)
+PLAYER_REFRESH_CRON = os.getenv("PLAYER_REFRESH_CRON", "0 9 * * *")
+PLAYER_REFRESH_BUDGET = int(os.getenv("PLAYER_REFRESH_BUDGET", "600"))
+
+# Max random delay (seconds) added to each cron run
+SYNC_JITTER_SECONDS = int(os.getenv("SYNC_JITTER_SECONDS", "300"))
+
+# Post-game refresh: run this long after a game's scheduled start
+GAME_DURATION = timedelta(hours=2, minutes=45)
+RESULTS_DELAY = timedelta(minutes=20)
+# Games ending within the same window share one refresh job
+RESULTS_BUCKET_MINUTES = 30
+# Start hour assumed when a schedule only provides the game date
+DEFAULT_GAME_START_HOUR = 19
+
+
+def get_sync_cron(league: str) -> str:
+    """Get cron expression for the regular sync of a league"""
+    return os.getenv(f"SYNC_CRON_{league}", LEAGUE_SYNC_CRON.get(league, "0 5 * * *"))
+
+
+def parse_game_start(date_iso: str) -> Optional[datetime]:
+    """Parse schedule date_iso into naive local time"""
+    if not date_iso:
+        return None
+    try:
+        start = datetime.fromisoformat(date_iso.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+    if start.tzinfo is not None:
+        return start.astimezone().replace(tzinfo=None)
+    if start.hour == 0 and start.minute == 0:
+        # Date without time
+        return start.replace(hour=DEFAULT_GAME_START_HOUR)
+    return start
+
+
+class LeagueWarmingError(Exception):
+    """Raised when a league has no data yet because its first sync is still running"""
+
+    def __init__(self, league: str):
+        self.league = league
+        super().__init__(f"{league} data is warming up")
 
 
 class SyncService:
     """Service for syncing and caching hockey data"""
 
     _instance = None
-    _scheduler_task: Optional[asyncio.Task] = None
+    _scheduler: Optional[JobScheduler] = None
+    _initial_sync_task: Optional[asyncio.Task] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -38,6 +105,13 @@ class SyncService:
         self.khl_service = KHLDataService()
         self.czech_service = CzechDataService()
         self.denmark_service = DenmarkDataService()
+        self._league_locks: Dict[str, asyncio.Lock] = {}
+
+    def _get_lock(self, league: str) -> asyncio.Lock:
+        """Per-league lock so scheduled, manual and startup syncs don't overlap"""
+        if league not in self._league_locks:
+            self._league_locks[league] = asyncio.Lock()
+        return self._league_locks[league]
 
     def _get_service(self, league: str):
         """Get appropriate service for league"""
@@ -58,11 +132,34 @@ class SyncService:
             return self.denmark_service
         return self.nhl_service
 
-    async def sync_league(self, league: str, force: bool = False) -> dict:
-        """Sync all data for a league"""
+    async def sync_league(self, league: str, force: bool = False, trigger: str = "manual") -> dict:
+        """Sync all data for a league
+
+        Args:
+            trigger: What started the sync (startup, scheduled, results, manual); stored with the run record
+        """
         if not force and not cache.needs_sync(league):
             return {"status": "skipped", "reason": "Cache is fresh"}
 
+        async with self._get_lock(league):
+            # Another caller may have synced while we waited for the lock
+            if not force and not cache.needs_sync(league):
+                return {"status": "skipped", "reason": "Cache is fresh"}
+
+            cache.mark_syncing(league, True)
+            try:
+                with sync_telemetry.sync_run(league, trigger) as run:
+                    result = await self._sync_league(league, run)
+                cache.mark_sync_error(league, None)
+                return result
+            except Exception as e:
+                cache.mark_sync_error(league, str(e))
+                raise
+            finally:
+                cache.mark_syncing(league, False)
+
+    async def _sync_league(self, league: str, run: sync_telemetry.SyncRunRecorder) -> dict:
+        """Sync teams, games, schedule and precomputed stats for a league"""
         db = SessionLocal()
         try:
             service = self._get_service(league)
@@ -70,7 +167,8 @@ class SyncService:
 
             # Sync teams
             print(f"[{datetime.now()}] Syncing {league} teams...")
-            teams = await service.sync_teams(db)
+            with run.stage("teams"):
+                teams = await service.sync_teams(db)
             result["teams"] = len(teams)
 
             # Cache teams
@@ -87,17 +185,20 @@ class SyncService:
 
             # Sync games
             print(f"[{datetime.now()}] Syncing {league} games...")
-            if league == "NHL":
-                games_count = await service.sync_all_games(db, "20242025")
-            else:
-                # AHL and LIIGA don't need season parameter
-                games_count = await service.sync_all_games(db)
+            with run.stage("games"):
+                if league == "NHL":
+                    games_count = await service.sync_all_games(db, "20242025")
+                else:
+                    # AHL and LIIGA don't need season parameter
+                    games_count = await service.sync_all_games(db)
             result["games"] = games_count
 
             # Load schedule into cache
             print(f"[{datetime.now()}] Loading {league} schedule...")
-            schedule = await service.get_upcoming_games(db, 7)
+            with run.stage("schedule"):
+                schedule = await service.get_upcoming_games(db, 7)
             cache.set_schedule(league, schedule)
+            self._schedule_results_refresh(league, schedule)
 
             # Precompute stats for teams in upcoming games
             print(f"[{datetime.now()}] Computing {league} team stats...")
@@ -106,14 +207,16 @@ class SyncService:
                 teams_in_schedule.add(game["home_team"]["abbrev"])
                 teams_in_schedule.add(game["away_team"]["abbrev"])
 
-            for abbrev in teams_in_schedule:
-                try:
-                    # Calculate full season stats (last_n=0)
-                    stats = service.get_team_stats(db, abbrev, 0)
-                    if stats:
-                        cache.set_team_stats(league, abbrev, stats)
-                except Exception as e:
-                    print(f"Error computing stats for {abbrev}: {e}")
+            with run.stage("stats"):
+                for abbrev in teams_in_schedule:
+                    try:
+                        # Calculate full season stats (last_n=0)
+                        stats = service.get_team_stats(db, abbrev, 0)
+                        if stats:
+                            cache.set_team_stats(league, abbrev, stats)
+                    except Exception as e:
+                        print(f"Error computing stats for {abbrev}: {e}")
+                        sync_telemetry.record_error(f"stats {abbrev}: {e}")
 
             cache.mark_synced(league)
             print(f"[{datetime.now()}] {league} sync completed: {result}")
@@ -128,13 +231,31 @@ class SyncService:
     async def sync_all(self, force: bool = False) -> dict:
         """Sync all leagues"""
         results = {}
-        for league in ["NHL", "AHL", "LIIGA", "AUSTRIA", "SWISS", "KHL", "CZECH", "DENMARK"]:
+        for league in LEAGUES:
             try:
                 results[league] = await self.sync_league(league, force)
             except Exception as e:
                 results[league] = {"error": str(e)}
         return results
 
+    async def _initial_sync(self):
+        """Load all leagues in the background; each league becomes ready as soon as it finishes"""
+        for league in LEAGUES:
+            try:
+                await self.sync_league(league, force=False, trigger="startup")
+            except Exception as e:
+                print(f"[{datetime.now()}] Initial sync failed for {league}: {e}")
+        print(f"[{datetime.now()}] Initial sync finished")
+
+    def start_initial_sync(self):
+        """Start initial data load without blocking the caller"""
+        if self._initial_sync_task is None or self._initial_sync_task.done():
+            self._initial_sync_task = asyncio.create_task(self._initial_sync())
+
+    def get_leagues_status(self) -> Dict[str, dict]:
+        """Get readiness status for all leagues"""
+        return {league: cache.get_league_status(league) for league in LEAGUES}
+
     async def load_team_stats(self, league: str, abbrev: str, last_n: int = 0) -> Optional[dict]:
         """Load stats for a specific team
 
@@ -155,6 +276,9 @@ class SyncService:
             # Cache only full season stats
             if stats and last_n == 0:
                 cache.set_team_stats(league, abbrev, stats)
+            if not stats and league in LEAGUES and not cache.is_ready(league):
+                # Team may simply not be synced yet
+                raise LeagueWarmingError(league)
             return stats
         finally:
             db.close()
@@ -165,6 +289,10 @@ class SyncService:
         if cached is not None:
             return cached
 
+        if league in LEAGUES and not cache.is_ready(league):
+            # Don't hit upstream inline while the first sync is running
+            raise LeagueWarmingError(league)
+
         # Load from API
         db = SessionLocal()
         try:
@@ -194,60 +322,114 @@ class SyncService:
                 }
                 for t in teams
             ]
-            cache.set_teams(league, teams_data)
+            if not teams_data and league in LEAGUES and not cache.is_ready(league):
+                raise LeagueWarmingError(league)
+            # Teams from the last snapshot are served while the league is warming
+            if teams_data:
+                cache.set_teams(league, teams_data)
             return teams_data
         finally:
             db.close()
 
     # Scheduler methods
-    async def _scheduler_loop(self):
-        """Background task that runs sync at scheduled time"""
-        while True:
-            try:
-                now = datetime.now()
-                # Calculate seconds until next 12:00
-                target_time = time(12, 0)
-                target_datetime = datetime.combine(now.date(), target_time)
-
-                if now.time() >= target_time:
-                    # Already past 12:00 today, schedule for tomorrow
-                    target_datetime = datetime.combine(
-                        now.date().replace(day=now.day + 1),
-                        target_time
-                    )
-
-                wait_seconds = (target_datetime - now).total_seconds()
-                print(f"[{now}] Next scheduled sync at {target_datetime} (in {wait_seconds/3600:.1f} hours)")
-
-                await asyncio.sleep(wait_seconds)
-
-                # Run sync
-                print(f"[{datetime.now()}] Running scheduled sync...")
-                await self.sync_all(force=True)
-
-            except asyncio.CancelledError:
-                print("Scheduler stopped")
-                break
-            except Exception as e:
-                print(f"Scheduler error: {e}")
-                # Wait a bit before retrying
-                await asyncio.sleep(60)
+    def _schedule_results_refresh(self, league: str, schedule: List[dict]):
+        """Register one-shot refresh jobs shortly after scheduled games end"""
+        if self._scheduler is None:
+            return
+
+        now = datetime.now()
+        run_times = set()
+        for game in schedule:
+            start = parse_game_start(game.get("date_iso", ""))
+            if not start:
+                continue
+            run_at = start + GAME_DURATION + RESULTS_DELAY
+            if run_at <= now:
+                continue
+            # Round up to bucket so games ending together trigger a single refresh
+            overflow = run_at.minute % RESULTS_BUCKET_MINUTES
+            if overflow or run_at.second or run_at.microsecond:
+                run_at = run_at.replace(second=0, microsecond=0) + timedelta(
+                    minutes=RESULTS_BUCKET_MINUTES - overflow
+                )
+            run_times.add(run_at)
+
+        for run_at in run_times:
+            job_name = f"results:{league}:{run_at.strftime('%Y%m%d%H%M')}"
+            if not self._scheduler.has_job(job_name):
+                self._scheduler.add_date_job(job_name, run_at, self._make_sync_job(league, "results"))
+
+    def _make_sync_job(self, league: str, trigger: str = "scheduled"):
+        async def job():
+            await self.sync_league(league, force=True, trigger=trigger)
+        return job
+
+    async def refresh_players(self):
+        """Re-scrape stored players of teams that have played since their last scrape"""
+        db = SessionLocal()
+        try:
+            result = await player_store.refresh_players(db, PLAYER_REFRESH_BUDGET)
+            print(f"Player refresh: {len(result['refreshed'])} teams refreshed, "
+                  f"{result['current']} current, {result['remaining']} remaining")
+        finally:
+            db.close()
 
     def start_scheduler(self):
-        """Start the background scheduler"""
-        if self._scheduler_task is None or self._scheduler_task.done():
-            self._scheduler_task = asyncio.create_task(self._scheduler_loop())
-            print("Scheduler started")
+        """Start the background scheduler with per-league sync jobs"""
+        if self._scheduler is not None and self._scheduler.is_running:
+            return
+
+        self._scheduler = JobScheduler()
+        for league in LEAGUES:
+            self._scheduler.add_cron_job(
+                f"sync:{league}",
+                get_sync_cron(league),
+                self._make_sync_job(league),
+                jitter=SYNC_JITTER_SECONDS,
+                last_run=cache.get_last_sync(league)
+            )
+            # Pick up games from schedules loaded before the scheduler existed
+            schedule = cache.get_schedule(league)
+            if schedule:
+                self._schedule_results_refresh(league, schedule)
+        self._scheduler.add_cron_job(
+            "players:refresh",
+            PLAYER_REFRESH_CRON,
+            self.refresh_players,
+            jitter=SYNC_JITTER_SECONDS
+        )
+
+        self._scheduler.start()
+        for job in self._scheduler.get_jobs():
+            print(f"Scheduled {job.name} at {job.next_run}")
+        print("Scheduler started")
 
     def stop_scheduler(self):
         """Stop the background scheduler"""
-        if self._scheduler_task and not self._scheduler_task.done():
-            self._scheduler_task.cancel()
+        if self._scheduler is not None and self._scheduler.is_running:
+            self._scheduler.stop()
             print("Scheduler stopped")
 
+    def get_scheduled_jobs(self) -> List[dict]:
+        """Get registered scheduler jobs"""
+        if self._scheduler is None:
+            return []
+        return [
+            {
+                "name": job.name,
+                "next_run": job.next_run.isoformat(),
+                "last_run": job.last_run.isoformat() if job.last_run else None,
+                "cron": job.cron.expression if job.cron else None,
+                "running": job.running
+            }
+            for job in self._scheduler.get_jobs()
+        ]
+
     async def close(self):
         """Cleanup resources"""
         self.stop_scheduler()
+        if self._initial_sync_task and not self._initial_sync_task.done():
+            self._initial_sync_task.cancel()
         await self.nhl_service.close()
         await self.ahl_service.close()
         await self.liiga_service.close()
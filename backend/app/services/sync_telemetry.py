@@ -0,0 +1,239 @@
+"""
+Sync run telemetry: per-stage timings, upstream request/byte counts,
+row counters and errors for each league sync.
+
+The active run is kept in a context variable, so API clients and the sync
+pipeline can report into it without the run being passed around. Outside
+of a sync run all record_* calls are no-ops.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import httpx
+
+from ..models.database import SessionLocal, SyncRun
+
+
+# Runs older than this are pruned when a new run is stored
+SYNC_RUNS_RETENTION_DAYS = int(os.getenv("SYNC_RUNS_RETENTION_DAYS", "30"))
+
+# Max stored length of a single error message
+MAX_ERROR_LENGTH = 500
+
+
+@dataclass
+class StageRecord:
+    name: str
+    duration_ms: int = 0
+    requests: int = 0
+    bytes: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class SyncRunRecorder:
+    """Collects metrics for one league sync run"""
+
+    def __init__(self, league: str, trigger: str):
+        self.league = league
+        self.trigger = trigger
+        self.started_at = datetime.utcnow()
+        self.stages: List[StageRecord] = []
+        self.current: Optional[StageRecord] = None
+        self.error: Optional[str] = None
+        self._start = time.perf_counter()
+        self.duration_ms = 0
+
+    def _target(self) -> StageRecord:
+        # Activity outside a named stage is attributed to a catch-all stage
+        if self.current is None:
+            self.current = StageRecord(name="other")
+            self.stages.append(self.current)
+        return self.current
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a stage; exceptions are recorded on the stage and re-raised"""
+        record = StageRecord(name=name)
+        self.stages.append(record)
+        previous, self.current = self.current, record
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record.errors.append(str(e)[:MAX_ERROR_LENGTH])
+            raise
+        finally:
+            record.duration_ms = int((time.perf_counter() - start) * 1000)
+            self.current = previous
+
+    def finish(self, error: Optional[str] = None):
+        self.duration_ms = int((time.perf_counter() - self._start) * 1000)
+        self.error = error[:MAX_ERROR_LENGTH] if error else None
+
+    def total(self, attr: str) -> int:
+        return sum(getattr(stage, attr) for stage in self.stages)
+
+    @property
+    def error_count(self) -> int:
+        return sum(len(stage.errors) for stage in self.stages)
+
+
+_current_run: ContextVar[Optional[SyncRunRecorder]] = ContextVar("sync_run", default=None)
+
+
+@contextmanager
+def sync_run(league: str, trigger: str = "manual"):
+    """Record a sync run for the duration of the block and store it"""
+    run = SyncRunRecorder(league, trigger)
+    token = _current_run.set(run)
+    try:
+        yield run
+    except Exception as e:
+        run.finish(str(e))
+        raise
+    else:
+        run.finish()
+    finally:
+        _current_run.reset(token)
+        save_run(run)
+
+
+def record_rows(inserted: int = 0, updated: int = 0, unchanged: int = 0, skipped: int = 0):
+    run = _current_run.get()
+    if run is not None:
+        stage = run._target()
+        stage.inserted += inserted
+        stage.updated += updated
+        stage.unchanged += unchanged
+        stage.skipped += skipped
+
+
+def record_error(message: str):
+    run = _current_run.get()
+    if run is not None:
+        run._target().errors.append(str(message)[:MAX_ERROR_LENGTH])
+
+
+class _CountingStream(httpx.AsyncByteStream):
+    """Response stream wrapper that reports downloaded bytes to a sync run"""
+
+    def __init__(self, stream, stage: StageRecord):
+        self._stream = stream
+        self._stage = stage
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._stage.bytes += len(chunk)
+            yield chunk
+
+    async def aclose(self):
+        await self._stream.aclose()
+
+
+async def on_response(response: httpx.Response):
+    """httpx response hook: count the request and its body bytes"""
+    run = _current_run.get()
+    if run is None:
+        return
+    stage = run._target()
+    cache_state = response.extensions.get("http_cache")
+    if cache_state in ("hit", "stale"):
+        # Served from the HTTP cache, nothing came over the network
+        return
+    stage.requests += 1
+    if cache_state == "revalidated":
+        # 304: the body came from disk
+        return
+    response.stream = _CountingStream(response.stream, stage)
+
+
+# Pass as event_hooks= when creating an httpx.AsyncClient
+HTTPX_EVENT_HOOKS = {"response": [on_response]}
+
+
+def save_run(run: SyncRunRecorder):
+    """Persist a finished run and prune old ones"""
+    db = SessionLocal()
+    try:
+        db.add(SyncRun(
+            league=run.league,
+            trigger=run.trigger,
+            started_at=run.started_at,
+            duration_ms=run.duration_ms,
+            status="error" if run.error else "ok",
+            requests=run.total("requests"),
+            bytes_downloaded=run.total("bytes"),
+            rows_inserted=run.total("inserted"),
+            rows_updated=run.total("updated"),
+            rows_unchanged=run.total("unchanged"),
+            error_count=run.error_count,
+            error=run.error,
+            stages=json.dumps([asdict(stage) for stage in run.stages])
+        ))
+        cutoff = datetime.utcnow() - timedelta(days=SYNC_RUNS_RETENTION_DAYS)
+        db.query(SyncRun).filter(SyncRun.started_at < cutoff).delete()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Error saving sync run for {run.league}: {e}")
+    finally:
+        db.close()
+
+
+def serialize_run(run: SyncRun) -> dict:
+    return {
+        "id": run.id,
+        "league": run.league,
+        "trigger": run.trigger,
+        "started_at": run.started_at.isoformat() if run.started_at else None,
+        "duration_ms": run.duration_ms,
+        "status": run.status,
+        "requests": run.requests,
+        "bytes": run.bytes_downloaded,
+        "rows_inserted": run.rows_inserted,
+        "rows_updated": run.rows_updated,
+        "rows_unchanged": run.rows_unchanged,
+        "error_count": run.error_count,
+        "error": run.error,
+        "stages": json.loads(run.stages) if run.stages else []
+    }
+
+
+def summarize_runs(runs: List[SyncRun]) -> List[dict]:
+    """Average and max duration per league and stage, slowest first"""
+    buckets = {}
+    for run in runs:
+        for stage in json.loads(run.stages) if run.stages else []:
+            key = (run.league, stage["name"])
+            bucket = buckets.setdefault(key, {"durations": [], "requests": 0, "bytes": 0, "errors": 0})
+            bucket["durations"].append(stage["duration_ms"])
+            bucket["requests"] += stage["requests"]
+            bucket["bytes"] += stage["bytes"]
+            bucket["errors"] += len(stage["errors"])
+
+    summary = [
+        {
+            "league": league,
+            "stage": stage,
+            "runs": len(bucket["durations"]),
+            "avg_duration_ms": int(sum(bucket["durations"]) / len(bucket["durations"])),
+            "max_duration_ms": max(bucket["durations"]),
+            "total_duration_ms": sum(bucket["durations"]),
+            "requests": bucket["requests"],
+            "bytes": bucket["bytes"],
+            "errors": bucket["errors"]
+        }
+        for (league, stage), bucket in buckets.items()
+    ]
+    return sorted(summary, key=lambda s: s["total_duration_ms"], reverse=True)
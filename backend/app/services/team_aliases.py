@@ -0,0 +1,142 @@
+"""
+Team name alias index for matching names across sources (Flashscore, JetTon,
+API-Sports, our own DB).
+
+Names are normalized (diacritics stripped like normalize_abbrev, lowercased,
+punctuation removed) and looked up in three steps:
+1. exact normalized alias -> team id (dict lookup);
+2. distinctive tokens ("Lugano" in "HC Lugano") when all of them point to one team;
+3. character trigram similarity as a fallback for spelling variants.
+Steps 2 and 3 only match aliases with the same squad markers (U20, Juniors,
+(W), II, ...), so reserve, junior and women's sides never resolve to the
+senior club.
+Resolutions are memoized per index, so repeated names cost one dict lookup.
+"""
+
+import re
+import unicodedata
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+# Generic words that do not identify a team on their own
+STOP_TOKENS = {
+    "hc", "hk", "ehc", "sc", "ev", "ec", "ek", "es", "fc", "hv", "if", "ik", "ks",
+    "ice", "hockey", "club", "team", "the", "de", "der", "of",
+}
+
+# Letters NFD does not decompose
+_TRANSLATE = str.maketrans({"ø": "o", "æ": "ae", "ß": "ss", "ł": "l", "đ": "d", "œ": "oe"})
+_NON_ALNUM = re.compile(r"[\W_]+")  # Keeps non-Latin letters (name_ru)
+
+# Tokens naming a reserve, junior or women's side rather than the club itself
+_SQUAD_MARKER = re.compile(r"^(?:u\d{2}|w|women|ii|iii|jr|jun|junior|juniors|youth|reserves?)$")
+
+MIN_TRIGRAM_SCORE = 0.5
+
+
+def normalize_name(text: str) -> str:
+    """'Genève-Servette HC' -> 'geneve servette hc'"""
+    decomposed = unicodedata.normalize("NFD", (text or "").lower().translate(_TRANSLATE))
+    ascii_text = "".join(c for c in decomposed if unicodedata.category(c) != "Mn")
+    return _NON_ALNUM.sub(" ", ascii_text).strip()
+
+
+def _tokens(normalized: str) -> Set[str]:
+    return {token for token in normalized.split() if len(token) >= 3 and token not in STOP_TOKENS}
+
+
+def _squad_markers(normalized: str) -> FrozenSet[str]:
+    """'adler mannheim u20' -> {'u20'}"""
+    return frozenset(token for token in normalized.split() if _SQUAD_MARKER.match(token))
+
+
+def _trigrams(normalized: str) -> Set[str]:
+    compact = "".join(sorted(_tokens(normalized))) or normalized.replace(" ", "")
+    return {compact[i:i + 3] for i in range(len(compact) - 2)} or {compact}
+
+
+class TeamAliasIndex:
+    """Aliases of a league's teams -> canonical team id"""
+
+    def __init__(self):
+        self.teams: Set[str] = set()
+        self._exact: Dict[str, str] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._trigrams: Dict[str, Set[int]] = {}  # trigram -> alias positions
+        # (team id, trigrams, squad markers) per alias
+        self._alias_trigrams: List[Tuple[str, Set[str], FrozenSet[str]]] = []
+        self._squads: Dict[str, Set[FrozenSet[str]]] = {}  # team id -> squad markers of its aliases
+        self._resolved: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> "TeamAliasIndex":
+        """Index where each name is its own canonical id"""
+        index = cls()
+        for name in names:
+            index.add(name, name)
+        return index
+
+    def add(self, team_id: str, *aliases: str) -> "TeamAliasIndex":
+        self.teams.add(team_id)
+        for alias in aliases:
+            normalized = normalize_name(alias)
+            if not normalized:
+                continue
+            self._exact.setdefault(normalized, team_id)
+            for token in _tokens(normalized):
+                self._tokens.setdefault(token, set()).add(team_id)
+            markers = _squad_markers(normalized)
+            self._squads.setdefault(team_id, set()).add(markers)
+            grams = _trigrams(normalized)
+            for gram in grams:
+                self._trigrams.setdefault(gram, set()).add(len(self._alias_trigrams))
+            self._alias_trigrams.append((team_id, grams, markers))
+        self._resolved.clear()
+        return self
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Canonical team id for `name`, or None when no single team matches"""
+        normalized = normalize_name(name)
+        if normalized in self._resolved:
+            return self._resolved[normalized]
+        team_id = self._resolve(normalized)
+        self._resolved[normalized] = team_id
+        return team_id
+
+    def __contains__(self, name: str) -> bool:
+        return self.resolve(name) is not None
+
+    def _resolve(self, normalized: str) -> Optional[str]:
+        if not normalized:
+            return None
+        if normalized in self._exact:
+            return self._exact[normalized]
+
+        # Tokens: exactly one team carries every distinctive token of the name
+        markers = _squad_markers(normalized)
+        tokens = _tokens(normalized) - markers
+        hits: Dict[str, int] = {}
+        for token in tokens:
+            for team_id in self._tokens.get(token, ()):
+                if markers in self._squads[team_id]:
+                    hits[team_id] = hits.get(team_id, 0) + 1
+        leaders = [team_id for team_id, count in hits.items() if count == len(tokens)]
+        if len(leaders) == 1:
+            return leaders[0]
+        if len(leaders) > 1:
+            return None
+
+        # Trigram similarity (Jaccard) for spelling variants
+        grams = _trigrams(normalized)
+        candidates: Set[int] = set()
+        for gram in grams:
+            candidates.update(self._trigrams.get(gram, ()))
+        best_id, best_score = None, 0.0
+        for position in candidates:
+            team_id, alias_grams, alias_markers = self._alias_trigrams[position]
+            if alias_markers != markers:
+                continue
+            score = len(grams & alias_grams) / len(grams | alias_grams)
+            if score > best_score:
+                best_id, best_score = team_id, score
+        return best_id if best_score >= MIN_TRIGRAM_SCORE else None
@@ -0,0 +1,79 @@
+"""
+Russian names of Austria ICE Hockey League and Swiss National League teams.
+
+Keyed by both the Flashscore feed name ("Lugano") and the league API
+abbreviation ("HCL"), so the Flashscore sync cron and the team stats
+endpoint resolve whichever one they have from the same map.
+"""
+
+AUSTRIA_TEAM_NAMES_RU = {
+    # Flashscore feed names
+    "Salzburg": "Ред Булл Зальцбург",
+    "Vienna Capitals": "Вена Кэпиталз",
+    "KAC": "КАЦ Клагенфурт",
+    "Villach": "ВСВ Филлах",
+    "Graz 99ers": "Грац 99ерс",
+    "Innsbruck": "ХК Инсбрук",
+    "Dornbirn": "Дорнбирн Бульдогс",
+    "Linz": "Блэк Уингс Линц",
+    "Fehervar AV19": "Фехервар АВ19",
+    "Val Pusteria": "Пустерталь Вёльфе",
+    "Znojmo": "Орли Знойимо",
+    "Bratislava Capitals": "Братислава Кэпиталз",
+    "Bolzano": "ХК Больцано",
+    "Asiago": "Азиаго Хоккей",
+    # ICE HL S3 API abbreviations
+    "RBS": "Ред Булл Зальцбург",
+    "VIC": "Вена Кэпиталз",
+    "VSV": "ВСВ Филлах",
+    "G99": "Грац 99ерс",
+    "HCI": "ХК Инсбрук",
+    "DEC": "Дорнбирн Бульдогс",
+    "BWL": "Блэк Уингс Линц",
+    "AVS": "Фехервар АВ19",
+    "PUS": "Пустерталь Вёльфе",
+    "ZNO": "Орли Знойимо",
+    "BRC": "Братислава Кэпиталз",
+    "HCB": "ХК Больцано",
+    "ASH": "Азиаго Хоккей",
+    "TWK": "ТВК Инсбрук",
+}
+
+SWISS_TEAM_NAMES_RU = {
+    # Flashscore feed names
+    "Zurich": "Цюрих Лайонс",
+    "Bern": "СК Берн",
+    "Zug": "ЭВ Цуг",
+    "Lugano": "ХК Лугано",
+    "Fribourg": "Фрибур-Готтерон",
+    "Lausanne": "Лозанна ХК",
+    "Kloten": "ЭХК Клотен",
+    "Rapperswil": "Раппершвиль-Йона Лейкерс",
+    "Servette": "Женева-Сервет",
+    "Biel": "ЭХК Биль",
+    "Davos": "ХК Давос",
+    "Ambri-Piotta": "ХК Амбри-Пиотта",
+    "Langnau": "СЦЛ Тигерс",
+    "Ajoie": "ХК Ажуа",
+    # SIHF API abbreviations
+    "ZSC": "Цюрих Лайонс",
+    "SCB": "СК Берн",
+    "EVZ": "ЭВ Цуг",
+    "HCL": "ХК Лугано",
+    "FRI": "Фрибур-Готтерон",
+    "LAU": "Лозанна",
+    "LHC": "Лозанна ХК",
+    "KLO": "ЭХК Клотен",
+    "SCRJ": "Раппершвиль-Йона Лейкерс",
+    "GEN": "Женева-Сервет",
+    "GSH": "Женева-Сервет",
+    "BIE": "ЭХК Биль",
+    "EHCB": "ЭХК Биль",
+    "DAV": "ХК Давос",
+    "HCD": "ХК Давос",
+    "AMB": "ХК Амбри-Пиотта",
+    "HCA": "ХК Амбри-Пиотта",
+    "SCL": "СЦЛ Тигерс",
+    "LAN": "СЦЛ Тигерс",
+    "AJO": "ХК Ажуа",
+}
@@ -95,6 +95,12 @@ export const hockeyApi = {
   async getEventOdds(eventId) {
     const response = await api.get('/odds', { params: { event_id: eventId } })
     return response.data
+  },
+
+  // Get detailed odds for many events in one request ({ events: { [id]: event }, missing, failed })
+  async getEventOddsBatch(eventIds) {
+    const response = await api.get('/odds', { params: { event_ids: eventIds.join(',') } })
+    return response.data
   }
 }
 
@@ -116,6 +122,40 @@ export const lineupsApi = {
   async getTeamLineup(teamUrl) {
     const response = await api.get('/lineups/lineup', { params: { type: 'team', url: teamUrl } })
     return response.data
+  },
+
+  // Stream a lineup as NDJSON records (team, player..., summary); resolves with the summary
+  async streamLineup(url, onRecord, type = 'match') {
+    const params = new URLSearchParams({ type, url, stream: 'ndjson' })
+    const headers = {}
+    const token = localStorage.getItem('auth_token')
+    if (token) {
+      headers.Authorization = `Bearer ${token}`
+    }
+    const response = await fetch(`${API_BASE_URL}/lineups/lineup?${params}`, { headers })
+    if (!response.ok) {
+      throw new Error(`Lineup stream failed: ${response.status}`)
+    }
+
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    let summary = null
+    for (;;) {
+      const { done, value } = await reader.read()
+      buffer += decoder.decode(value || new Uint8Array(), { stream: !done })
+      const lines = buffer.split('\n')
+      buffer = done ? '' : lines.pop()
+      for (const line of lines) {
+        if (!line.trim()) continue
+        const record = JSON.parse(line)
+        if (record.type === 'error') throw new Error(record.error)
+        if (record.type === 'summary') summary = record
+        onRecord?.(record)
+      }
+      if (done) break
+    }
+    return summary
   }
 }
 
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: Flashscore day feed tokenizer (iter_feed_matches) against the
+split-into-dicts parser it replaced.
+
+Uses a synthetic feed by default; pass a saved feed to measure real data:
+    python scripts/benchmark_feed_parser.py --feed /tmp/f_4_0_3_en_5.txt
+Both parsers must return the same matches, otherwise the script exits with 1.
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.services.flashscore_feed import iter_feed_matches
+
+
+def legacy_parse(data: str, target_league: str = None) -> list:
+    """The previous parser (stats / upcoming / flashscore_service)"""
+    if not data or data.strip() in ('0', ''):
+        return []
+
+    data_list = [{}]
+    for item in data.split('¬'):
+        if '÷' not in item:
+            continue
+        parts = item.split('÷')
+        key = parts[0]
+        value = parts[-1] if len(parts) > 1 else ''
+        if '~' in key:
+            data_list.append({key: value})
+        else:
+            data_list[-1].update({key: value})
+
+    result = []
+    league_name = ''
+    league_id = ''
+    for game in data_list:
+        keys = list(game.keys())
+        if not keys:
+            continue
+        if '~ZA' in keys[0]:
+            league_name = game.get('~ZA', '')
+            league_id = game.get('ZC', '')
+        if 'AA' in keys[0]:
+            if target_league and target_league.lower() not in league_name.lower():
+                continue
+            result.append((
+                game.get('~AA', ''), league_name, league_id,
+                game.get('AD', ''), game.get('AB', ''),
+                game.get('AE', ''), game.get('AF', ''),
+                game.get('AG', ''), game.get('AH', ''),
+                game.get('OA', ''), game.get('OB', ''),
+            ))
+    return result
+
+
+def synthetic_feed(leagues: int, matches: int, seed: int = 0) -> str:
+    """A day feed shaped like f_4_*: league headers followed by match records"""
+    rng = random.Random(seed)
+    parts = ["SA÷4¬~"]
+    names = [f"COUNTRY{i}: League {i}" for i in range(leagues - 2)]
+    names += ["AUSTRIA: ICE Hockey League", "SWITZERLAND: National League"]
+    rng.shuffle(names)
+    for n, name in enumerate(names):
+        parts.append(f"ZA÷{name}¬ZEE÷x{n}¬ZB÷{n}¬ZY÷Country¬ZC÷lg{n}¬ZD÷p¬ZE÷s{n}¬ZF÷0¬~")
+        for m in range(matches):
+            ts = 1760000000 + rng.randrange(86400)
+            parts.append(
+                f"AA÷m{n}x{m}¬AD÷{ts}¬ADE÷{ts}¬AB÷{rng.choice('123')}¬CR÷3¬AC÷3¬"
+                f"CX÷Home {n}-{m}¬AX÷0¬BX÷-1¬WN÷HOM¬AF÷Away {n}-{m}¬WV÷AWY¬"
+                f"AS÷1¬AZ÷1¬AH÷{rng.randrange(7)}¬AG÷{rng.randrange(7)}¬"
+                f"BA÷1¬BC÷0¬WM÷HOM¬AE÷Home {n}-{m}¬OA÷h{n}{m}.png¬OB÷a{n}{m}.png¬~"
+            )
+    parts.append("A1÷end¬")
+    return "".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feed", help="Saved day feed text file")
+    parser.add_argument("--leagues", type=int, default=120)
+    parser.add_argument("--matches", type=int, default=6, help="Matches per league (synthetic feed)")
+    parser.add_argument("--target", default="SWITZERLAND: National League")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.feed:
+        with open(args.feed, "r", encoding="utf-8") as f:
+            feed = f.read()
+    else:
+        feed = synthetic_feed(args.leagues, args.matches)
+    print(f"Feed: {len(feed) / 1024:.0f} KiB")
+
+    for label, target in (("all leagues", None), (f"target {args.target!r}", args.target)):
+        new = [tuple(m) for m in iter_feed_matches(feed, target)]
+        old = legacy_parse(feed, target)
+        if new != old:
+            print(f"{label}: results differ ({len(new)} vs {len(old)} matches)")
+            sys.exit(1)
+
+        legacy_s = min(timeit.repeat(lambda: legacy_parse(feed, target), number=args.repeat, repeat=3)) / args.repeat
+        new_s = min(timeit.repeat(lambda: list(iter_feed_matches(feed, target)), number=args.repeat, repeat=3)) / args.repeat
+        print(f"{label}: {len(new)} matches | legacy {legacy_s * 1000:.2f} ms | "
+              f"tokenizer {new_s * 1000:.2f} ms | {legacy_s / new_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark / load-test the sync, stats, odds and lineup paths against recorded
+upstream traffic (backend/app/services/http_replay.py).
+
+Record fixtures once with network access:
+    python scripts/benchmark_upstream.py odds stats --mode record
+
+Then run offline, optionally with simulated upstream latency:
+    python scripts/benchmark_upstream.py odds stats --iterations 20 --concurrency 5 --latency-ms 80
+
+The HTTP cache is disabled unless --with-cache is passed, so every iteration
+goes through the fixture store.
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+API_DIR = os.path.join(ROOT, "api")
+BACKEND_DIR = os.path.join(ROOT, "backend")
+
+SCENARIOS = ["sync", "stats", "odds", "lineup"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="+", choices=SCENARIOS)
+    parser.add_argument("--mode", choices=["replay", "record"], default="replay")
+    parser.add_argument("--fixtures", help="Fixture directory (default data/http_fixtures)")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--league", default="NHL")
+    parser.add_argument("--team", default="TOR", help="Team for the stats scenario")
+    parser.add_argument("--match-url", help="Flashscore match URL for the lineup scenario")
+    parser.add_argument("--with-cache", action="store_true", help="Keep the HTTP cache enabled")
+    return parser.parse_args()
+
+
+def configure_env(args):
+    # Must be set before any app module is imported (read at import time)
+    os.environ["HTTP_REPLAY_MODE"] = args.mode
+    os.environ["HTTP_REPLAY_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["HTTP_REPLAY_JITTER_MS"] = str(args.jitter_ms)
+    if args.fixtures:
+        os.environ["HTTP_FIXTURES_DIR"] = args.fixtures
+    if not args.with_cache:
+        os.environ["HTTP_CACHE_DISABLED"] = "1"
+    sys.path.insert(0, API_DIR)
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def load_api_module(relative_path: str):
+    """Import a serverless function file (paths like teams/[team]/stats.py are not importable by name)"""
+    path = os.path.join(API_DIR, relative_path)
+    name = "bench_" + relative_path.replace("/", "_").replace("[", "").replace("]", "").replace("-", "_")[:-3]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_scenario(name: str, args):
+    """Return (async callable for one iteration, runner) for a scenario"""
+    if name == "sync":
+        from app.models.database import init_db
+        from app.services.sync_service import sync_service
+        init_db()
+
+        async def sync_once():
+            await sync_service.sync_league(args.league, force=True, trigger="benchmark")
+        return sync_once, asyncio.run
+
+    from http_client import run
+
+    if name == "stats":
+        stats = load_api_module("teams/[team]/stats.py")
+
+        async def stats_once():
+            await stats.get_team_stats(args.league, args.team)
+        return stats_once, run
+
+    if name == "odds":
+        odds = load_api_module("odds.py")
+
+        async def odds_once():
+            await odds.fetch_all_hockey_events()
+        return odds_once, run
+
+    if not args.match_url:
+        raise SystemExit("lineup scenario needs --match-url")
+    lineup = load_api_module("lineups-lineup.py")
+
+    async def lineup_once():
+        await lineup.get_match_lineups(args.match_url)
+    return lineup_once, run
+
+
+async def load_test(once, iterations: int, concurrency: int):
+    """Run `iterations` calls spread over `concurrency` workers; return latencies (ms) and errors"""
+    latencies = []
+    errors = []
+    remaining = iter(range(iterations))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                await once()
+            except Exception as e:
+                errors.append(repr(e))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def report(name: str, latencies, errors, elapsed: float):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"\n{name}: {len(latencies)} runs in {elapsed:.2f}s ({len(latencies) / elapsed:.1f}/s)")
+    print(f"  p50 {statistics.median(ordered):.1f} ms | p95 {p95:.1f} ms | max {ordered[-1]:.1f} ms")
+    if errors:
+        print(f"  {len(errors)} errors, first: {errors[0]}")
+
+
+def main():
+    args = parse_args()
+    configure_env(args)
+    print(f"Mode: {args.mode}, latency {args.latency_ms}±{args.jitter_ms} ms, "
+          f"{args.iterations} iterations x {args.concurrency} workers")
+
+    for name in args.scenarios:
+        once, runner = make_scenario(name, args)
+        # Recording needs each request once; extra iterations only overwrite fixtures
+        iterations = 1 if args.mode == "record" else args.iterations
+        concurrency = 1 if args.mode == "record" else args.concurrency
+        latencies, errors, elapsed = runner(load_test(once, iterations, concurrency))
+        report(name, latencies, errors, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,14 @@ Run via GitHub Actions every hour.
 import asyncio
 import json
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 import httpx
-from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.services.html_extract import article_soup, make_soup
 
 # DEL team news sources
 DEL_NEWS_SOURCES = {
@@ -171,6 +175,70 @@ def parse_german_date(date_str: str) -> str:
     return date_str
 
 
+def extract_article_text(soup, url: str) -> str:
+    """Article paragraphs via site-specific, then generic selectors"""
+    # Remove "read more" links and similar
+    for el in soup.select('a.more-link, .read-more, .mehr-link, [class*="more"], .social-share, .sharing'):
+        el.decompose()
+
+    content = ""
+
+    # Site-specific selectors
+    if 'eisbaeren.de' in url:
+        # Eisbären Berlin specific
+        selectors = ['.news-detail-text', '.news-text', '.detail-text', '.text-content',
+                    '.news-detail', 'article .text', '.content-text', 'main .text']
+    elif 'eisloewen.de' in url:
+        selectors = ['.entry-content', '.post-content', 'article .content']
+    else:
+        # Generic selectors
+        selectors = [
+            'article .content', 'article .entry-content', '.article-content',
+            '.news-content', '.post-content', '.single-content', '.news-detail',
+            '.entry-content', '.text-content', '.article-text',
+            'article p', '.content-main p', 'main p'
+        ]
+
+    for selector in selectors:
+        elements = soup.select(selector)
+        if elements:
+            paragraphs = []
+            for el in elements:
+                # Get all paragraphs within the element
+                ps = el.find_all('p')
+                if ps:
+                    for p in ps:
+                        text = p.get_text(strip=True)
+                        if text and len(text) > 20:
+                            paragraphs.append(text)
+                else:
+                    # If no <p> tags, get text directly
+                    text = el.get_text(strip=True)
+                    if text and len(text) > 30:
+                        paragraphs.append(text)
+
+            if paragraphs:
+                content = "\n\n".join(paragraphs[:15])  # Max 15 paragraphs
+                break
+
+    # If still no content, try getting all <p> tags from main/article
+    if not content:
+        main_content = soup.select_one('main, article, .content, #content')
+        if main_content:
+            paragraphs = []
+            for p in main_content.find_all('p'):
+                text = p.get_text(strip=True)
+                if text and len(text) > 30:
+                    # Skip junk
+                    if any(junk in text.lower() for junk in ['cookie', 'datenschutz', 'impressum', 'newsletter']):
+                        continue
+                    paragraphs.append(text)
+            if paragraphs:
+                content = "\n\n".join(paragraphs[:15])
+
+    return content
+
+
 async def fetch_article_content(url: str, client: httpx.AsyncClient) -> str:
     """Fetch full article content from URL"""
     try:
@@ -178,70 +246,10 @@ async def fetch_article_content(url: str, client: httpx.AsyncClient) -> str:
         if response.status_code != 200:
             return ""
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Remove scripts, styles, nav, footer, buttons
-        for tag in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'button', 'form']):
-            tag.decompose()
-
-        # Remove "read more" links and similar
-        for el in soup.select('a.more-link, .read-more, .mehr-link, [class*="more"], .social-share, .sharing'):
-            el.decompose()
-
-        content = ""
-
-        # Site-specific selectors
-        if 'eisbaeren.de' in url:
-            # Eisbären Berlin specific
-            selectors = ['.news-detail-text', '.news-text', '.detail-text', '.text-content',
-                        '.news-detail', 'article .text', '.content-text', 'main .text']
-        elif 'eisloewen.de' in url:
-            selectors = ['.entry-content', '.post-content', 'article .content']
-        else:
-            # Generic selectors
-            selectors = [
-                'article .content', 'article .entry-content', '.article-content',
-                '.news-content', '.post-content', '.single-content', '.news-detail',
-                '.entry-content', '.text-content', '.article-text',
-                'article p', '.content-main p', 'main p'
-            ]
-
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                paragraphs = []
-                for el in elements:
-                    # Get all paragraphs within the element
-                    ps = el.find_all('p')
-                    if ps:
-                        for p in ps:
-                            text = p.get_text(strip=True)
-                            if text and len(text) > 20:
-                                paragraphs.append(text)
-                    else:
-                        # If no <p> tags, get text directly
-                        text = el.get_text(strip=True)
-                        if text and len(text) > 30:
-                            paragraphs.append(text)
-
-                if paragraphs:
-                    content = "\n\n".join(paragraphs[:15])  # Max 15 paragraphs
-                    break
-
-        # If still no content, try getting all <p> tags from main/article
+        # Article body (<main>/<article>) first, then the whole page
+        content = extract_article_text(article_soup(response.text), url)
         if not content:
-            main_content = soup.select_one('main, article, .content, #content')
-            if main_content:
-                paragraphs = []
-                for p in main_content.find_all('p'):
-                    text = p.get_text(strip=True)
-                    if text and len(text) > 30:
-                        # Skip junk
-                        if any(junk in text.lower() for junk in ['cookie', 'datenschutz', 'impressum', 'newsletter']):
-                            continue
-                        paragraphs.append(text)
-                if paragraphs:
-                    content = "\n\n".join(paragraphs[:15])
+            content = extract_article_text(article_soup(response.text, body_only=False), url)
 
         # Clean up content
         content = content.replace('...Подробнее', '').replace('...Mehr', '')
@@ -262,7 +270,7 @@ async def fetch_article_content(url: str, client: httpx.AsyncClient) -> str:
 
 async def parse_eisbaeren_berlin(html: str, base_url: str) -> list:
     """Special parser for Eisbären Berlin website"""
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = make_soup(html)
     articles = []
 
     # Try finding news items by various patterns
@@ -300,7 +308,7 @@ async def parse_eisbaeren_berlin(html: str, base_url: str) -> list:
 
 async def parse_news_list(html: str, base_url: str, team_abbrev: str = "") -> list:
     """Parse news list page to get article links"""
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = make_soup(html)
     articles = []
 
     # Try various selectors